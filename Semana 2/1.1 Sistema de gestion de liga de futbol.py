@@ -7,10 +7,24 @@
 # Fecha: 07/06/2025
 # ============================================================================
 
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+# NumPy es opcional: solo lo necesita el motor vectorizado (MotorVectorizado)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # ============================================================================
 # 1. ABSTRACCIÓN - Clase abstracta para Persona
 # ============================================================================
@@ -63,11 +77,33 @@ class Entrenador(Persona):
 # ============================================================================
 
 class Equipo:
-    def __init__(self, nombre: str, entrenador: Entrenador):
+    def __init__(self, nombre: str, entrenador: Entrenador, ataque: float = 1.0, defensa: float = 1.0):
+        if ataque <= 0 or defensa <= 0:
+            raise ValueError("La fuerza de ataque y de defensa debe ser positiva")
         self._nombre = nombre
         self._entrenador = entrenador
+        # Fuerza relativa (1.0 = promedio de la liga) para simular partidos
+        self._ataque = ataque
+        self._defensa = defensa
         self._jugadores: List[Jugador] = []
         self.__puntos = 0  # Encapsulado: solo modificable por métodos internos
+        self.__ganados = 0
+        self.__empatados = 0
+        self.__perdidos = 0
+        self.__goles_favor = 0
+        self.__goles_contra = 0
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    @property
+    def ataque(self):
+        return self._ataque
+
+    @property
+    def defensa(self):
+        return self._defensa
 
     def agregar_jugador(self, jugador: Jugador):
         if len(self._jugadores) < 11:
@@ -75,13 +111,43 @@ class Equipo:
 
     def registrar_victoria(self):
         self.__puntos += 3
+        self.__ganados += 1
 
     def registrar_empate(self):
         self.__puntos += 1
+        self.__empatados += 1
+
+    def registrar_derrota(self):
+        self.__perdidos += 1
+
+    def registrar_goles(self, favor: int, contra: int):
+        self.__goles_favor += favor
+        self.__goles_contra += contra
+
+    def registrar_acumulado(self, ganados: int, empatados: int, perdidos: int, goles_favor: int, goles_contra: int):
+        """Suma de una vez los resultados de varios partidos (los puntos se calculan aquí)"""
+        self.__ganados += ganados
+        self.__empatados += empatados
+        self.__perdidos += perdidos
+        self.__puntos += 3 * ganados + empatados
+        self.registrar_goles(goles_favor, goles_contra)
 
     def puntos(self):
         return self.__puntos
 
+    def goles_favor(self):
+        return self.__goles_favor
+
+    def goles_contra(self):
+        return self.__goles_contra
+
+    def diferencia_goles(self):
+        return self.__goles_favor - self.__goles_contra
+
+    def registro(self) -> Tuple[int, int, int]:
+        """Partidos ganados, empatados y perdidos"""
+        return self.__ganados, self.__empatados, self.__perdidos
+
     def plantilla(self):
         return [j.descripcion() for j in self._jugadores]
 
@@ -100,13 +166,25 @@ class Partido:
         self._goles_local = 0
         self._goles_visitante = 0
 
+    @property
+    def equipo_local(self):
+        return self._equipo_local
+
+    @property
+    def equipo_visitante(self):
+        return self._equipo_visitante
+
     def jugar(self, goles_local: int, goles_visitante: int):
         self._goles_local = goles_local
         self._goles_visitante = goles_visitante
+        self._equipo_local.registrar_goles(goles_local, goles_visitante)
+        self._equipo_visitante.registrar_goles(goles_visitante, goles_local)
         if goles_local > goles_visitante:
             self._equipo_local.registrar_victoria()
+            self._equipo_visitante.registrar_derrota()
         elif goles_local < goles_visitante:
             self._equipo_visitante.registrar_victoria()
+            self._equipo_local.registrar_derrota()
         else:
             self._equipo_local.registrar_empate()
             self._equipo_visitante.registrar_empate()
@@ -115,18 +193,481 @@ class Partido:
         return (f"{self._equipo_local.descripcion()} vs {self._equipo_visitante.descripcion()} | "
                 f"Resultado: {self._goles_local}-{self._goles_visitante}")
 
+# ============================================================================
+# 5. COMPOSICIÓN - Liga con tabla de posiciones siempre ordenada
+# ============================================================================
+
+class Liga:
+    """
+    Tabla de posiciones que se mantiene ordenada partido a partido: cada
+    equipo tiene una clave (puntos, diferencia de goles, goles a favor,
+    nombre) guardada en una lista ordenada. Tras cada resultado solo se
+    sacan y se vuelven a ubicar, con bisect, los dos equipos del partido.
+    """
+
+    def __init__(self, nombre: str, equipos: Optional[List[Equipo]] = None):
+        self._nombre = nombre
+        self._partidos: List[Partido] = []
+        self._tabla: List[tuple] = []             # claves ordenadas (el primero es el líder)
+        self._claves: Dict[Equipo, tuple] = {}    # equipo -> su clave actual en la tabla
+        self._numeros = count()                   # desempate final: orden de inscripción
+        self._numero: Dict[Equipo, int] = {}
+        for equipo in equipos or []:
+            self.agregar_equipo(equipo)
+
+    @property
+    def nombre(self):
+        return self._nombre
+
+    def __len__(self):
+        return len(self._tabla)
+
+    def agregar_equipo(self, equipo: Equipo):
+        if equipo not in self._claves:
+            self._numero[equipo] = next(self._numeros)
+            self._ubicar(equipo)
+
+    def _clave(self, equipo: Equipo) -> tuple:
+        # Criterios de desempate: puntos, diferencia de goles, goles a favor y nombre
+        return (-equipo.puntos(), -equipo.diferencia_goles(), -equipo.goles_favor(),
+                equipo.nombre, self._numero[equipo], equipo)
+
+    def _quitar(self, equipo: Equipo):
+        clave = self._claves[equipo]
+        indice = bisect_left(self._tabla, clave)
+        if indice == len(self._tabla) or self._tabla[indice] != clave:
+            raise RuntimeError(f"{equipo.nombre} no está en la tabla con su clave guardada; use reordenar()")
+        del self._tabla[indice]
+
+    def _ubicar(self, equipo: Equipo):
+        clave = self._clave(equipo)
+        insort(self._tabla, clave)
+        self._claves[equipo] = clave
+
+    def registrar_resultado(self, partido: Partido, goles_local: int, goles_visitante: int):
+        """Juega un partido entre equipos de la liga y reubica a ambos en la tabla"""
+        local, visitante = partido.equipo_local, partido.equipo_visitante
+        if local not in self._claves or visitante not in self._claves:
+            raise ValueError("Ambos equipos deben pertenecer a la liga")
+        if local is visitante:
+            raise ValueError(f"{local.nombre} no puede jugar contra sí mismo")
+        self._quitar(local)
+        self._quitar(visitante)
+        partido.jugar(goles_local, goles_visitante)
+        self._ubicar(local)
+        self._ubicar(visitante)
+        self._partidos.append(partido)
+
+    def jugar_partido(self, local: Equipo, visitante: Equipo, goles_local: int, goles_visitante: int,
+                      fecha: Optional[datetime] = None) -> Partido:
+        partido = Partido(local, visitante, fecha or datetime.now())
+        self.registrar_resultado(partido, goles_local, goles_visitante)
+        return partido
+
+    def reordenar(self):
+        """Rehace la tabla completa, tras actualizar muchos equipos de una vez"""
+        self._tabla = sorted(self._clave(equipo) for equipo in self._claves)
+        self._claves = {clave[-1]: clave for clave in self._tabla}
+
+    def posicion(self, equipo: Equipo) -> int:
+        """Puesto del equipo en la tabla (1 = líder)"""
+        return bisect_left(self._tabla, self._claves[equipo]) + 1
+
+    def lider(self) -> Optional[Equipo]:
+        return self._tabla[0][-1] if self._tabla else None
+
+    def clasificacion(self) -> List[Equipo]:
+        """Equipos en el orden de la tabla"""
+        return [clave[-1] for clave in self._tabla]
+
+    def mostrar_tabla(self):
+        print(f"\nTabla de posiciones - {self._nombre}")
+        print(f"{'#':>2}  {'Equipo':<24}{'PJ':>4}{'G':>4}{'E':>4}{'P':>4}{'GF':>5}{'GC':>5}{'DG':>5}{'Pts':>5}")
+        for puesto, equipo in enumerate(self.clasificacion(), 1):
+            ganados, empatados, perdidos = equipo.registro()
+            print(f"{puesto:>2}  {equipo.nombre:<24}{ganados + empatados + perdidos:>4}{ganados:>4}{empatados:>4}"
+                  f"{perdidos:>4}{equipo.goles_favor():>5}{equipo.goles_contra():>5}"
+                  f"{equipo.diferencia_goles():>+5}{equipo.puntos():>5}")
+
+# ============================================================================
+# 6. SIMULACIÓN - Pronóstico de la temporada con Monte Carlo en varios procesos
+# ============================================================================
+
+def generar_calendario(cantidad: int) -> List[List[Tuple[int, int]]]:
+    """Fechas de una temporada de ida y vuelta (método del círculo) como pares (local, visitante)"""
+    indices: List[Optional[int]] = list(range(cantidad))
+    if cantidad % 2:
+        indices.append(None)  # equipo ficticio: quien le toca, descansa esa fecha
+    total = len(indices)
+    ida = []
+    for fecha in range(total - 1):
+        partidos = []
+        for k in range(total // 2):
+            a, b = indices[k], indices[total - 1 - k]
+            if a is not None and b is not None:
+                partidos.append((a, b) if (fecha + k) % 2 == 0 else (b, a))
+        ida.append(partidos)
+        indices = [indices[0], indices[-1]] + indices[1:-1]
+    vuelta = [[(visitante, local) for local, visitante in partidos] for partidos in ida]
+    return ida + vuelta
+
+
+def _acumulada_poisson(media: float, maximo: int = 20) -> List[float]:
+    """Probabilidades acumuladas de 0..maximo-1 goles; la cola se suma al último valor"""
+    acumulada = []
+    termino, total = math.exp(-media), 0.0
+    for goles in range(maximo):
+        total += termino
+        acumulada.append(total)
+        termino *= media / (goles + 1)
+    acumulada[-1] = 1.0
+    return acumulada
+
+
+def _simular_bloque(tarea) -> List[List[int]]:
+    """Juega un bloque de temporadas y cuenta en qué puesto terminó cada equipo"""
+    partidos, cantidad_equipos, simulaciones, semilla = tarea
+    aleatorio = random.Random(semilla).random
+    histograma = [[0] * cantidad_equipos for _ in range(cantidad_equipos)]
+    equipos = range(cantidad_equipos)
+    for _ in range(simulaciones):
+        puntos = [0] * cantidad_equipos
+        diferencia = [0] * cantidad_equipos
+        goles = [0] * cantidad_equipos
+        for local, visitante, acumulada_local, acumulada_visitante in partidos:
+            # Muestreo por inversión: los goles son el primer valor cuya probabilidad acumulada supera al azar
+            goles_local = bisect_right(acumulada_local, aleatorio())
+            goles_visitante = bisect_right(acumulada_visitante, aleatorio())
+            goles[local] += goles_local
+            goles[visitante] += goles_visitante
+            saldo = goles_local - goles_visitante
+            diferencia[local] += saldo
+            diferencia[visitante] -= saldo
+            if saldo > 0:
+                puntos[local] += 3
+            elif saldo < 0:
+                puntos[visitante] += 3
+            else:
+                puntos[local] += 1
+                puntos[visitante] += 1
+        # Mismos desempates que la Liga; si persiste el empate, decide el azar
+        orden = sorted(equipos, key=lambda i: (-puntos[i], -diferencia[i], -goles[i], aleatorio()))
+        for puesto, equipo in enumerate(orden):
+            histograma[equipo][puesto] += 1
+    return histograma
+
+
+class SimuladorTemporada:
+    """
+    Pronostica una temporada de ida y vuelta con el método de Monte Carlo.
+    Los goles de un equipo en un partido siguen una distribución de Poisson
+    de media goles_promedio × su ataque / defensa del rival (× ventaja_local
+    si juega en casa). Las temporadas se reparten en bloques entre varios
+    procesos; cada bloque tiene su propio generador, con una semilla
+    derivada de la general, así que el resultado no depende de cuántos
+    procesos se usen.
+    """
+
+    def __init__(self, equipos: List[Equipo], goles_promedio: float = 1.3, ventaja_local: float = 1.25):
+        if len(equipos) < 2:
+            raise ValueError("Se necesitan al menos dos equipos")
+        self._equipos = list(equipos)
+        self._goles_promedio = goles_promedio
+        self._ventaja_local = ventaja_local
+        self._calendario = generar_calendario(len(self._equipos))
+
+    @property
+    def equipos(self):
+        return list(self._equipos)
+
+    def media_goles(self, local: Equipo, visitante: Equipo) -> Tuple[float, float]:
+        """Goles esperados del local y del visitante"""
+        return (self._goles_promedio * self._ventaja_local * local.ataque / visitante.defensa,
+                self._goles_promedio * visitante.ataque / local.defensa)
+
+    def _partidos(self) -> List[tuple]:
+        """Partidos de la temporada con las probabilidades acumuladas de goles de cada lado"""
+        partidos = []
+        for fecha in self._calendario:
+            for local, visitante in fecha:
+                media_local, media_visitante = self.media_goles(self._equipos[local], self._equipos[visitante])
+                partidos.append((local, visitante, _acumulada_poisson(media_local), _acumulada_poisson(media_visitante)))
+        return partidos
+
+    def simular(self, simulaciones: int, procesos: Optional[int] = None, semilla: int = 0,
+                tamaño_bloque: int = 1000) -> List[List[int]]:
+        """
+        Simula temporadas completas. Retorna el histograma de puestos:
+        histograma[i][p] = veces que el equipo i terminó en el puesto p + 1
+        """
+        if simulaciones < 1:
+            raise ValueError(f"Se necesita al menos una simulación (se pidieron {simulaciones})")
+        if tamaño_bloque < 1:
+            raise ValueError(f"El tamaño de bloque debe ser al menos 1 (se pidió {tamaño_bloque})")
+        partidos = self._partidos()
+        cantidad = len(self._equipos)
+        tareas = [(partidos, cantidad, min(tamaño_bloque, simulaciones - inicio), f"{semilla}-{bloque}")
+                  for bloque, inicio in enumerate(range(0, simulaciones, tamaño_bloque))]
+        procesos = procesos or os.cpu_count() or 1
+        if procesos == 1:
+            parciales = map(_simular_bloque, tareas)
+            return self._sumar(parciales, cantidad)
+        with multiprocessing.Pool(procesos) as pool:
+            return self._sumar(pool.imap_unordered(_simular_bloque, tareas), cantidad)
+
+    @staticmethod
+    def _sumar(parciales, cantidad: int) -> List[List[int]]:
+        total = [[0] * cantidad for _ in range(cantidad)]
+        for parcial in parciales:
+            for fila_total, fila in zip(total, parcial):
+                for puesto, veces in enumerate(fila):
+                    fila_total[puesto] += veces
+        return total
+
+    def pronostico(self, simulaciones: int, descensos: int = 2, **opciones) -> List[Dict]:
+        """Probabilidad de salir campeón y de descender, y puesto medio, de cada equipo (del favorito al último)"""
+        if not 0 <= descensos <= len(self._equipos):
+            raise ValueError(f"Los descensos deben estar entre 0 y {len(self._equipos)} (se pidieron {descensos})")
+        histograma = self.simular(simulaciones, **opciones)
+        filas = []
+        for equipo, conteos in zip(self._equipos, histograma):
+            filas.append({
+                "equipo": equipo.nombre,
+                "campeon": conteos[0] / simulaciones,
+                "descenso": sum(conteos[len(conteos) - descensos:]) / simulaciones if descensos else 0.0,
+                "puesto_medio": sum((puesto + 1) * veces for puesto, veces in enumerate(conteos)) / simulaciones,
+            })
+        return sorted(filas, key=lambda fila: fila["puesto_medio"])
+
+    def mostrar_pronostico(self, simulaciones: int, descensos: int = 2, **opciones):
+        print(f"\nPronóstico ({simulaciones:,} temporadas simuladas)")
+        print(f"{'Equipo':<26}{'Campeón':>9}{'Desciende':>11}{'Puesto medio':>14}")
+        for fila in self.pronostico(simulaciones, descensos, **opciones):
+            print(f"{fila['equipo']:<26}{fila['campeon']:>9.1%}{fila['descenso']:>11.1%}{fila['puesto_medio']:>14.2f}")
+
+# ============================================================================
+# 7. SIMULACIÓN VECTORIZADA - Fechas y temporadas enteras con NumPy
+# ============================================================================
+
+class MotorVectorizado:
+    """
+    Juega fechas o temporadas enteras de una vez con NumPy, sin un objeto
+    Partido ni una llamada por partido. Usa el mismo modelo que
+    SimuladorTemporada, salvo que aquí la distribución de Poisson no se
+    trunca: allá un equipo marca a lo sumo 19 goles por partido (la tabla
+    acumulada de _acumulada_poisson tiene 20 valores), una diferencia
+    despreciable con medias de uno a tres goles. Los goles de todos los
+    partidos salen de una sola muestra de Poisson (una fila por temporada),
+    y las tablas se calculan multiplicando por matrices de incidencia
+    partido × equipo.
+    """
+
+    def __init__(self, equipos: List[Equipo], goles_promedio: float = 1.3, ventaja_local: float = 1.25,
+                 semilla: Optional[int] = None):
+        if np is None:
+            raise RuntimeError("El motor vectorizado necesita NumPy (pip install numpy)")
+        if len(equipos) < 2:
+            raise ValueError("Se necesitan al menos dos equipos")
+        self._equipos = list(equipos)
+        self._azar = np.random.default_rng(semilla)
+        calendario = generar_calendario(len(self._equipos))
+        # Partidos de la temporada en orden de fechas; la fecha f ocupa [inicios[f], inicios[f + 1])
+        self._inicios = np.cumsum([0] + [len(fecha) for fecha in calendario])
+        pares = np.array([partido for fecha in calendario for partido in fecha])
+        self._locales, self._visitantes = pares[:, 0], pares[:, 1]
+        ataque = np.array([equipo.ataque for equipo in self._equipos])
+        defensa = np.array([equipo.defensa for equipo in self._equipos])
+        self._medias_local = goles_promedio * ventaja_local * ataque[self._locales] / defensa[self._visitantes]
+        self._medias_visitante = goles_promedio * ataque[self._visitantes] / defensa[self._locales]
+
+    @property
+    def fechas(self) -> int:
+        return len(self._inicios) - 1
+
+    @staticmethod
+    def _validar_temporadas(temporadas: int):
+        if temporadas < 1:
+            raise ValueError(f"Se necesita al menos una temporada (se pidieron {temporadas})")
+
+    def _partidos(self, fecha: Optional[int]) -> slice:
+        if fecha is None:
+            return slice(None)
+        if not 0 <= fecha < self.fechas:
+            raise ValueError(f"La fecha debe estar entre 0 y {self.fechas - 1}")
+        return slice(self._inicios[fecha], self._inicios[fecha + 1])
+
+    def simular_goles(self, temporadas: int = 1, fecha: Optional[int] = None):
+        """Goles (local, visitante) de cada partido: arreglos de forma (temporadas, partidos)"""
+        self._validar_temporadas(temporadas)
+        partidos = self._partidos(fecha)
+        medias_local, medias_visitante = self._medias_local[partidos], self._medias_visitante[partidos]
+        return (self._azar.poisson(medias_local, size=(temporadas, len(medias_local))),
+                self._azar.poisson(medias_visitante, size=(temporadas, len(medias_visitante))))
+
+    def calcular_tablas(self, goles_local, goles_visitante, fecha: Optional[int] = None) -> Dict[str, object]:
+        """
+        Ganados, empatados, perdidos, goles a favor y en contra, puntos y
+        diferencia de goles de cada equipo: arreglos (temporadas, equipos)
+        """
+        partidos = self._partidos(fecha)
+        cantidad = len(self._equipos)
+        locales, visitantes = self._locales[partidos], self._visitantes[partidos]
+        # Matrices de incidencia: partido × equipo, con un 1 donde el equipo juega de local (o de visitante)
+        incidencia_local = np.zeros((len(locales), cantidad))
+        incidencia_local[np.arange(len(locales)), locales] = 1.0
+        incidencia_visitante = np.zeros((len(visitantes), cantidad))
+        incidencia_visitante[np.arange(len(visitantes)), visitantes] = 1.0
+        ambos = incidencia_local + incidencia_visitante
+
+        def por_equipo(local, visitante):
+            # Suma lo que cada equipo hizo de local y de visitante; los valores son enteros exactos
+            return np.rint(local.astype(float) @ incidencia_local +
+                           visitante.astype(float) @ incidencia_visitante).astype(np.int64)
+
+        gana_local, gana_visitante = goles_local > goles_visitante, goles_local < goles_visitante
+        tablas = {
+            "ganados": por_equipo(gana_local, gana_visitante),
+            "empatados": np.rint((goles_local == goles_visitante).astype(float) @ ambos).astype(np.int64),
+            "perdidos": por_equipo(gana_visitante, gana_local),
+            "goles_favor": por_equipo(goles_local, goles_visitante),
+            "goles_contra": por_equipo(goles_visitante, goles_local),
+        }
+        tablas["puntos"] = 3 * tablas["ganados"] + tablas["empatados"]
+        tablas["diferencia"] = tablas["goles_favor"] - tablas["goles_contra"]
+        return tablas
+
+    def _jugar(self, fecha: Optional[int], liga: Optional[Liga]) -> Dict[str, object]:
+        tablas = self.calcular_tablas(*self.simular_goles(1, fecha), fecha=fecha)
+        columnas = [tablas[campo][0].tolist() for campo in
+                    ("ganados", "empatados", "perdidos", "goles_favor", "goles_contra")]
+        for equipo, acumulado in zip(self._equipos, zip(*columnas)):
+            equipo.registrar_acumulado(*acumulado)
+        if liga is not None:
+            liga.reordenar()
+        return tablas
+
+    def jugar_fecha(self, fecha: int, liga: Optional[Liga] = None) -> Dict[str, object]:
+        """Juega una fecha, suma los resultados a cada Equipo y, si se indica, reordena la liga"""
+        return self._jugar(fecha, liga)
+
+    def jugar_temporada(self, liga: Optional[Liga] = None) -> Dict[str, object]:
+        """Juega la temporada completa, suma los resultados a cada Equipo y, si se indica, reordena la liga"""
+        return self._jugar(None, liga)
+
+    def simular_temporadas(self, temporadas: int, tamaño_bloque: int = 10_000):
+        """
+        Histograma de puestos de muchas temporadas (como SimuladorTemporada.simular),
+        en bloques para acotar la memoria: histograma[i][p] = veces que el equipo i terminó en el puesto p + 1
+        """
+        self._validar_temporadas(temporadas)
+        if tamaño_bloque < 1:
+            raise ValueError(f"El tamaño de bloque debe ser al menos 1 (se pidió {tamaño_bloque})")
+        cantidad = len(self._equipos)
+        histograma = np.zeros(cantidad * cantidad, dtype=np.int64)
+        for inicio in range(0, temporadas, tamaño_bloque):
+            bloque = min(tamaño_bloque, temporadas - inicio)
+            tablas = self.calcular_tablas(*self.simular_goles(bloque))
+            # Mismos desempates que la Liga; si persiste el empate, decide el azar (la última clave manda)
+            orden = np.lexsort((self._azar.random((bloque, cantidad)), -tablas["goles_favor"],
+                                -tablas["diferencia"], -tablas["puntos"]), axis=-1)
+            histograma += np.bincount((orden * cantidad + np.arange(cantidad)).ravel(), minlength=cantidad * cantidad)
+        return histograma.reshape(cantidad, cantidad)
+
+# ============================================================================
+# PRUEBAS DE RENDIMIENTO
+# ============================================================================
+
+def generar_equipos(cantidad: int, semilla: int = 0) -> List[Equipo]:
+    """Equipos con fuerzas al azar para pruebas de rendimiento"""
+    azar = random.Random(semilla)
+    entrenador = Entrenador("Entrenador", 45, "Ecuador", "Equilibrado")
+    return [Equipo(f"Equipo {i + 1}", entrenador, azar.uniform(0.7, 1.4), azar.uniform(0.7, 1.4))
+            for i in range(cantidad)]
+
+
+def benchmark_temporadas(simulaciones: int = 100_000, cantidad_equipos: int = 20):
+    """Temporadas simuladas por segundo según la cantidad de procesos"""
+    simulador = SimuladorTemporada(generar_equipos(cantidad_equipos))
+    nucleos = os.cpu_count() or 1
+    print(f"\n⏱️ BENCHMARK TEMPORADAS ({simulaciones:,} temporadas de {cantidad_equipos} equipos, {nucleos} núcleos)")
+    referencia = base = None
+    for procesos in sorted({1, 2, 4, nucleos}):
+        inicio = time.perf_counter()
+        histograma = simulador.simular(simulaciones, procesos=procesos)
+        segundos = time.perf_counter() - inicio
+        # Misma semilla, mismos bloques: el resultado no cambia con los procesos
+        assert referencia is None or histograma == referencia
+        referencia = histograma
+        base = base or segundos
+        print(f"   {procesos:>2} procesos: {segundos:8.2f}s  {simulaciones / segundos:>10,.0f} temporadas/s  "
+              f"(x{base / segundos:.2f})")
+
+
+def benchmark_vectorizado(temporadas: int = 2_000, cantidad_equipos: int = 20):
+    """Partidos por segundo: un Partido.jugar por partido vs. el motor vectorizado"""
+    if np is None:
+        print("\n⚠️ NumPy no está instalado: se omite el benchmark vectorizado")
+        return
+    equipos = generar_equipos(cantidad_equipos)
+    simulador = SimuladorTemporada(equipos)
+    partidos_por_temporada = sum(len(fecha) for fecha in generar_calendario(cantidad_equipos))
+    total = temporadas * partidos_por_temporada
+    print(f"\n⏱️ BENCHMARK VECTORIZADO ({temporadas:,} temporadas de {cantidad_equipos} equipos, "
+          f"{total:,} partidos)")
+
+    def medir(etiqueta: str, funcion):
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        print(f"   {etiqueta + ':':<38}{segundos:8.3f}s  {total / segundos:>12,.0f} partidos/s")
+
+    def con_partidos():
+        # Un objeto Partido y una llamada a jugar() por partido, con goles de Poisson muestreados en Python
+        azar = random.Random(0)
+        fecha = datetime.now()
+        tablas = {}
+        for local, visitante, acumulada_local, acumulada_visitante in simulador._partidos():
+            tablas[local, visitante] = (acumulada_local, acumulada_visitante)
+        for _ in range(temporadas):
+            for (local, visitante), (acumulada_local, acumulada_visitante) in tablas.items():
+                Partido(equipos[local], equipos[visitante], fecha).jugar(
+                    bisect_right(acumulada_local, azar.random()), bisect_right(acumulada_visitante, azar.random()))
+
+    motor = MotorVectorizado(equipos, semilla=0)
+    medir("Partido.jugar por partido", con_partidos)
+    medir("Motor: jugar_temporada() por temporada", lambda: [motor.jugar_temporada() for _ in range(temporadas)])
+    medir("Motor: todas las temporadas juntas", lambda: motor.simular_temporadas(temporadas))
+    medir("SimuladorTemporada (1 proceso)", lambda: simulador.simular(temporadas, procesos=1))
+
+
+# Benchmarks disponibles desde la línea de comandos: --benchmark <nombre>
+BENCHMARKS = {
+    "temporadas": benchmark_temporadas,
+    "vectorizado": benchmark_vectorizado,
+}
+
+
+def ejecutar_benchmarks(nombres: List[str]):
+    """Ejecuta los benchmarks indicados (todos si no se indica ninguno)"""
+    for nombre in nombres or BENCHMARKS:
+        if nombre not in BENCHMARKS:
+            print(f"❌ Benchmark desconocido: {nombre}. Disponibles: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[nombre]()
+
 # ============================================================================
 # EJEMPLO DE USO: LIGA BARCELONA
 # ============================================================================
 
-if __name__ == "__main__":
+def main():
     # Entrenadores
     entrenador_bsc = Entrenador("Diego López", 49, "Uruguay", "Ofensivo")
     entrenador_liga = Entrenador("Pablo Repetto", 50, "Uruguay", "Defensivo")
 
     # Equipos
-    barcelona = Equipo("Barcelona SC", entrenador_bsc)
-    liga_quito = Equipo("Liga de Quito", entrenador_liga)
+    # (ataque y defensa son fuerzas de ejemplo para el pronóstico; 1.0 = promedio)
+    barcelona = Equipo("Barcelona SC", entrenador_bsc, ataque=1.25, defensa=1.1)
+    liga_quito = Equipo("Liga de Quito", entrenador_liga, ataque=1.2, defensa=1.2)
 
     # Agregar jugadores a Barcelona SC
     nombres_bsc = [
@@ -144,9 +685,15 @@ if __name__ == "__main__":
     for i, nombre in enumerate(nombres_ldu, 1):
         liga_quito.agregar_jugador(Jugador(nombre, 24+i, "Ecuador", "Titular", i))
 
+    # Liga con otros dos equipos
+    emelec = Equipo("Emelec", Entrenador("Jorge Célico", 60, "Argentina", "Equilibrado"))
+    independiente = Equipo("Independiente del Valle", Entrenador("Javier Rabanal", 48, "España", "Posesión"),
+                           ataque=1.3, defensa=1.15)
+    liga_pro = Liga("LigaPro Ecuador", [barcelona, liga_quito, emelec, independiente])
+
     # Jugar partido
     partido = Partido(barcelona, liga_quito, datetime.now())
-    partido.jugar(2, 1)  # Barcelona SC gana 2-1
+    liga_pro.registrar_resultado(partido, 2, 1)  # Barcelona SC gana 2-1
 
     print(partido.resumen())
     print("\nPlantilla Barcelona SC:")
@@ -155,3 +702,27 @@ if __name__ == "__main__":
     print("\nPlantilla Liga de Quito:")
     for jugador in liga_quito.plantilla():
         print(jugador)
+
+    # Más fechas: la tabla se reordena tras cada resultado
+    liga_pro.jugar_partido(emelec, independiente, 1, 1)
+    liga_pro.jugar_partido(independiente, barcelona, 3, 0)
+    liga_pro.jugar_partido(liga_quito, emelec, 2, 0)
+    liga_pro.mostrar_tabla()
+    print(f"\nLíder: {liga_pro.lider().nombre} | Puesto de Emelec: {liga_pro.posicion(emelec)}")
+
+    # Pronóstico de una temporada completa según la fuerza de cada equipo
+    SimuladorTemporada(liga_pro.clasificacion()).mostrar_pronostico(20_000, descensos=1)
+
+    # Con NumPy: se juega de una vez una temporada completa de ida y vuelta, que se suma
+    # a los partidos ya jugados, y la tabla se reordena al final
+    if np is not None:
+        motor = MotorVectorizado(liga_pro.clasificacion(), semilla=7)
+        motor.jugar_temporada(liga_pro)
+        liga_pro.mostrar_tabla()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        ejecutar_benchmarks(sys.argv[2:])
+    else:
+        main()
@@ -10,53 +10,718 @@ Fecha: 23 de Junio 2025
 Materia: Programación Orientada a Objetos
 """
 
+import json
+import math
+import os
+import sys
+import multiprocessing
+import itertools
+from bisect import bisect_left
+
+
+# Campos que se pueden modificar en un libro y el tipo que debe tener cada uno
+CAMPOS_EDITABLES = {'titulo': str, 'autor': str, 'paginas': int, 'leido': bool}
+
+
+def _validar_cambios(cambios):
+    """
+    Verifica que los cambios de un libro sean aplicables, sin modificar nada
+
+    Args:
+        cambios (dict): Campos a modificar y sus nuevos valores
+
+    Raises:
+        ValueError: Si algún campo no es editable o su valor no es válido
+    """
+    desconocidos = set(cambios) - CAMPOS_EDITABLES.keys()
+    if desconocidos:
+        raise ValueError(f"Campos no válidos: {', '.join(sorted(desconocidos))}")
+    for campo, valor in cambios.items():
+        tipo = CAMPOS_EDITABLES[campo]
+        # bool es subclase de int, pero True no es un número de páginas
+        if not isinstance(valor, tipo) or (tipo is int and isinstance(valor, bool)):
+            raise ValueError(f"'{campo}' debe ser {tipo.__name__}, no {type(valor).__name__}")
+    if cambios.get('paginas', 1) <= 0:
+        raise ValueError("El número de páginas debe ser positivo")
+
+
+class BibliotecaPersonal:
+    """
+    Colección de libros indexada, con la misma forma de libro (diccionario)
+    que la versión en lista.
+
+    Guarda los libros en un diccionario por id y mantiene un índice de
+    palabras de título y autor, para que una búsqueda solo revise los libros
+    candidatos. Los contadores de leídos y páginas se actualizan en cada
+    cambio, así las estadísticas no recorren la colección.
+
+    Los ids se asignan con un contador que solo avanza (y se guarda junto con
+    la colección), por lo que nunca se repiten aunque se eliminen libros.
+
+    Las funciones del módulo (buscar_libro, calcular_estadisticas,
+    mostrar_todos_libros...) aceptan tanto una lista como una
+    BibliotecaPersonal. agregar_libro solo acepta una BibliotecaPersonal,
+    porque una lista no guarda el contador de ids; una lista existente se
+    incorpora con fusionar.
+    """
+
+    def __init__(self):
+        # id_libro -> diccionario del libro
+        self._libros = {}
+        # id_libro -> (título en minúsculas, autor en minúsculas)
+        self._textos = {}
+        # palabra en minúsculas -> ids de los libros que la contienen
+        self._indice = {}
+        # sufijo de alguna palabra indexada -> palabras que terminan en él
+        self._sufijos = {}
+        # Claves de _sufijos ordenadas, para encontrar por bisección los
+        # sufijos que empiezan con un texto (es decir, las palabras que lo
+        # contienen). Los sufijos nuevos esperan en _sufijos_nuevos y se
+        # ordenan en la siguiente búsqueda; los borrados se saltan al buscar.
+        self._sufijos_ordenados = []
+        self._sufijos_nuevos = []
+        self._sufijos_borrados = 0
+        self._total_leidos = 0
+        self._total_paginas = 0
+        # Próximo id a asignar; nunca retrocede
+        self._siguiente_id = 1
+
+    def __len__(self):
+        return len(self._libros)
+
+    def __iter__(self):
+        return iter(self._libros.values())
+
+    def _nuevo_id(self):
+        id_libro = self._siguiente_id
+        self._siguiente_id += 1
+        return id_libro
+
+    def _indexar(self, libro):
+        """Registra el libro en el índice de palabras y en los contadores."""
+        id_libro = libro['id_libro']
+        textos = (libro['titulo'].lower(), libro['autor'].lower())
+        self._textos[id_libro] = textos
+        for palabra in set(textos[0].split() + textos[1].split()):
+            ids = self._indice.get(palabra)
+            if ids is None:
+                ids = self._indice[palabra] = set()
+                self._registrar_sufijos(palabra)
+            ids.add(id_libro)
+        self._total_leidos += bool(libro['leido'])
+        self._total_paginas += libro['paginas']
+
+    def _desindexar(self, libro):
+        """Quita el libro del índice de palabras y de los contadores."""
+        id_libro = libro['id_libro']
+        titulo, autor = self._textos.pop(id_libro)
+        for palabra in set(titulo.split() + autor.split()):
+            ids = self._indice[palabra]
+            ids.discard(id_libro)
+            if not ids:
+                del self._indice[palabra]
+                self._olvidar_sufijos(palabra)
+        self._total_leidos -= bool(libro['leido'])
+        self._total_paginas -= libro['paginas']
+
+    def _registrar_sufijos(self, palabra):
+        for inicio in range(len(palabra)):
+            sufijo = palabra[inicio:]
+            palabras = self._sufijos.get(sufijo)
+            if palabras is None:
+                palabras = self._sufijos[sufijo] = set()
+                self._sufijos_nuevos.append(sufijo)
+            palabras.add(palabra)
+
+    def _olvidar_sufijos(self, palabra):
+        for inicio in range(len(palabra)):
+            sufijo = palabra[inicio:]
+            palabras = self._sufijos[sufijo]
+            palabras.discard(palabra)
+            if not palabras:
+                del self._sufijos[sufijo]
+                self._sufijos_borrados += 1
+
+    def _palabras_que_contienen(self, texto):
+        """
+        Palabras indexadas que contienen el texto: las que tienen un sufijo que
+        empieza con él, contiguos en la lista ordenada de sufijos.
+        """
+        if self._sufijos_borrados > len(self._sufijos):
+            # Demasiadas entradas obsoletas: se reconstruye la lista
+            self._sufijos_ordenados = sorted(self._sufijos)
+            self._sufijos_nuevos = []
+            self._sufijos_borrados = 0
+        elif self._sufijos_nuevos:
+            # La lista ya ordenada más un tramo nuevo: sort() los mezcla en O(n + k log k)
+            self._sufijos_ordenados += self._sufijos_nuevos
+            self._sufijos_ordenados.sort()
+            self._sufijos_nuevos = []
+        ordenados = self._sufijos_ordenados
+        palabras = set()
+        for posicion in range(bisect_left(ordenados, texto), len(ordenados)):
+            sufijo = ordenados[posicion]
+            if not sufijo.startswith(texto):
+                break
+            palabras.update(self._sufijos.get(sufijo, ()))
+        return palabras
+
+    def _insertar(self, libro):
+        self._libros[libro['id_libro']] = libro
+        self._indexar(libro)
+
+    def agregar(self, titulo, autor, paginas, leido):
+        """
+        Agrega un libro a la colección
+
+        Args:
+            titulo (str): Título del libro
+            autor (str): Autor del libro
+            paginas (int): Número de páginas
+            leido (bool): Estado de lectura del libro
+
+        Returns:
+            dict: El libro agregado
+        """
+        libro = {
+            'titulo': titulo,
+            'autor': autor,
+            'paginas': paginas,
+            'leido': leido,
+            'id_libro': self._nuevo_id()
+        }
+        self._insertar(libro)
+        return libro
+
+    def obtener(self, id_libro):
+        """
+        Busca un libro por id
+
+        Args:
+            id_libro (int): Id del libro
+
+        Returns:
+            dict: El libro, o None si no existe
+        """
+        return self._libros.get(id_libro)
+
+    def actualizar(self, id_libro, **cambios):
+        """
+        Modifica campos de un libro (titulo, autor, paginas, leido)
+
+        Args:
+            id_libro (int): Id del libro
+            **cambios: Campos a modificar y sus nuevos valores
+
+        Returns:
+            dict: El libro actualizado, o None si no existe
+
+        Raises:
+            ValueError: Si algún cambio no es válido (el libro queda sin modificar)
+        """
+        if id_libro not in self._libros:
+            return None
+        # Se valida todo antes de desindexar, para no dejar el índice a medias
+        _validar_cambios(cambios)
+        # El libro conserva su lugar en la colección; solo se reindexa
+        libro = self._libros[id_libro]
+        self._desindexar(libro)
+        libro.update(cambios)
+        self._indexar(libro)
+        return libro
+
+    def eliminar(self, id_libro):
+        """
+        Elimina un libro; su id no se vuelve a asignar
+
+        Args:
+            id_libro (int): Id del libro
+
+        Returns:
+            dict: El libro eliminado, o None si no existe
+        """
+        libro = self._libros.pop(id_libro, None)
+        if libro is not None:
+            self._desindexar(libro)
+        return libro
+
+    def fusionar(self, otra):
+        """
+        Incorpora los libros de otra colección (o lista de libros). Los que
+        traen un id libre lo conservan; los que chocan con uno existente
+        reciben un id nuevo. Recorre cada libro una sola vez.
+
+        Args:
+            otra (BibliotecaPersonal | list): Libros a incorporar
+
+        Returns:
+            dict: Ids reasignados, {id original: id nuevo}
+
+        Raises:
+            ValueError: Si los libros a incorporar repiten algún id (no se incorpora ninguno)
+        """
+        libros = list(otra)
+        ids = set()
+        for libro in libros:
+            if libro['id_libro'] in ids:
+                raise ValueError(f"Los libros a incorporar repiten el id {libro['id_libro']}")
+            ids.add(libro['id_libro'])
+        # El contador debe quedar por encima de todos los ids que se conservan
+        maximo = max(ids, default=0)
+        self._siguiente_id = max(self._siguiente_id, maximo + 1)
+        reasignados = {}
+        for libro in libros:
+            copia = dict(libro)
+            if copia['id_libro'] in self._libros:
+                copia['id_libro'] = self._nuevo_id()
+                reasignados[libro['id_libro']] = copia['id_libro']
+            self._insertar(copia)
+        return reasignados
+
+    def guardar(self, ruta):
+        """
+        Guarda la colección y el contador de ids en un archivo JSON
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({'siguiente_id': self._siguiente_id, 'libros': list(self._libros.values())},
+                      archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Crea una colección a partir de un archivo generado por guardar
+
+        Args:
+            ruta (str): Archivo JSON
+
+        Returns:
+            BibliotecaPersonal: La colección cargada
+        """
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        biblioteca = cls()
+        for libro in datos['libros']:
+            biblioteca._insertar(libro)
+        maximo = max(biblioteca._libros, default=0)
+        biblioteca._siguiente_id = max(datos.get('siguiente_id', 1), maximo + 1)
+        return biblioteca
+
+    def marcar_leido(self, id_libro, leido=True):
+        """
+        Cambia el estado de lectura de un libro (usar en lugar de modificar
+        el diccionario, para mantener las estadísticas al día)
+
+        Args:
+            id_libro (int): Id del libro
+            leido (bool): Nuevo estado de lectura
+        """
+        libro = self._libros[id_libro]
+        self._total_leidos += bool(leido) - bool(libro['leido'])
+        libro['leido'] = leido
+
+    def buscar(self, termino_busqueda):
+        """
+        Busca libros cuyo título o autor contenga el término, igual que
+        buscar_libro sobre una lista
+
+        Args:
+            termino_busqueda (str): Término a buscar
+
+        Returns:
+            list: Libros encontrados, ordenados por id
+        """
+        termino_minuscula = termino_busqueda.lower()
+        palabras = termino_minuscula.split()
+        if not palabras:
+            candidatos = self._libros.keys()
+        else:
+            # Las palabras interiores del término son palabras completas del
+            # texto y se buscan directamente en el índice; la primera y la
+            # última pueden estar cortadas, así que se buscan como parte de
+            # alguna palabra indexada
+            candidatos = None
+            for posicion, palabra in enumerate(palabras):
+                if 0 < posicion < len(palabras) - 1:
+                    ids = self._indice.get(palabra, set())
+                else:
+                    ids = set()
+                    for indexada in self._palabras_que_contienen(palabra):
+                        ids |= self._indice[indexada]
+                candidatos = ids if candidatos is None else candidatos & ids
+                if not candidatos:
+                    return []
+        # Verificación final con la misma regla que la búsqueda en lista
+        return [self._libros[id_libro] for id_libro in sorted(candidatos)
+                if termino_minuscula in self._textos[id_libro][0] or termino_minuscula in self._textos[id_libro][1]]
+
+    def estadisticas(self):
+        """
+        Estadísticas de la colección en tiempo constante
+
+        Returns:
+            dict: Mismo diccionario que calcular_estadisticas, o None si está vacía
+        """
+        total_libros = len(self._libros)
+        if not total_libros:
+            return None
+        return {
+            'total_libros': total_libros,
+            'libros_leidos': self._total_leidos,
+            'libros_pendientes': total_libros - self._total_leidos,
+            'total_paginas': self._total_paginas,
+            'promedio_paginas': self._total_paginas / total_libros,
+            'porcentaje_leidos': (self._total_leidos / total_libros) * 100
+        }
+
+
+class TDigest:
+    """
+    Resumen t-digest para cuantiles aproximados en memoria constante.
+
+    Los valores se agrupan en centroides (media, peso); los de los extremos
+    quedan pequeños y los del centro grandes, así que los cuantiles altos y
+    bajos son los más precisos. Dos resúmenes se pueden fusionar, lo que
+    permite procesar archivos por separado y combinar los resultados.
+    """
+
+    def __init__(self, compresion=100):
+        """
+        Args:
+            compresion (int): Controla la cantidad de centroides (y la precisión)
+        """
+        self.compresion = compresion
+        self._centroides = []
+        self._pendientes = []
+        self.total = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def agregar(self, valor, peso=1):
+        """
+        Agrega un valor al resumen
+
+        Args:
+            valor (float): Valor observado
+            peso (int): Cantidad de veces que se observó
+        """
+        self._pendientes.append((valor, peso))
+        self.total += peso
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        if len(self._pendientes) >= 10 * self.compresion:
+            self._comprimir()
+
+    def fusionar(self, otro):
+        """
+        Incorpora los valores resumidos en otro TDigest
+
+        Args:
+            otro (TDigest): Resumen a incorporar
+        """
+        otro._comprimir()
+        self._pendientes.extend(otro._centroides)
+        self.total += otro.total
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._comprimir()
+
+    def _escala(self, q):
+        # Función de escala k1: centroides chicos cerca de q = 0 y q = 1
+        return self.compresion / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _comprimir(self):
+        """Une los valores pendientes con los centroides existentes."""
+        if not self._pendientes:
+            return
+        puntos = sorted(self._centroides + self._pendientes)
+        self._pendientes = []
+        nuevos = []
+        media, peso = puntos[0]
+        acumulado = 0
+        limite = self._escala(0) + 1
+        for media_punto, peso_punto in puntos[1:]:
+            if self._escala((acumulado + peso + peso_punto) / self.total) <= limite:
+                peso += peso_punto
+                media += (media_punto - media) * peso_punto / peso
+            else:
+                nuevos.append((media, peso))
+                acumulado += peso
+                limite = self._escala(acumulado / self.total) + 1
+                media, peso = media_punto, peso_punto
+        nuevos.append((media, peso))
+        self._centroides = nuevos
+
+    def cuantil(self, q):
+        """
+        Valor aproximado por debajo del cual queda la fracción q de los datos
+
+        Args:
+            q (float): Fracción entre 0 y 1
+
+        Returns:
+            float: El cuantil, o None si el resumen está vacío
+        """
+        self._comprimir()
+        if not self._centroides:
+            return None
+        objetivo = q * self.total
+        # Cada centroide representa su media en el centro de su peso acumulado
+        anterior_posicion, anterior_valor = 0, self.minimo
+        acumulado = 0
+        for media, peso in self._centroides:
+            posicion = acumulado + peso / 2
+            if objetivo < posicion:
+                fraccion = (objetivo - anterior_posicion) / (posicion - anterior_posicion)
+                return anterior_valor + fraccion * (media - anterior_valor)
+            anterior_posicion, anterior_valor = posicion, media
+            acumulado += peso
+        if self.total == anterior_posicion:
+            return self.maximo
+        fraccion = (objetivo - anterior_posicion) / (self.total - anterior_posicion)
+        return anterior_valor + min(fraccion, 1) * (self.maximo - anterior_valor)
+
+
+class EstadisticasStreaming:
+    """
+    Estadísticas de lectura calculadas en una sola pasada y en memoria
+    constante, para registros que no caben en memoria (por ejemplo archivos
+    JSON Lines de varios gigabytes). Produce el mismo diccionario que
+    calcular_estadisticas y, además, cuantiles aproximados de 'paginas'.
+    Dos instancias se pueden fusionar.
+    """
+
+    def __init__(self, compresion=100):
+        """
+        Args:
+            compresion (int): Compresión del t-digest de páginas
+        """
+        self.total_libros = 0
+        self.libros_leidos = 0
+        self.total_paginas = 0
+        self.lineas_invalidas = 0
+        self.paginas = TDigest(compresion)
+
+    def agregar(self, libro):
+        """
+        Agrega un libro (diccionario con 'paginas' y 'leido')
+
+        Args:
+            libro (dict): Libro o registro de lectura
+
+        Raises:
+            KeyError, TypeError, ValueError: Si el registro no es válido; en
+                ese caso ningún contador se modifica
+        """
+        # Primero se leen y validan los campos, después se actualiza todo junto
+        leido = bool(libro['leido'])
+        paginas = libro['paginas']
+        if isinstance(paginas, bool) or not isinstance(paginas, (int, float)):
+            raise TypeError(f"'paginas' debe ser un número, no {type(paginas).__name__}")
+        if not math.isfinite(paginas) or paginas < 0:
+            raise ValueError(f"'paginas' no válido: {paginas}")
+        self.total_libros += 1
+        self.libros_leidos += leido
+        self.total_paginas += paginas
+        self.paginas.agregar(paginas)
+
+    def fusionar(self, otra):
+        """
+        Incorpora las estadísticas de otra instancia
+
+        Args:
+            otra (EstadisticasStreaming): Estadísticas a incorporar
+        """
+        self.total_libros += otra.total_libros
+        self.libros_leidos += otra.libros_leidos
+        self.total_paginas += otra.total_paginas
+        self.lineas_invalidas += otra.lineas_invalidas
+        self.paginas.fusionar(otra.paginas)
+
+    def resultado(self):
+        """
+        Returns:
+            dict: Mismo diccionario que calcular_estadisticas, o None si no hay libros
+        """
+        if not self.total_libros:
+            return None
+        return {
+            'total_libros': self.total_libros,
+            'libros_leidos': self.libros_leidos,
+            'libros_pendientes': self.total_libros - self.libros_leidos,
+            'total_paginas': self.total_paginas,
+            'promedio_paginas': self.total_paginas / self.total_libros,
+            'porcentaje_leidos': (self.libros_leidos / self.total_libros) * 100
+        }
+
+    def cuantiles_paginas(self, cuantiles=(0.5, 0.9, 0.99)):
+        """
+        Args:
+            cuantiles (tuple): Fracciones entre 0 y 1
+
+        Returns:
+            dict: {fracción: páginas aproximadas}
+        """
+        return {q: self.paginas.cuantil(q) for q in cuantiles}
+
 
 def agregar_libro(biblioteca, titulo, autor, paginas, leido):
     """
     Agrega un nuevo libro a la biblioteca
 
     Args:
-        biblioteca (list): Lista de libros
+        biblioteca (BibliotecaPersonal): Colección indexada
         titulo (str): Título del libro
         autor (str): Autor del libro
         paginas (int): Número de páginas
         leido (bool): Estado de lectura del libro
-    """
-    # Crear diccionario con información del libro
-    nuevo_libro = {
-        'titulo': titulo,
-        'autor': autor,
-        'paginas': paginas,
-        'leido': leido,
-        'id_libro': len(biblioteca) + 1
-    }
 
-    biblioteca.append(nuevo_libro)
+    Raises:
+        TypeError: Si biblioteca no es una BibliotecaPersonal (una lista no
+                   tiene un contador de ids; úsese BibliotecaPersonal.fusionar)
+    """
+    if not isinstance(biblioteca, BibliotecaPersonal):
+        raise TypeError("agregar_libro necesita una BibliotecaPersonal: una lista no guarda el contador "
+                        "de ids (incorpórela con BibliotecaPersonal().fusionar(lista))")
+    biblioteca.agregar(titulo, autor, paginas, leido)
     print(f"✓ Libro '{titulo}' agregado exitosamente a la biblioteca.")
 
 
-def mostrar_todos_libros(biblioteca):
+def iterar_paginas(biblioteca, tamaño_pagina=20, desplazamiento=0):
+    """
+    Recorre los libros de a una página por vez, sin copiar la colección
+
+    Args:
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
+        tamaño_pagina (int): Libros por página
+        desplazamiento (int): Libros a saltar antes de la primera página
+
+    Yields:
+        list: Libros de cada página
+    """
+    libros = itertools.islice(iter(biblioteca), desplazamiento, None)
+    while True:
+        pagina = list(itertools.islice(libros, tamaño_pagina))
+        if not pagina:
+            return
+        yield pagina
+
+
+def formatear_libros(libros, compacto=False):
+    """
+    Da formato a una página de libros
+
+    Args:
+        libros (list): Libros a formatear
+        compacto (bool): Una línea por libro, en forma de tabla
+
+    Returns:
+        list: Líneas de texto listas para imprimir
+    """
+    lineas = []
+    if compacto:
+        lineas.append(f"{'ID':>5} | {'Título':<40} | {'Autor':<25} | {'Págs':>5} | Estado")
+        lineas.append("-" * 95)
+        for libro in libros:
+            estado_lectura = "✓ Leído" if libro['leido'] else "⏳ Pendiente"
+            lineas.append(f"{libro['id_libro']:>5} | {libro['titulo']:<40.40} | {libro['autor']:<25.25} | "
+                          f"{libro['paginas']:>5} | {estado_lectura}")
+        return lineas
+
+    for libro in libros:
+        estado_lectura = "✓ Leído" if libro['leido'] else "⏳ Pendiente"
+        lineas.append(f"ID: {libro['id_libro']}")
+        lineas.append(f"Título: {libro['titulo']}")
+        lineas.append(f"Autor: {libro['autor']}")
+        lineas.append(f"Páginas: {libro['paginas']}")
+        lineas.append(f"Estado: {estado_lectura}")
+        lineas.append("-" * 40)
+    return lineas
+
+
+def mostrar_pagina(libros, desplazamiento, total, compacto=False, con_rango=True):
+    """
+    Imprime de una vez una página de libros ya obtenida
+
+    Args:
+        libros (list): Libros de la página
+        desplazamiento (int): Posición (desde 0) del primer libro de la página
+        total (int): Cantidad de libros de la biblioteca
+        compacto (bool): Una línea por libro, en forma de tabla
+        con_rango (bool): Indicar qué libros se muestran del total
+    """
+    lineas = ["\n📚 BIBLIOTECA PERSONAL - TODOS LOS LIBROS", "=" * 60]
+    lineas.extend(formatear_libros(libros, compacto))
+    if con_rango:
+        if libros:
+            lineas.append(f"Mostrando libros {desplazamiento + 1}-{desplazamiento + len(libros)} de {total}")
+        else:
+            lineas.append(f"No hay libros a partir de la posición {desplazamiento + 1} (total: {total})")
+    print("\n".join(lineas))
+
+
+def mostrar_todos_libros(biblioteca, limite=None, desplazamiento=0, compacto=False):
     """
-    Muestra todos los libros en la biblioteca
+    Muestra los libros de la biblioteca (todos, o solo una página).
+    Solo se formatean los libros visibles y la salida se imprime de una vez.
 
     Args:
-        biblioteca (list): Lista de libros
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
+        limite (int): Cantidad máxima de libros a mostrar (None para todos)
+        desplazamiento (int): Libros a saltar desde el principio
+        compacto (bool): Una línea por libro, en forma de tabla
+
+    Raises:
+        ValueError: Si limite es menor que 1
     """
+    if limite is not None and limite < 1:
+        raise ValueError("El límite debe ser al menos 1")
     if not biblioteca:
         print("📚 La biblioteca está vacía.")
         return
 
-    print("\n📚 BIBLIOTECA PERSONAL - TODOS LOS LIBROS")
-    print("=" * 60)
+    total = len(biblioteca)
+    visibles = next(iterar_paginas(biblioteca, total if limite is None else limite, desplazamiento), [])
+    mostrar_pagina(visibles, desplazamiento, total, compacto, con_rango=limite is not None or desplazamiento > 0)
 
-    for libro in biblioteca:
-        estado_lectura = "✓ Leído" if libro['leido'] else "⏳ Pendiente"
-        print(f"ID: {libro['id_libro']}")
-        print(f"Título: {libro['titulo']}")
-        print(f"Autor: {libro['autor']}")
-        print(f"Páginas: {libro['paginas']}")
-        print(f"Estado: {estado_lectura}")
-        print("-" * 40)
+
+def interpretar_opciones_listado(texto):
+    """
+    Interpreta opciones de listado al estilo de la línea de comandos:
+    --limit N, --offset N y --compacto
+
+    Args:
+        texto (str): Opciones escritas por el usuario
+
+    Returns:
+        tuple: (limite o None, desplazamiento, compacto)
+
+    Raises:
+        ValueError: Si una opción es desconocida o su valor no es válido
+    """
+    limite, desplazamiento, compacto = None, 0, False
+    partes = texto.split()
+    i = 0
+    while i < len(partes):
+        opcion = partes[i]
+        if opcion == "--compacto":
+            compacto = True
+            i += 1
+            continue
+        if opcion not in ("--limit", "--offset"):
+            raise ValueError(f"Opción desconocida: {opcion}")
+        if i + 1 >= len(partes) or not partes[i + 1].isdigit():
+            raise ValueError(f"{opcion} necesita un número entero no negativo")
+        if opcion == "--limit":
+            limite = int(partes[i + 1])
+            if limite < 1:
+                raise ValueError("--limit necesita un número entero positivo")
+        else:
+            desplazamiento = int(partes[i + 1])
+        i += 2
+    return limite, desplazamiento, compacto
 
 
 def buscar_libro(biblioteca, termino_busqueda):
@@ -64,12 +729,15 @@ def buscar_libro(biblioteca, termino_busqueda):
     Busca libros por título o autor
 
     Args:
-        biblioteca (list): Lista de libros
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
         termino_busqueda (str): Término a buscar
 
     Returns:
         list: Lista de libros encontrados
     """
+    if isinstance(biblioteca, BibliotecaPersonal):
+        return biblioteca.buscar(termino_busqueda)
+
     libros_encontrados = []
     termino_minuscula = termino_busqueda.lower()
 
@@ -83,16 +751,83 @@ def buscar_libro(biblioteca, termino_busqueda):
     return libros_encontrados
 
 
+def obtener_libro(biblioteca, id_libro):
+    """
+    Busca un libro por id (O(1) en una BibliotecaPersonal)
+
+    Args:
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
+        id_libro (int): Id del libro
+
+    Returns:
+        dict: El libro, o None si no existe
+    """
+    if isinstance(biblioteca, BibliotecaPersonal):
+        return biblioteca.obtener(id_libro)
+    return next((libro for libro in biblioteca if libro['id_libro'] == id_libro), None)
+
+
+def actualizar_libro(biblioteca, id_libro, **cambios):
+    """
+    Modifica campos de un libro (titulo, autor, paginas, leido)
+
+    Args:
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
+        id_libro (int): Id del libro
+        **cambios: Campos a modificar y sus nuevos valores
+
+    Returns:
+        dict: El libro actualizado, o None si no existe
+
+    Raises:
+        ValueError: Si algún cambio no es válido (el libro queda sin modificar)
+    """
+    if isinstance(biblioteca, BibliotecaPersonal):
+        return biblioteca.actualizar(id_libro, **cambios)
+    _validar_cambios(cambios)
+    libro = obtener_libro(biblioteca, id_libro)
+    if libro is not None:
+        libro.update(cambios)
+    return libro
+
+
+def eliminar_libro(biblioteca, id_libro):
+    """
+    Elimina un libro por id
+
+    Args:
+        biblioteca (list | BibliotecaPersonal): Lista de libros o colección indexada
+        id_libro (int): Id del libro
+
+    Returns:
+        dict: El libro eliminado, o None si no existe
+    """
+    if isinstance(biblioteca, BibliotecaPersonal):
+        libro = biblioteca.eliminar(id_libro)
+    else:
+        libro = obtener_libro(biblioteca, id_libro)
+        if libro is not None:
+            biblioteca.remove(libro)
+    if libro is not None:
+        print(f"✓ Libro '{libro['titulo']}' eliminado de la biblioteca.")
+    return libro
+
+
 def calcular_estadisticas(biblioteca):
     """
     Calcula estadísticas de la biblioteca
 
     Args:
-        biblioteca (list): Lista de libros
+        biblioteca (list | BibliotecaPersonal | EstadisticasStreaming): Libros o estadísticas ya acumuladas
 
     Returns:
         dict: Diccionario con estadísticas
     """
+    if isinstance(biblioteca, BibliotecaPersonal):
+        return biblioteca.estadisticas()
+    if isinstance(biblioteca, EstadisticasStreaming):
+        return biblioteca.resultado()
+
     if not biblioteca:
         return None
 
@@ -122,7 +857,7 @@ def mostrar_estadisticas(biblioteca):
     Muestra las estadísticas de la biblioteca
 
     Args:
-        biblioteca (list): Lista de libros
+        biblioteca (list | BibliotecaPersonal | EstadisticasStreaming): Libros o estadísticas ya acumuladas
     """
     stats = calcular_estadisticas(biblioteca)
 
@@ -139,6 +874,82 @@ def mostrar_estadisticas(biblioteca):
     print(f"Promedio de páginas por libro: {stats['promedio_paginas']:.1f}")
     print(f"Porcentaje de libros leídos: {stats['porcentaje_leidos']:.1f}%")
 
+    if isinstance(biblioteca, EstadisticasStreaming):
+        cuantiles = biblioteca.cuantiles_paginas()
+        print("Páginas (aprox.): " + " | ".join(f"p{q * 100:g}: {valor:.0f}" for q, valor in cuantiles.items()))
+        if biblioteca.lineas_invalidas:
+            print(f"⚠️ Líneas ignoradas por formato inválido: {biblioteca.lineas_invalidas}")
+
+
+def procesar_archivo_jsonl(ruta, inicio=0, fin=None):
+    """
+    Acumula estadísticas de un archivo JSON Lines (un libro por línea) sin
+    cargarlo en memoria. Con inicio/fin procesa solo las líneas que empiezan
+    en ese rango de bytes, para repartir un archivo grande entre procesos.
+
+    Args:
+        ruta (str): Archivo JSON Lines
+        inicio (int): Primer byte del rango
+        fin (int): Byte donde termina el rango (None para leer hasta el final)
+
+    Returns:
+        EstadisticasStreaming: Estadísticas del rango procesado
+    """
+    estadisticas = EstadisticasStreaming()
+    with open(ruta, "rb") as archivo:
+        if inicio > 0:
+            # La línea que empezó antes del rango le corresponde al bloque anterior
+            archivo.seek(inicio - 1)
+            archivo.readline()
+        posicion = archivo.tell()
+        while fin is None or posicion < fin:
+            linea = archivo.readline()
+            if not linea:
+                break
+            posicion += len(linea)
+            if not linea.strip():
+                continue
+            try:
+                estadisticas.agregar(json.loads(linea))
+            except (ValueError, KeyError, TypeError):
+                estadisticas.lineas_invalidas += 1
+    return estadisticas
+
+
+def _procesar_bloque(bloque):
+    return procesar_archivo_jsonl(*bloque)
+
+
+def estadisticas_archivos(rutas, procesos=None, tamaño_bloque=64 * 2 ** 20):
+    """
+    Calcula estadísticas de varios archivos JSON Lines en paralelo: cada
+    archivo se divide en bloques de bytes, cada proceso resume sus bloques
+    y los resultados se fusionan.
+
+    Args:
+        rutas (list): Archivos JSON Lines
+        procesos (int): Cantidad de procesos (por defecto, uno por CPU)
+        tamaño_bloque (int): Bytes por bloque de trabajo
+
+    Returns:
+        EstadisticasStreaming: Estadísticas de todos los archivos
+    """
+    bloques = []
+    for ruta in rutas:
+        tamaño = os.path.getsize(ruta)
+        bloques.extend((ruta, inicio, min(inicio + tamaño_bloque, tamaño))
+                       for inicio in range(0, max(tamaño, 1), tamaño_bloque))
+
+    total = EstadisticasStreaming()
+    if len(bloques) <= 1 or procesos == 1:
+        for bloque in bloques:
+            total.fusionar(_procesar_bloque(bloque))
+        return total
+    with multiprocessing.Pool(procesos) as pool:
+        for parcial in pool.imap_unordered(_procesar_bloque, bloques):
+            total.fusionar(parcial)
+    return total
+
 
 def mostrar_menu():
     """
@@ -176,8 +987,8 @@ def main():
     """
     Función principal que ejecuta el sistema de gestión de biblioteca
     """
-    # Lista para almacenar todos los libros (estructura de datos principal)
-    mi_biblioteca = []
+    # Colección indexada de libros (estructura de datos principal)
+    mi_biblioteca = BibliotecaPersonal()
 
     # Variable de control del programa principal
     programa_ejecutandose = True
@@ -234,8 +1045,27 @@ def main():
                 print("❌ Error: Ingresa un número válido para las páginas.")
 
         elif opcion_seleccionada == 2:
-            # Mostrar todos los libros
-            mostrar_todos_libros(mi_biblioteca)
+            # Mostrar libros: una página con --limit/--offset, o de a 20 con paginación
+            opciones = input("Opciones (--limit N --offset N --compacto, Enter para ver de a 20): ")
+            try:
+                limite, desplazamiento, compacto = interpretar_opciones_listado(opciones)
+            except ValueError as error:
+                print(f"❌ {error}")
+                continue
+
+            if limite is not None or not mi_biblioteca:
+                mostrar_todos_libros(mi_biblioteca, limite, desplazamiento, compacto)
+            else:
+                # Un solo recorrido para todas las páginas, sin volver a saltar las ya vistas
+                total = len(mi_biblioteca)
+                inicio = desplazamiento
+                for numero, pagina in enumerate(iterar_paginas(mi_biblioteca, 20, desplazamiento)):
+                    if numero and input("Enter para la siguiente página, 'q' para volver: ").strip().lower() == 'q':
+                        break
+                    mostrar_pagina(pagina, inicio, total, compacto)
+                    inicio += len(pagina)
+                if inicio == desplazamiento:
+                    mostrar_pagina([], desplazamiento, total, compacto)
 
         elif opcion_seleccionada == 3:
             # Buscar libro
@@ -277,4 +1107,8 @@ def main():
 
 # Punto de entrada del programa
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 2 and sys.argv[1] == "--estadisticas":
+        # Estadísticas de registros de lectura exportados en JSON Lines
+        mostrar_estadisticas(estadisticas_archivos(sys.argv[2:]))
+    else:
+        main()
@@ -11,8 +11,33 @@ Autor: Cristian David Chiquimba Mena
 Fecha: 02 de Julio de 2025
 """
 
+import contextlib
+import gc
+import heapq
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from array import array
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# NumPy es opcional: si no está instalado, los cálculos por lotes usan Python puro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _es_arreglo(valores) -> bool:
+    """Indica si los valores vienen en un arreglo de NumPy (y no en una lista)"""
+    return np is not None and isinstance(valores, np.ndarray)
 
 
 class Vehiculo(ABC):
@@ -21,16 +46,28 @@ class Vehiculo(ABC):
     Demuestra ENCAPSULACIÓN con atributos privados y métodos de acceso.
     """
 
+    # Generador de identificadores únicos para todos los vehículos
+    _ids = count(1)
+
     def __init__(self, marca: str, modelo: str, año: int, precio: float):
         # Atributos privados (encapsulación)
+        self.__id = next(Vehiculo._ids)
         self.__marca = marca
         self.__modelo = modelo
         self.__año = año
         self.__precio = precio
         self.__kilometraje = 0.0
         self.__encendido = False
+        # Funciones avisadas cuando cambia el precio o el kilometraje
+        self.__observadores: List[Callable] = []
+        # Mientras está en un concesionario, su kilometraje vive en el almacén de telemetría
+        self.__almacen: Optional["AlmacenKilometraje"] = None
 
     # Métodos getter para acceder a atributos privados (encapsulación)
+    @property
+    def id_vehiculo(self) -> int:
+        return self.__id
+
     @property
     def marca(self) -> str:
         return self.__marca
@@ -49,6 +86,8 @@ class Vehiculo(ABC):
 
     @property
     def kilometraje(self) -> float:
+        if self.__almacen is not None:
+            return self.__almacen.kilometraje(self.__id)
         return self.__kilometraje
 
     @property
@@ -59,25 +98,81 @@ class Vehiculo(ABC):
     @precio.setter
     def precio(self, nuevo_precio: float):
         if nuevo_precio > 0:
+            anterior = self.__precio
             self.__precio = nuevo_precio
+            self._notificar("precio", anterior, nuevo_precio)
         else:
             raise ValueError("El precio debe ser positivo")
 
+    def agregar_observador(self, observador: Callable):
+        """Registra una función observador(vehiculo, campo, anterior, nuevo)"""
+        self.__observadores.append(observador)
+
+    def quitar_observador(self, observador: Callable):
+        """Deja de avisar a un observador registrado"""
+        self.__observadores.remove(observador)
+
+    def _notificar(self, campo: str, anterior, nuevo):
+        for observador in self.__observadores:
+            observador(self, campo, anterior, nuevo)
+
+    def _vinculado(self) -> bool:
+        """True si el vehículo ya está en el almacén de algún concesionario"""
+        return self.__almacen is not None
+
+    def _vincular_almacen(self, almacen: "AlmacenKilometraje") -> bool:
+        """Pasa el kilometraje y el estado del motor al almacén (si no está ya en otro)"""
+        if self.__almacen is not None:
+            return False
+        almacen.agregar(self.__id, self.__kilometraje, self.__encendido)
+        self.__almacen = almacen
+        return True
+
+    @staticmethod
+    def _vincular_muchos(vehiculos: List["Vehiculo"], almacen: "AlmacenKilometraje", observador: Callable):
+        """Versión por lotes de agregar_observador y _vincular_almacen, para altas masivas de vehículos sin almacén"""
+        for vehiculo in vehiculos:
+            vehiculo.__observadores.append(observador)
+        almacen.agregar_muchos([vehiculo.__id for vehiculo in vehiculos],
+                               [vehiculo.__kilometraje for vehiculo in vehiculos],
+                               [vehiculo.__encendido for vehiculo in vehiculos])
+        for vehiculo in vehiculos:
+            vehiculo.__almacen = almacen
+
+    def _desvincular_almacen(self, almacen: "AlmacenKilometraje"):
+        """Recupera el kilometraje guardado en el almacén y deja de usarlo"""
+        if self.__almacen is almacen:
+            self.__kilometraje = almacen.quitar(self.__id)
+            self.__almacen = None
+
+    def _fijar_kilometraje(self, kilometraje: float):
+        anterior = self.kilometraje
+        if self.__almacen is not None:
+            self.__almacen.fijar_kilometraje(self.__id, kilometraje)
+        else:
+            self.__kilometraje = kilometraje
+        self._notificar("kilometraje", anterior, kilometraje)
+
+    def _fijar_encendido(self, encendido: bool):
+        self.__encendido = encendido
+        if self.__almacen is not None:
+            self.__almacen.fijar_encendido(self.__id, encendido)
+
     def encender(self):
         """Enciende el vehículo"""
-        self.__encendido = True
+        self._fijar_encendido(True)
         print(f"{self.__marca} {self.__modelo} ha sido encendido.")
 
     def apagar(self):
         """Apaga el vehículo"""
-        self.__encendido = False
+        self._fijar_encendido(False)
         print(f"{self.__marca} {self.__modelo} ha sido apagado.")
 
     def conducir(self, kilometros: float):
         """Conduce el vehículo una cierta cantidad de kilómetros"""
         if self.__encendido and kilometros > 0:
-            self.__kilometraje += kilometros
-            print(f"Has conducido {kilometros} km. Kilometraje total: {self.__kilometraje} km")
+            self._fijar_kilometraje(self.kilometraje + kilometros)
+            print(f"Has conducido {kilometros} km. Kilometraje total: {self.kilometraje} km")
         elif not self.__encendido:
             print("Debes encender el vehículo primero.")
         else:
@@ -94,6 +189,39 @@ class Vehiculo(ABC):
         """Calcula el impuesto base del vehículo"""
         return self.__precio * 0.05
 
+    # Datos fijos del vehículo (además del precio) que usa calcular_impuestos_lote
+    COLUMNAS_IMPUESTO: Tuple[str, ...] = ()
+
+    def datos_impuesto(self) -> Tuple[float, ...]:
+        """Valores de COLUMNAS_IMPUESTO de este vehículo"""
+        return ()
+
+    @classmethod
+    def calcular_impuestos_lote(cls, precios, datos):
+        """
+        Versión por lotes de calcular_impuesto para vehículos de esta clase:
+        recibe la columna de precios y las columnas de COLUMNAS_IMPUESTO
+        (arreglos de NumPy o listas) y retorna los impuestos en el mismo orden
+        """
+        if _es_arreglo(precios):
+            return precios * 0.05
+        return [precio * 0.05 for precio in precios]
+
+    # Campos que guarda Concesionario.guardar, con el tipo de su columna
+    # ("s" texto, "i" entero, "d" decimal, "b" booleano). CAMPOS_ARCHIVO son
+    # los argumentos del constructor, en orden; ESTADO_ARCHIVO, los de _restaurar_estado
+    CAMPOS_ARCHIVO: Tuple[Tuple[str, str], ...] = (("marca", "s"), ("modelo", "s"), ("año", "i"), ("precio", "d"))
+    ESTADO_ARCHIVO: Tuple[Tuple[str, str], ...] = (("kilometraje", "d"), ("encendido", "b"))
+
+    def _restaurar_estado(self, kilometraje: float, encendido: bool):
+        """Devuelve a un vehículo recién creado su estado guardado (sin mensajes)"""
+        self.__kilometraje = kilometraje
+        self.__encendido = bool(encendido)
+
+    def datos_archivo(self) -> tuple:
+        """Valores de CAMPOS_ARCHIVO y ESTADO_ARCHIVO de este vehículo"""
+        return tuple(getattr(self, campo) for campo, _ in self.CAMPOS_ARCHIVO + self.ESTADO_ARCHIVO)
+
     def __str__(self) -> str:
         return f"{self.__marca} {self.__modelo} ({self.__año})"
 
@@ -136,6 +264,21 @@ class Auto(Vehiculo):
             return impuesto_base * 0.8
         return impuesto_base
 
+    COLUMNAS_IMPUESTO = ("hibrido",)
+
+    def datos_impuesto(self) -> Tuple[float, ...]:
+        return (1.0 if "híbrido" in self.__tipo_combustible.lower() else 0.0,)
+
+    @classmethod
+    def calcular_impuestos_lote(cls, precios, datos):
+        (hibridos,) = datos
+        if _es_arreglo(precios):
+            base = precios * 0.05
+            return np.where(hibridos > 0, base * 0.8, base)
+        return [precio * 0.05 * 0.8 if hibrido else precio * 0.05 for precio, hibrido in zip(precios, hibridos)]
+
+    CAMPOS_ARCHIVO = Vehiculo.CAMPOS_ARCHIVO + (("num_puertas", "i"), ("tipo_combustible", "s"))
+
     def abrir_puertas(self):
         """Método específico de los autos"""
         print(f"Se han abierto las {self.__num_puertas} puertas del {self.marca} {self.modelo}")
@@ -176,6 +319,14 @@ class Motocicleta(Vehiculo):
         # Las motocicletas pagan menos impuesto
         return impuesto_base * 0.6
 
+    @classmethod
+    def calcular_impuestos_lote(cls, precios, datos):
+        if _es_arreglo(precios):
+            return precios * 0.05 * 0.6
+        return [precio * 0.05 * 0.6 for precio in precios]
+
+    CAMPOS_ARCHIVO = Vehiculo.CAMPOS_ARCHIVO + (("cilindrada", "i"), ("tipo", "s"))
+
     def hacer_wheelie(self):
         """Método específico de las motocicletas"""
         if self.encendido:
@@ -226,45 +377,815 @@ class Camion(Vehiculo):
         factor_capacidad = 1 + (self.__capacidad_carga / 50)
         return impuesto_base * factor_capacidad
 
-    def cargar(self, peso: float):
-        """Método específico para cargar el camión"""
+    COLUMNAS_IMPUESTO = ("capacidad_carga",)
+
+    def datos_impuesto(self) -> Tuple[float, ...]:
+        return (float(self.__capacidad_carga),)
+
+    @classmethod
+    def calcular_impuestos_lote(cls, precios, datos):
+        (capacidades,) = datos
+        if _es_arreglo(precios):
+            return precios * 0.05 * (1 + capacidades / 50)
+        return [precio * 0.05 * (1 + capacidad / 50) for precio, capacidad in zip(precios, capacidades)]
+
+    CAMPOS_ARCHIVO = Vehiculo.CAMPOS_ARCHIVO + (("capacidad_carga", "d"), ("num_ejes", "i"))
+    ESTADO_ARCHIVO = Vehiculo.ESTADO_ARCHIVO + (("carga_actual", "d"),)
+
+    def _restaurar_estado(self, kilometraje: float, encendido: bool, carga_actual: float):
+        super()._restaurar_estado(kilometraje, encendido)
+        self.__carga_actual = carga_actual
+
+    def _cargar(self, peso: float) -> bool:
+        """Suma el peso a la carga si cabe, sin mensajes. Retorna True si se cargó"""
         if peso > 0 and (self.__carga_actual + peso) <= self.__capacidad_carga:
             self.__carga_actual += peso
+            return True
+        return False
+
+    def cargar(self, peso: float) -> bool:
+        """Método específico para cargar el camión. Retorna True si se cargó"""
+        if self._cargar(peso):
             print(f"Se han cargado {peso} toneladas. Carga actual: {self.__carga_actual} toneladas")
+            return True
         elif peso <= 0:
             print("El peso debe ser positivo.")
         else:
             print(f"No se puede cargar. Excedería la capacidad máxima de {self.__capacidad_carga} toneladas.")
+        return False
 
-    def descargar(self, peso: float):
-        """Método específico para descargar el camión"""
+    def descargar(self, peso: float) -> bool:
+        """Método específico para descargar el camión. Retorna True si se descargó"""
         if peso > 0 and peso <= self.__carga_actual:
             self.__carga_actual -= peso
             print(f"Se han descargado {peso} toneladas. Carga actual: {self.__carga_actual} toneladas")
+            return True
         elif peso <= 0:
             print("El peso debe ser positivo.")
         else:
             print(f"No se puede descargar {peso} toneladas. Solo hay {self.__carga_actual} toneladas cargadas.")
+        return False
+
+
+class IndiceOrdenado:
+    """
+    Índice secundario ordenado: lista de pares (valor, id) mantenida en orden
+    con bisect. Encuentra los ids de un rango de valores en tiempo
+    logarítmico más el tamaño del resultado.
+    """
+
+    def __init__(self):
+        self.__pares: List[Tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.__pares)
+
+    def agregar(self, valor: float, id_vehiculo: int):
+        insort(self.__pares, (valor, id_vehiculo))
+
+    def agregar_muchos(self, pares: Iterable[Tuple[float, int]]):
+        """Agrega muchos pares de una vez: se ordena una sola vez al final"""
+        self.__pares.extend(pares)
+        self.__pares.sort()
+
+    def quitar(self, valor: float, id_vehiculo: int):
+        posicion = bisect_left(self.__pares, (valor, id_vehiculo))
+        if posicion < len(self.__pares) and self.__pares[posicion] == (valor, id_vehiculo):
+            del self.__pares[posicion]
+
+    def _limites(self, minimo: Optional[float], maximo: Optional[float]) -> Tuple[int, int]:
+        inicio = 0 if minimo is None else bisect_left(self.__pares, (minimo, -1))
+        fin = len(self.__pares) if maximo is None else bisect_right(self.__pares, (maximo, float("inf")))
+        return inicio, fin
+
+    def contar(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> int:
+        """Cantidad de valores en [minimo, maximo] (None = sin límite)"""
+        inicio, fin = self._limites(minimo, maximo)
+        return max(fin - inicio, 0)
+
+    def rango(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> List[int]:
+        """Ids con valor en [minimo, maximo], de menor a mayor valor"""
+        inicio, fin = self._limites(minimo, maximo)
+        return [id_vehiculo for _, id_vehiculo in self.__pares[inicio:fin]]
+
+
+def _definido_en(clase: type, nombre: str) -> type:
+    """Clase de la jerarquía que define el atributo"""
+    return next(base for base in clase.__mro__ if nombre in vars(base))
+
+
+class _ColumnasImpuesto:
+    """Columnas de MotorImpuestos para los vehículos de una clase concreta"""
+
+    def __init__(self, clase: type):
+        self.clase = clase
+        # Si una subclase redefine calcular_impuesto sin su versión por lotes,
+        # sus impuestos se calculan vehículo por vehículo
+        self.por_lotes = _definido_en(clase, "calcular_impuesto") is _definido_en(clase, "calcular_impuestos_lote")
+        self.vehiculos: List[Vehiculo] = []
+        self.precios = array("d")
+        self.datos = [array("d") for _ in clase.COLUMNAS_IMPUESTO]
+        self.impuestos = array("d")
+        # Filas cuyo impuesto guardado ya no vale (vehículo nuevo o precio cambiado)
+        self.pendientes = set()
+
+    def agregar(self, vehiculo: Vehiculo) -> int:
+        fila = len(self.vehiculos)
+        self.vehiculos.append(vehiculo)
+        self.precios.append(vehiculo.precio)
+        for columna, valor in zip(self.datos, vehiculo.datos_impuesto()):
+            columna.append(valor)
+        self.impuestos.append(0.0)
+        self.pendientes.add(fila)
+        return fila
+
+    def agregar_muchos(self, vehiculos: List[Vehiculo]) -> int:
+        """Agrega un grupo de vehículos al final. Retorna la fila del primero"""
+        fila = len(self.vehiculos)
+        self.vehiculos.extend(vehiculos)
+        self.precios.extend(map(attrgetter("precio"), vehiculos))
+        if self.datos:
+            for columna, valores in zip(self.datos, zip(*[vehiculo.datos_impuesto() for vehiculo in vehiculos])):
+                columna.extend(valores)
+        self.impuestos.frombytes(bytes(self.impuestos.itemsize * len(vehiculos)))
+        self.pendientes.update(range(fila, len(self.vehiculos)))
+        return fila
+
+    def quitar(self, fila: int) -> Optional[Vehiculo]:
+        """Quita una fila moviendo la última a su lugar. Retorna el vehículo movido (o None)"""
+        ultima = len(self.vehiculos) - 1
+        movido = None
+        if fila != ultima:
+            movido = self.vehiculos[fila] = self.vehiculos[ultima]
+            for columna in (self.precios, self.impuestos, *self.datos):
+                columna[fila] = columna[ultima]
+            if ultima in self.pendientes:
+                self.pendientes.add(fila)
+            else:
+                self.pendientes.discard(fila)
+        self.pendientes.discard(ultima)
+        self.vehiculos.pop()
+        for columna in (self.precios, self.impuestos, *self.datos):
+            columna.pop()
+        return movido
+
+    def calcular_pendientes(self):
+        """Calcula en una sola pasada los impuestos de las filas pendientes"""
+        if not self.pendientes:
+            return
+        filas = sorted(self.pendientes)
+        self.pendientes.clear()
+        if not self.por_lotes:
+            for fila in filas:
+                self.impuestos[fila] = self.vehiculos[fila].calcular_impuesto()
+        elif np is not None:
+            precios = np.frombuffer(self.precios)
+            datos = [np.frombuffer(columna) for columna in self.datos]
+            impuestos = np.frombuffer(self.impuestos)
+            if len(filas) == len(self.vehiculos):
+                impuestos[:] = self.clase.calcular_impuestos_lote(precios, datos)
+            else:
+                indices = np.array(filas)
+                impuestos[indices] = self.clase.calcular_impuestos_lote(precios[indices],
+                                                                        [columna[indices] for columna in datos])
+            # Las vistas de NumPy se liberan aquí, antes de que las columnas vuelvan a crecer
+            del precios, datos, impuestos
+        else:
+            precios = [self.precios[fila] for fila in filas]
+            datos = [[columna[fila] for fila in filas] for columna in self.datos]
+            for fila, impuesto in zip(filas, self.clase.calcular_impuestos_lote(precios, datos)):
+                self.impuestos[fila] = impuesto
+
+    def total(self) -> float:
+        self.calcular_pendientes()
+        if np is not None and self.impuestos:
+            return float(np.frombuffer(self.impuestos).sum())
+        return math.fsum(self.impuestos)
+
+
+class MotorImpuestos:
+    """
+    Calcula impuestos por lotes. Guarda, por cada clase concreta de
+    vehículo, columnas con el precio, los datos fijos de su fórmula y el
+    impuesto ya calculado. Los impuestos de una clase se calculan juntos,
+    en una sola pasada (vectorizada con NumPy si está instalado), y quedan
+    guardados hasta que cambia el precio; entonces solo se recalculan esas
+    filas. Quien registra un vehículo debe avisar sus cambios de precio
+    con precio_modificado (el Concesionario lo hace con su observador).
+    """
+
+    def __init__(self):
+        self.__columnas: Dict[type, _ColumnasImpuesto] = {}
+        # id del vehículo -> fila en las columnas de su clase
+        self.__filas: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.__filas)
+
+    def _columnas(self, vehiculo: Vehiculo) -> _ColumnasImpuesto:
+        clase = type(vehiculo)
+        columnas = self.__columnas.get(clase)
+        if columnas is None:
+            columnas = self.__columnas[clase] = _ColumnasImpuesto(clase)
+        return columnas
+
+    def agregar(self, vehiculo: Vehiculo):
+        """Registra un vehículo (su impuesto se calcula en el próximo lote)"""
+        if vehiculo.id_vehiculo not in self.__filas:
+            self.__filas[vehiculo.id_vehiculo] = self._columnas(vehiculo).agregar(vehiculo)
+
+    def agregar_muchos(self, vehiculos: Iterable[Vehiculo]):
+        """Registra muchos vehículos, agrupados por clase"""
+        por_clase: Dict[type, List[Vehiculo]] = {}
+        for vehiculo in vehiculos:
+            if vehiculo.id_vehiculo not in self.__filas:
+                por_clase.setdefault(type(vehiculo), []).append(vehiculo)
+        for grupo in por_clase.values():
+            inicio = self._columnas(grupo[0]).agregar_muchos(grupo)
+            self.__filas.update(zip(map(attrgetter("id_vehiculo"), grupo), range(inicio, inicio + len(grupo))))
+
+    def quitar(self, vehiculo: Vehiculo):
+        """Deja de llevar el impuesto de un vehículo"""
+        fila = self.__filas.pop(vehiculo.id_vehiculo, None)
+        if fila is not None:
+            movido = self._columnas(vehiculo).quitar(fila)
+            if movido is not None:
+                self.__filas[movido.id_vehiculo] = fila
+
+    def precio_modificado(self, vehiculo: Vehiculo):
+        """Actualiza el precio guardado y marca el impuesto para recalcularlo"""
+        fila = self.__filas.get(vehiculo.id_vehiculo)
+        if fila is not None:
+            columnas = self._columnas(vehiculo)
+            columnas.precios[fila] = vehiculo.precio
+            columnas.pendientes.add(fila)
+
+    def impuesto(self, vehiculo: Vehiculo) -> float:
+        """Impuesto de un vehículo registrado"""
+        columnas = self._columnas(vehiculo)
+        columnas.calcular_pendientes()
+        return columnas.impuestos[self.__filas[vehiculo.id_vehiculo]]
+
+    def totales_por_tipo(self) -> Dict[str, float]:
+        """Suma de impuestos por tipo de vehículo"""
+        return {clase.__name__: columnas.total() for clase, columnas in self.__columnas.items() if columnas.vehiculos}
+
+
+class AlmacenKilometraje:
+    """
+    Telemetría de la flota en columnas: kilometraje (array('d')) y estado del
+    motor (bytearray), una fila por vehículo y un diccionario id -> fila.
+    Los vehículos vinculados leen y escriben aquí su kilometraje, así que las
+    lecturas de odómetro de muchos vehículos se aplican por lotes sin pasar
+    por los objetos uno por uno.
+    """
+
+    # Motivos de rechazo de una lectura
+    DESCONOCIDO = "vehículo desconocido"
+    APAGADO = "motor apagado"
+    NEGATIVO = "kilometraje negativo o inválido"
+
+    def __init__(self):
+        self.__filas: Dict[int, int] = {}
+        self.__ids = array("q")
+        self.__kilometrajes = array("d")
+        self.__encendidos = bytearray()
+        # Tabla densa id -> fila para los lotes con NumPy; se rehace tras altas y bajas
+        self.__tabla_filas = None
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __contains__(self, id_vehiculo: int) -> bool:
+        return id_vehiculo in self.__filas
+
+    def agregar(self, id_vehiculo: int, kilometraje: float, encendido: bool):
+        self.__filas[id_vehiculo] = len(self.__ids)
+        self.__ids.append(id_vehiculo)
+        self.__kilometrajes.append(kilometraje)
+        self.__encendidos.append(encendido)
+        self.__tabla_filas = None
+
+    def agregar_muchos(self, ids: List[int], kilometrajes: List[float], encendidos: List[bool]):
+        inicio = len(self.__ids)
+        self.__ids.extend(ids)
+        self.__kilometrajes.extend(kilometrajes)
+        self.__encendidos.extend(encendidos)
+        self.__filas.update(zip(ids, range(inicio, len(self.__ids))))
+        self.__tabla_filas = None
+
+    def quitar(self, id_vehiculo: int) -> float:
+        """Quita la fila de un vehículo moviendo la última a su lugar. Retorna su kilometraje"""
+        fila = self.__filas.pop(id_vehiculo)
+        kilometraje = self.__kilometrajes[fila]
+        ultima = len(self.__ids) - 1
+        if fila != ultima:
+            movido = self.__ids[fila] = self.__ids[ultima]
+            self.__kilometrajes[fila] = self.__kilometrajes[ultima]
+            self.__encendidos[fila] = self.__encendidos[ultima]
+            self.__filas[movido] = fila
+        self.__ids.pop()
+        self.__kilometrajes.pop()
+        self.__encendidos.pop()
+        self.__tabla_filas = None
+        return kilometraje
+
+    def kilometraje(self, id_vehiculo: int) -> float:
+        return self.__kilometrajes[self.__filas[id_vehiculo]]
+
+    def fijar_kilometraje(self, id_vehiculo: int, kilometraje: float):
+        self.__kilometrajes[self.__filas[id_vehiculo]] = kilometraje
+
+    def fijar_encendido(self, id_vehiculo: int, encendido: bool):
+        self.__encendidos[self.__filas[id_vehiculo]] = encendido
+
+    def validar(self, id_vehiculo: int, kilometraje: float) -> Optional[str]:
+        """Motivo por el que se rechazaría una lectura, o None si es válida"""
+        fila = self.__filas.get(id_vehiculo)
+        if fila is None:
+            return self.DESCONOCIDO
+        if not self.__encendidos[fila]:
+            return self.APAGADO
+        if not self._kilometraje_valido(kilometraje):
+            return self.NEGATIVO
+        return None
+
+    @staticmethod
+    def _kilometraje_valido(kilometraje) -> bool:
+        """Número no negativo (NaN y los valores no numéricos no lo son)"""
+        try:
+            return kilometraje >= 0
+        except TypeError:
+            return False
+
+    def registrar_lecturas(self, ids, kilometrajes) -> Tuple[int, List[Tuple[int, float, str]]]:
+        """
+        Aplica un lote de lecturas de odómetro, dadas como dos columnas
+        paralelas (ids y kilometrajes). Si un id se repite, gana su última
+        lectura válida. Con arreglos de NumPy la validación y la escritura
+        se hacen vectorizadas. Retorna (lecturas aplicadas, rechazadas como
+        (id, km, motivo)).
+        """
+        if _es_arreglo(ids) or _es_arreglo(kilometrajes):
+            return self._registrar_lecturas_arreglos(np.asarray(ids, dtype=np.int64),
+                                                     np.asarray(kilometrajes, dtype=np.float64))
+        filas, columna, encendidos = self.__filas, self.__kilometrajes, self.__encendidos
+        valido = self._kilometraje_valido
+        aplicadas = 0
+        rechazadas = []
+        for id_vehiculo, kilometraje in zip(ids, kilometrajes):
+            fila = filas.get(id_vehiculo)
+            if fila is not None and encendidos[fila] and valido(kilometraje):
+                columna[fila] = kilometraje
+                aplicadas += 1
+            else:
+                rechazadas.append((id_vehiculo, kilometraje, self.validar(id_vehiculo, kilometraje)))
+        return aplicadas, rechazadas
+
+    def _registrar_lecturas_arreglos(self, ids, kilometrajes) -> Tuple[int, List[Tuple[int, float, str]]]:
+        if not len(ids) or not self.__ids:
+            return 0, [(id_vehiculo, kilometraje, self.DESCONOCIDO)
+                       for id_vehiculo, kilometraje in zip(ids.tolist(), kilometrajes.tolist())]
+        filas = self._filas_de(ids)
+        conocidas = filas >= 0
+        validas = np.zeros(len(filas), dtype=bool)
+        validas[conocidas] = np.frombuffer(self.__encendidos, dtype=np.uint8)[filas[conocidas]] != 0
+        validas &= kilometrajes >= 0
+        columna = np.frombuffer(self.__kilometrajes)
+        columna[filas[validas]] = kilometrajes[validas]
+        # Las vistas se liberan antes de que las columnas vuelvan a crecer
+        del columna
+        rechazadas = [(id_vehiculo, kilometraje, self.validar(id_vehiculo, kilometraje))
+                      for id_vehiculo, kilometraje in zip(ids[~validas].tolist(), kilometrajes[~validas].tolist())]
+        return int(validas.sum()), rechazadas
+
+    def _filas_de(self, ids):
+        """Filas de un arreglo de ids (-1 si no están) con NumPy"""
+        if self.__tabla_filas is None:
+            ids_almacen = np.frombuffer(self.__ids, dtype=np.int64)
+            mayor = int(ids_almacen.max())
+            # Los ids son consecutivos, así que la tabla suele ser pequeña; si no, se usa el diccionario
+            if mayor > 4 * len(ids_almacen) + 1024:
+                obtener = self.__filas.get
+                return np.fromiter((obtener(id_vehiculo, -1) for id_vehiculo in ids.tolist()),
+                                   dtype=np.intp, count=len(ids))
+            self.__tabla_filas = np.full(mayor + 1, -1, dtype=np.intp)
+            self.__tabla_filas[ids_almacen] = np.arange(len(ids_almacen))
+            del ids_almacen
+        tabla = self.__tabla_filas
+        filas = np.full(len(ids), -1, dtype=np.intp)
+        dentro = (ids >= 0) & (ids < len(tabla))
+        filas[dentro] = tabla[ids[dentro]]
+        return filas
+
+
+# Archivo de inventario: firma, versión y, por cada clase de vehículo, sus
+# columnas una detrás de otra (enteros y decimales en binario little-endian,
+# textos como vocabulario + códigos)
+_FIRMA_ARCHIVO = b"CONC"
+_VERSION_ARCHIVO = 1
+_TIPOS_ARREGLO = {"i": "i", "d": "d", "b": "b"}
+
+
+@contextlib.contextmanager
+def _recolector_en_pausa():
+    """
+    Pausa el recolector de ciclos durante una carga masiva: crear millones de
+    objetos dispara recorridos completos del heap que no liberan nada
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def _clases_vehiculo() -> Dict[str, type]:
+    """Clases concretas de vehículo por nombre (incluye las subclases de subclases)"""
+    clases: Dict[str, type] = {}
+    pendientes = [Vehiculo]
+    while pendientes:
+        clase = pendientes.pop()
+        pendientes.extend(clase.__subclasses__())
+        if not getattr(clase, "__abstractmethods__", None):
+            clases[clase.__name__] = clase
+    return clases
+
+
+def _escribir_entero(archivo, valor: int):
+    archivo.write(struct.pack("<Q", valor))
+
+
+def _leer_entero(archivo) -> int:
+    datos = archivo.read(8)
+    if len(datos) != 8:
+        raise ValueError("Archivo de inventario incompleto")
+    return struct.unpack("<Q", datos)[0]
+
+
+def _escribir_texto(archivo, texto: str):
+    datos = texto.encode("utf-8")
+    _escribir_entero(archivo, len(datos))
+    archivo.write(datos)
+
+
+def _leer_texto(archivo) -> str:
+    largo = _leer_entero(archivo)
+    datos = archivo.read(largo)
+    if len(datos) != largo:
+        raise ValueError("Archivo de inventario incompleto")
+    return datos.decode("utf-8")
+
+
+def _escribir_arreglo(archivo, arreglo: array):
+    if sys.byteorder == "big":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    arreglo.tofile(archivo)
+
+
+def _leer_arreglo(archivo, tipo: str, cantidad: int) -> array:
+    arreglo = array(tipo)
+    datos = archivo.read(cantidad * arreglo.itemsize)
+    if len(datos) != cantidad * arreglo.itemsize:
+        raise ValueError("Archivo de inventario incompleto")
+    arreglo.frombytes(datos)
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo
+
+
+def _escribir_columna(archivo, tipo: str, valores: list):
+    if tipo == "s":
+        # Pocas marcas, modelos y combustibles distintos: cada texto se guarda una vez
+        vocabulario: Dict[str, int] = {}
+        codigos = array("I", [vocabulario.setdefault(valor, len(vocabulario)) for valor in valores])
+        textos = [texto.encode("utf-8") for texto in vocabulario]
+        _escribir_entero(archivo, len(textos))
+        _escribir_arreglo(archivo, array("I", map(len, textos)))
+        archivo.write(b"".join(textos))
+        _escribir_arreglo(archivo, codigos)
+    else:
+        _escribir_arreglo(archivo, array(_TIPOS_ARREGLO[tipo], valores))
+
+
+def _leer_columna(archivo, tipo: str, cantidad: int) -> list:
+    if tipo == "s":
+        largos = _leer_arreglo(archivo, "I", _leer_entero(archivo))
+        bloque = archivo.read(sum(largos))
+        textos, inicio = [], 0
+        for largo in largos:
+            textos.append(bloque[inicio:inicio + largo].decode("utf-8"))
+            inicio += largo
+        codigos = _leer_arreglo(archivo, "I", cantidad)
+        if codigos and max(codigos) >= len(textos):
+            raise ValueError("Código de texto fuera del vocabulario en el archivo de inventario")
+        return [textos[codigo] for codigo in codigos]
+    valores = _leer_arreglo(archivo, _TIPOS_ARREGLO[tipo], cantidad).tolist()
+    return list(map(bool, valores)) if tipo == "b" else valores
 
 
 class Concesionario:
     """
     Clase que gestiona una colección de vehículos.
     Demuestra POLIMORFISMO al trabajar con diferentes tipos de vehículos de manera uniforme.
+
+    Los vehículos se guardan por id y se indexan por marca (normalizada),
+    tipo y año, para que las búsquedas no recorran todo el inventario.
+    Los conteos por tipo se actualizan al agregar o retirar vehículos.
+    Precio, año y kilometraje tienen además índices ordenados por tipo para
+    consultas por rango; el concesionario observa cada vehículo para
+    actualizarlos cuando cambia su precio o su kilometraje. Con el mismo
+    observador mantiene el valor total del inventario y sus subtotales por
+    marca y por tipo.
+
+    El kilometraje de los vehículos del inventario se guarda en un almacén
+    de telemetría en columnas, que recibe lecturas de odómetro por lotes.
     """
 
-    def __init__(self, nombre: str):
+    # Campos con índice ordenado (consultas por rango)
+    CAMPOS_RANGO = ("precio", "año", "kilometraje")
+
+    def __init__(self, nombre: str, depurar: bool = False):
+        """
+        Args:
+            nombre: Nombre del concesionario
+            depurar: Si es True, cada consulta de valores se compara con un recálculo completo
+        """
         self.__nombre = nombre
-        self.__vehiculos: List[Vehiculo] = []
+        self.depurar = depurar
+        # id -> vehículo, en orden de llegada
+        self.__vehiculos: Dict[int, Vehiculo] = {}
+        # Índices: clave -> {id: vehículo} (conservan el orden de llegada)
+        self.__por_marca: Dict[str, Dict[int, Vehiculo]] = {}
+        self.__por_tipo: Dict[str, Dict[int, Vehiculo]] = {}
+        self.__por_año: Dict[int, Dict[int, Vehiculo]] = {}
+        # tipo -> campo -> índice ordenado de ese campo para los vehículos del tipo
+        self.__por_rango: Dict[str, Dict[str, IndiceOrdenado]] = {}
+        # Impuestos calculados por lotes y guardados hasta que cambie el precio
+        self.__impuestos = MotorImpuestos()
+        # Valor del inventario, actualizado en cada alta, baja y cambio de precio
+        self.__valor_total = 0.0
+        self.__valor_por_marca: Dict[str, float] = {}
+        self.__valor_por_tipo: Dict[str, float] = {}
+        # Kilometraje y encendido de los vehículos, en columnas
+        self.__telemetria = AlmacenKilometraje()
+        # Tras un lote de lecturas los índices de kilometraje se reconstruyen en la próxima consulta
+        self.__kilometraje_pendiente = False
 
     @property
     def nombre(self) -> str:
         return self.__nombre
 
+    def __len__(self) -> int:
+        return len(self.__vehiculos)
+
+    def __iter__(self):
+        """Recorre los vehículos en orden de llegada"""
+        return iter(self.__vehiculos.values())
+
+    @staticmethod
+    def _normalizar_marca(marca: str) -> str:
+        return marca.strip().lower()
+
+    def _claves_indices(self, vehiculo: Vehiculo):
+        """Pares (índice, clave) en los que se registra el vehículo"""
+        return ((self.__por_marca, self._normalizar_marca(vehiculo.marca)),
+                (self.__por_tipo, type(vehiculo).__name__),
+                (self.__por_año, vehiculo.año))
+
+    def _claves_valor(self, vehiculo: Vehiculo):
+        """Pares (subtotales, clave) a los que suma el precio del vehículo"""
+        return ((self.__valor_por_marca, self._normalizar_marca(vehiculo.marca)),
+                (self.__valor_por_tipo, type(vehiculo).__name__))
+
+    def _indices_rango(self, vehiculo: Vehiculo) -> Dict[str, IndiceOrdenado]:
+        tipo = type(vehiculo).__name__
+        indices = self.__por_rango.get(tipo)
+        if indices is None:
+            indices = self.__por_rango[tipo] = {campo: IndiceOrdenado() for campo in self.CAMPOS_RANGO}
+        return indices
+
+    def _indexar(self, vehiculo: Vehiculo) -> bool:
+        # Un vehículo que ya está en otro concesionario no se agrega: su telemetría vive allá
+        if vehiculo.id_vehiculo in self.__vehiculos or vehiculo._vinculado():
+            return False
+        self.__vehiculos[vehiculo.id_vehiculo] = vehiculo
+        for indice, clave in self._claves_indices(vehiculo):
+            indice.setdefault(clave, {})[vehiculo.id_vehiculo] = vehiculo
+        for campo, indice in self._indices_rango(vehiculo).items():
+            indice.agregar(getattr(vehiculo, campo), vehiculo.id_vehiculo)
+        vehiculo.agregar_observador(self._vehiculo_modificado)
+        vehiculo._vincular_almacen(self.__telemetria)
+        self.__impuestos.agregar(vehiculo)
+        self._sumar_valor(vehiculo, vehiculo.precio)
+        return True
+
+    def _sumar_valor(self, vehiculo: Vehiculo, diferencia: float):
+        """Suma (o resta) una diferencia de precio al total y a los subtotales del vehículo"""
+        self.__valor_total += diferencia
+        for subtotales, clave in self._claves_valor(vehiculo):
+            subtotales[clave] = subtotales.get(clave, 0.0) + diferencia
+
+    def _vehiculo_modificado(self, vehiculo: Vehiculo, campo: str, anterior, nuevo):
+        """Observador: mueve el vehículo dentro del índice ordenado del campo"""
+        if campo == "precio":
+            self.__impuestos.precio_modificado(vehiculo)
+            self._sumar_valor(vehiculo, nuevo - anterior)
+        if campo == "kilometraje" and self.__kilometraje_pendiente:
+            return
+        indice = self._indices_rango(vehiculo).get(campo)
+        if indice is not None:
+            indice.quitar(anterior, vehiculo.id_vehiculo)
+            indice.agregar(nuevo, vehiculo.id_vehiculo)
+
     def agregar_vehiculo(self, vehiculo: Vehiculo):
         """Agrega un vehículo al concesionario"""
-        self.__vehiculos.append(vehiculo)
-        print(f"✅ {vehiculo} agregado al concesionario {self.__nombre}")
+        if self._indexar(vehiculo):
+            print(f"✅ {vehiculo} agregado al concesionario {self.__nombre}")
+        elif vehiculo.id_vehiculo in self.__vehiculos:
+            print(f"⚠️ {vehiculo} ya está en el inventario de {self.__nombre}")
+        else:
+            print(f"⚠️ {vehiculo} pertenece a otro concesionario; retírelo de allá primero")
+
+    def agregar_vehiculos(self, vehiculos: Iterable[Vehiculo], mostrar: bool = True) -> int:
+        """
+        Agrega muchos vehículos a la vez, sin un mensaje por vehículo (ni
+        ninguno si mostrar es False). Retorna cuántos se agregaron
+        """
+        with _recolector_en_pausa():
+            agregados = self._indexar_muchos(vehiculos)
+        if mostrar:
+            print(f"✅ {agregados} vehículos agregados al concesionario {self.__nombre}")
+        return agregados
+
+    def _indexar_muchos(self, vehiculos: Iterable[Vehiculo]) -> int:
+        registrados = self.__vehiculos
+        nuevos: Dict[int, Vehiculo] = {}
+        for vehiculo in vehiculos:
+            id_vehiculo = vehiculo.id_vehiculo
+            if id_vehiculo not in registrados and id_vehiculo not in nuevos and not vehiculo._vinculado():
+                nuevos[id_vehiculo] = vehiculo
+        registrados.update(nuevos)
+        # Una pasada para los índices por clave (las mismas claves que _indexar);
+        # los subtotales y los índices ordenados se completan en bloque
+        por_grupo: Dict[Tuple[type, str], List[Vehiculo]] = {}
+        por_tipo: Dict[type, List[Vehiculo]] = {}
+        for id_vehiculo, vehiculo in nuevos.items():
+            for indice, clave in self._claves_indices(vehiculo):
+                indice.setdefault(clave, {})[id_vehiculo] = vehiculo
+            por_grupo.setdefault((type(vehiculo), vehiculo.marca), []).append(vehiculo)
+            por_tipo.setdefault(type(vehiculo), []).append(vehiculo)
+        # Los vehículos de una misma clase y marca suman a los mismos subtotales
+        for grupo in por_grupo.values():
+            self._sumar_valor(grupo[0], math.fsum(map(attrgetter("precio"), grupo)))
+        # Los índices ordenados se completan y ordenan una sola vez por tipo
+        for grupo in por_tipo.values():
+            ids = list(map(attrgetter("id_vehiculo"), grupo))
+            for campo, indice in self._indices_rango(grupo[0]).items():
+                indice.agregar_muchos(zip(map(attrgetter(campo), grupo), ids))
+        lista = list(nuevos.values())
+        Vehiculo._vincular_muchos(lista, self.__telemetria, self._vehiculo_modificado)
+        self.__impuestos.agregar_muchos(lista)
+        return len(nuevos)
+
+    def retirar_vehiculo(self, id_vehiculo: int) -> Optional[Vehiculo]:
+        """Retira un vehículo del inventario. Retorna el vehículo, o None si no estaba"""
+        vehiculo = self.__vehiculos.pop(id_vehiculo, None)
+        if vehiculo is None:
+            print(f"❌ No hay ningún vehículo con id {id_vehiculo} en {self.__nombre}")
+            return None
+        self._sumar_valor(vehiculo, -vehiculo.precio)
+        for indice, clave in self._claves_indices(vehiculo):
+            grupo = indice[clave]
+            del grupo[id_vehiculo]
+            if not grupo:
+                del indice[clave]
+        # Los subtotales de grupos vacíos se descartan (y no quedan restos de redondeo)
+        for subtotales, indice, clave in ((self.__valor_por_marca, self.__por_marca, self._normalizar_marca(vehiculo.marca)),
+                                          (self.__valor_por_tipo, self.__por_tipo, type(vehiculo).__name__)):
+            if clave not in indice:
+                del subtotales[clave]
+        if not self.__vehiculos:
+            self.__valor_total = 0.0
+        for campo, indice in self._indices_rango(vehiculo).items():
+            if not (campo == "kilometraje" and self.__kilometraje_pendiente):
+                indice.quitar(getattr(vehiculo, campo), id_vehiculo)
+        # Sin vehículos del tipo, sus índices ordenados también se descartan
+        if type(vehiculo).__name__ not in self.__por_tipo:
+            del self.__por_rango[type(vehiculo).__name__]
+        vehiculo.quitar_observador(self._vehiculo_modificado)
+        vehiculo._desvincular_almacen(self.__telemetria)
+        self.__impuestos.quitar(vehiculo)
+        print(f"🚪 {vehiculo} retirado del concesionario {self.__nombre}")
+        return vehiculo
+
+    def obtener_vehiculo(self, id_vehiculo: int) -> Optional[Vehiculo]:
+        """Busca un vehículo por id"""
+        return self.__vehiculos.get(id_vehiculo)
+
+    def guardar(self, ruta: str):
+        """
+        Guarda el inventario en un archivo binario con una sección por clase
+        de vehículo y una columna por campo (CAMPOS_ARCHIVO y ESTADO_ARCHIVO
+        de la clase), más la posición de llegada de cada vehículo
+        """
+        grupos: Dict[type, List[Vehiculo]] = {}
+        posiciones: Dict[type, array] = {}
+        for posicion, vehiculo in enumerate(self.__vehiculos.values()):
+            clase = type(vehiculo)
+            if clase not in grupos:
+                grupos[clase], posiciones[clase] = [], array("Q")
+            grupos[clase].append(vehiculo)
+            posiciones[clase].append(posicion)
+        with open(ruta, "wb") as archivo:
+            archivo.write(_FIRMA_ARCHIVO)
+            _escribir_entero(archivo, _VERSION_ARCHIVO)
+            _escribir_texto(archivo, self.__nombre)
+            _escribir_entero(archivo, len(self.__vehiculos))
+            _escribir_entero(archivo, len(grupos))
+            for clase, grupo in grupos.items():
+                campos = clase.CAMPOS_ARCHIVO + clase.ESTADO_ARCHIVO
+                _escribir_texto(archivo, clase.__name__)
+                _escribir_entero(archivo, len(grupo))
+                _escribir_texto(archivo, ",".join(f"{campo}:{tipo}" for campo, tipo in campos))
+                _escribir_arreglo(archivo, posiciones[clase])
+                for campo, tipo in campos:
+                    _escribir_columna(archivo, tipo, list(map(attrgetter(campo), grupo)))
+
+    @classmethod
+    def cargar(cls, ruta: str, depurar: bool = False) -> "Concesionario":
+        """
+        Crea un concesionario a partir de un archivo generado por guardar.
+        Los vehículos reciben ids nuevos y conservan su orden de llegada.
+        Lanza ValueError si el archivo no es válido.
+        """
+        clases = _clases_vehiculo()
+        with open(ruta, "rb") as archivo, _recolector_en_pausa():
+            if archivo.read(len(_FIRMA_ARCHIVO)) != _FIRMA_ARCHIVO:
+                raise ValueError(f"{ruta} no es un archivo de inventario")
+            version = _leer_entero(archivo)
+            if version != _VERSION_ARCHIVO:
+                raise ValueError(f"Versión de archivo no soportada: {version}")
+            nombre = _leer_texto(archivo)
+            vehiculos: List[Optional[Vehiculo]] = [None] * _leer_entero(archivo)
+            for _ in range(_leer_entero(archivo)):
+                nombre_clase = _leer_texto(archivo)
+                clase = clases.get(nombre_clase)
+                if clase is None:
+                    raise ValueError(f"Tipo de vehículo desconocido: {nombre_clase}")
+                cantidad = _leer_entero(archivo)
+                campos = clase.CAMPOS_ARCHIVO + clase.ESTADO_ARCHIVO
+                esperados = ",".join(f"{campo}:{tipo}" for campo, tipo in campos)
+                guardados = _leer_texto(archivo)
+                if guardados != esperados:
+                    raise ValueError(f"Los campos guardados de {nombre_clase} ({guardados}) no coinciden con {esperados}")
+                posiciones = _leer_arreglo(archivo, "Q", cantidad)
+                if posiciones and max(posiciones) >= len(vehiculos):
+                    raise ValueError(f"Posición de {nombre_clase} fuera del inventario: {max(posiciones)}")
+                columnas = [_leer_columna(archivo, tipo, cantidad) for _, tipo in campos]
+                argumentos = len(clase.CAMPOS_ARCHIVO)
+                nuevos = list(map(clase, *columnas[:argumentos]))
+                for vehiculo, estado in zip(nuevos, zip(*columnas[argumentos:])):
+                    vehiculo._restaurar_estado(*estado)
+                for posicion, vehiculo in zip(posiciones, nuevos):
+                    vehiculos[posicion] = vehiculo
+        if any(vehiculo is None for vehiculo in vehiculos):
+            raise ValueError("Archivo de inventario incompleto")
+        concesionario = cls(nombre, depurar)
+        concesionario.agregar_vehiculos(vehiculos, mostrar=False)
+        return concesionario
+
+    def registrar_lectura(self, id_vehiculo: int, kilometraje: float) -> Optional[str]:
+        """Aplica una lectura de odómetro. Retorna None si se aplicó, o el motivo del rechazo"""
+        motivo = self.__telemetria.validar(id_vehiculo, kilometraje)
+        if motivo is None:
+            self.__vehiculos[id_vehiculo]._fijar_kilometraje(kilometraje)
+        return motivo
+
+    def registrar_lecturas(self, ids, kilometrajes) -> Tuple[int, List[Tuple[int, float, str]]]:
+        """
+        Aplica un lote de lecturas de odómetro (ids y kilometrajes en dos
+        columnas paralelas, listas o arreglos de NumPy) directamente en el
+        almacén de telemetría: sin avisar a los observadores vehículo por
+        vehículo. Retorna (aplicadas, rechazadas como (id, km, motivo)).
+        """
+        aplicadas, rechazadas = self.__telemetria.registrar_lecturas(ids, kilometrajes)
+        if aplicadas:
+            self.__kilometraje_pendiente = True
+        return aplicadas, rechazadas
+
+    def _actualizar_indices_kilometraje(self):
+        """Reconstruye los índices de kilometraje si un lote de lecturas los dejó atrasados"""
+        if not self.__kilometraje_pendiente:
+            return
+        for tipo, indices in self.__por_rango.items():
+            indice = indices["kilometraje"] = IndiceOrdenado()
+            indice.agregar_muchos((vehiculo.kilometraje, id_vehiculo)
+                                  for id_vehiculo, vehiculo in self.__por_tipo.get(tipo, {}).items())
+        self.__kilometraje_pendiente = False
 
     def mostrar_inventario(self):
         """Muestra todos los vehículos del concesionario (POLIMORFISMO)"""
@@ -276,25 +1197,298 @@ class Concesionario:
         print(f"📋 INVENTARIO - {self.__nombre}")
         print(f"{'=' * 50}")
 
-        for i, vehiculo in enumerate(self.__vehiculos, 1):
+        for i, vehiculo in enumerate(self.__vehiculos.values(), 1):
             print(f"\n{i}. {vehiculo.mostrar_info()}")
-            print(f"   Impuesto anual: ${vehiculo.calcular_impuesto():,.2f}")
+            print(f"   Impuesto anual: ${self.__impuestos.impuesto(vehiculo):,.2f}")
+
+    def reporte_impuestos(self) -> Dict[str, float]:
+        """Impuesto anual total del inventario y por tipo de vehículo"""
+        reporte = self.__impuestos.totales_por_tipo()
+        reporte["total"] = sum(reporte.values())
+        return reporte
 
     def calcular_valor_total(self) -> float:
-        """Calcula el valor total del inventario"""
-        return sum(vehiculo.precio for vehiculo in self.__vehiculos)
+        """Valor total del inventario (se mantiene al día, no recorre los vehículos)"""
+        if self.depurar:
+            self.verificar_valores()
+        return self.__valor_total
+
+    def valor_por_marca(self) -> Dict[str, float]:
+        """Valor del inventario por marca (normalizada)"""
+        if self.depurar:
+            self.verificar_valores()
+        return dict(self.__valor_por_marca)
+
+    def valor_por_tipo(self) -> Dict[str, float]:
+        """Valor del inventario por tipo de vehículo"""
+        if self.depurar:
+            self.verificar_valores()
+        return dict(self.__valor_por_tipo)
+
+    def verificar_valores(self):
+        """Compara el total y los subtotales mantenidos con un recálculo completo"""
+        por_marca: Dict[str, float] = {}
+        por_tipo: Dict[str, float] = {}
+        for vehiculo in self.__vehiculos.values():
+            clave_marca, tipo = self._normalizar_marca(vehiculo.marca), type(vehiculo).__name__
+            por_marca[clave_marca] = por_marca.get(clave_marca, 0.0) + vehiculo.precio
+            por_tipo[tipo] = por_tipo.get(tipo, 0.0) + vehiculo.precio
+        total = math.fsum(por_tipo.values())
+        errores = []
+        if not math.isclose(self.__valor_total, total, rel_tol=1e-9, abs_tol=1e-6):
+            errores.append(f"total {self.__valor_total} != {total}")
+        for nombre, mantenidos, recalculados in (("marca", self.__valor_por_marca, por_marca),
+                                                 ("tipo", self.__valor_por_tipo, por_tipo)):
+            if mantenidos.keys() != recalculados.keys():
+                errores.append(f"grupos por {nombre} distintos: {sorted(mantenidos)} != {sorted(recalculados)}")
+                continue
+            for clave, valor in recalculados.items():
+                if not math.isclose(mantenidos[clave], valor, rel_tol=1e-9, abs_tol=1e-6):
+                    errores.append(f"{nombre} '{clave}': {mantenidos[clave]} != {valor}")
+        if errores:
+            raise RuntimeError(f"Valores del inventario inconsistentes: {'; '.join(errores[:5])}")
 
     def buscar_por_marca(self, marca: str) -> List[Vehiculo]:
-        """Busca vehículos por marca"""
-        return [v for v in self.__vehiculos if v.marca.lower() == marca.lower()]
+        """Busca vehículos por marca (sin distinguir mayúsculas)"""
+        return list(self.__por_marca.get(self._normalizar_marca(marca), {}).values())
+
+    def buscar_por_tipo(self, tipo: str) -> List[Vehiculo]:
+        """Busca vehículos por tipo ('Auto', 'Motocicleta', 'Camion')"""
+        return list(self.__por_tipo.get(tipo, {}).values())
+
+    def buscar_por_año(self, año: int) -> List[Vehiculo]:
+        """Busca vehículos de un año de fabricación"""
+        return list(self.__por_año.get(año, {}).values())
+
+    def buscar_por_rango(self, tipo: Optional[str] = None,
+                         precio: Tuple[Optional[float], Optional[float]] = (None, None),
+                         año: Tuple[Optional[int], Optional[int]] = (None, None),
+                         kilometraje: Tuple[Optional[float], Optional[float]] = (None, None)) -> List[Vehiculo]:
+        """
+        Busca vehículos por rangos (mínimo, máximo) inclusivos; None deja el
+        extremo abierto. Ejemplo: autos 2018-2022 de hasta $15,000:
+        buscar_por_rango("Auto", precio=(None, 15000), año=(2018, 2022))
+
+        Para cada tipo se cuenta con bisect cuántos vehículos caen en cada
+        rango, se recorre solo el rango más pequeño y se filtra por los demás.
+        """
+        rangos = {"precio": precio, "año": año, "kilometraje": kilometraje}
+        if kilometraje != (None, None):
+            self._actualizar_indices_kilometraje()
+        activos = {campo: limites for campo, limites in rangos.items() if limites != (None, None)}
+        tipos = [tipo] if tipo is not None else list(self.__por_rango)
+
+        resultado = []
+        for nombre_tipo in tipos:
+            indices = self.__por_rango.get(nombre_tipo)
+            if indices is None:
+                continue
+            if not activos:
+                resultado.extend(self.__por_tipo.get(nombre_tipo, {}).values())
+                continue
+            campo_base = min(activos, key=lambda campo: indices[campo].contar(*activos[campo]))
+            otros = [(campo, limites) for campo, limites in activos.items() if campo != campo_base]
+            for id_vehiculo in indices[campo_base].rango(*activos[campo_base]):
+                vehiculo = self.__vehiculos[id_vehiculo]
+                if all((minimo is None or getattr(vehiculo, campo) >= minimo) and
+                       (maximo is None or getattr(vehiculo, campo) <= maximo)
+                       for campo, (minimo, maximo) in otros):
+                    resultado.append(vehiculo)
+        return resultado
 
     def vehiculos_por_tipo(self):
         """Cuenta vehículos por tipo (POLIMORFISMO)"""
-        tipos = {}
-        for vehiculo in self.__vehiculos:
-            tipo = type(vehiculo).__name__
-            tipos[tipo] = tipos.get(tipo, 0) + 1
-        return tipos
+        return {tipo: len(grupo) for tipo, grupo in self.__por_tipo.items()}
+
+
+class PlanCarga:
+    """Resultado de PlanificadorCarga.planificar: qué camión lleva cada envío"""
+
+    def __init__(self, camiones: List[Camion], pesos: List[float], asignaciones: List[int], cargas: List[float]):
+        self.camiones = camiones
+        self.pesos = pesos
+        # Índice del camión de cada envío (-1 si no cupo en ninguno)
+        self.asignaciones = asignaciones
+        # Peso total asignado a cada camión
+        self.cargas = cargas
+        # Carga que ya llevaba la flota al planificar (aplicar el plan la cambia)
+        self.carga_previa = math.fsum(camion.carga_actual for camion in camiones)
+        # Un plan se aplica una sola vez: volver a aplicarlo cargaría los envíos de nuevo
+        self.aplicado = False
+
+    @property
+    def pendientes(self) -> List[int]:
+        """Envíos que no cupieron en ningún camión"""
+        return [envio for envio, camion in enumerate(self.asignaciones) if camion < 0]
+
+    def envios_de(self, indice_camion: int) -> List[int]:
+        """Envíos asignados a un camión"""
+        return [envio for envio, camion in enumerate(self.asignaciones) if camion == indice_camion]
+
+    def utilizacion(self) -> Dict[str, float]:
+        """Ocupación de la flota antes y después del plan"""
+        capacidad = math.fsum(camion.capacidad_carga for camion in self.camiones)
+        previa = self.carga_previa
+        asignada = math.fsum(self.cargas)
+        pendiente = math.fsum(self.pesos[envio] for envio in self.pendientes)
+        return {
+            "camiones": len(self.camiones),
+            "camiones_usados": sum(1 for carga in self.cargas if carga > 0),
+            "envios": len(self.pesos),
+            "envios_pendientes": len(self.pendientes),
+            "capacidad": capacidad,
+            "carga_previa": previa,
+            "carga_asignada": asignada,
+            "peso_pendiente": pendiente,
+            "utilizacion_previa": previa / capacidad if capacidad else 0.0,
+            "utilizacion": (previa + asignada) / capacidad if capacidad else 0.0,
+        }
+
+    def aplicar(self) -> int:
+        """
+        Carga cada camión (una sola vez, con el total de sus envíos) y muestra
+        un resumen en lugar de un mensaje por camión. Retorna cuántos camiones
+        se cargaron; si el plan ya se había aplicado no vuelve a cargar nada.
+        """
+        if self.aplicado:
+            print("⚠️ El plan de carga ya se aplicó")
+            return 0
+        self.aplicado = True
+        cargados, rechazados = 0, []
+        for camion, carga in zip(self.camiones, self.cargas):
+            if carga > 0:
+                if camion._cargar(carga):
+                    cargados += 1
+                else:
+                    rechazados.append(camion)
+        print(f"🚚 {cargados} camiones cargados con {math.fsum(self.cargas):,.2f} toneladas")
+        if rechazados:
+            print(f"⚠️ No se pudo cargar: {', '.join(str(camion) for camion in rechazados)}")
+        return cargados
+
+
+class PlanificadorCarga:
+    """
+    Reparte envíos (pesos en toneladas) entre los camiones de una flota según
+    su capacidad libre (capacidad_carga - carga_actual), con heurísticas de
+    empaquetado que ordenan los envíos de mayor a menor:
+
+    - "primer_ajuste": cada envío va al primer camión (en el orden de la
+      flota) donde cabe. Un árbol de torneo con la mayor capacidad libre de
+      cada subárbol encuentra ese camión en O(log camiones).
+    - "peor_ajuste": cada envío va al camión con más capacidad libre, tomado
+      de un heap; reparte la carga de forma más pareja.
+    """
+
+    ESTRATEGIAS = ("primer_ajuste", "peor_ajuste")
+
+    def __init__(self, camiones: Iterable[Camion]):
+        self.camiones = list(camiones)
+
+    def planificar(self, pesos: Iterable[float], estrategia: str = "primer_ajuste") -> PlanCarga:
+        """Asigna los envíos a los camiones (sin cargarlos todavía). Lanza ValueError con pesos no positivos"""
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estrategia desconocida: {estrategia}. Disponibles: {', '.join(self.ESTRATEGIAS)}")
+        pesos = list(pesos)
+        if not all(peso > 0 for peso in pesos):
+            raise ValueError("Los pesos de los envíos deben ser positivos")
+        orden = sorted(range(len(pesos)), key=pesos.__getitem__, reverse=True)
+        asignaciones = [-1] * len(pesos)
+        cargas = [0.0] * len(self.camiones)
+        if self.camiones:
+            if estrategia == "primer_ajuste":
+                self._primer_ajuste(pesos, orden, asignaciones, cargas)
+            else:
+                self._peor_ajuste(pesos, orden, asignaciones, cargas)
+        return PlanCarga(self.camiones, pesos, asignaciones, cargas)
+
+    def _libre(self, indice: int, cargas: List[float]) -> float:
+        """
+        Capacidad libre del camión redondeada hacia arriba: sirve para
+        descartar camiones, pero quien decide si un envío cabe es la misma
+        suma que hará Camion.cargar (carga_actual + total <= capacidad_carga),
+        que puede redondear distinto que esta resta
+        """
+        camion = self.camiones[indice]
+        return camion.capacidad_carga - (camion.carga_actual + cargas[indice]) + 4 * math.ulp(camion.capacidad_carga)
+
+    def _primer_ajuste(self, pesos, orden, asignaciones, cargas):
+        cantidad = len(self.camiones)
+        hojas = 1
+        while hojas < cantidad:
+            hojas *= 2
+        # arbol[1] es la raíz; las hojas hojas..hojas+cantidad-1 guardan la capacidad libre de cada camión
+        arbol = [-math.inf] * (2 * hojas)
+        for indice in range(cantidad):
+            arbol[hojas + indice] = self._libre(indice, cargas)
+        for nodo in range(hojas - 1, 0, -1):
+            arbol[nodo] = max(arbol[2 * nodo], arbol[2 * nodo + 1])
+        # Copias locales: el ciclo se repite por cada envío
+        capacidades = [camion.capacidad_carga for camion in self.camiones]
+        previas = [camion.carga_actual for camion in self.camiones]
+        margenes = [4 * math.ulp(capacidad) for capacidad in capacidades]
+        for envio in orden:
+            peso = pesos[envio]
+            while arbol[1] >= peso:
+                # Baja por la izquierda siempre que ese subárbol tenga un camión donde quepa
+                nodo = 1
+                while nodo < hojas:
+                    nodo *= 2
+                    if arbol[nodo] < peso:
+                        nodo += 1
+                indice = nodo - hojas
+                carga = cargas[indice] + peso
+                if previas[indice] + carga <= capacidades[indice]:
+                    cargas[indice] = carga
+                    asignaciones[envio] = indice
+                    arbol[nodo] = capacidades[indice] - (previas[indice] + carga) + margenes[indice]
+                else:
+                    # No cabe por poco: ni este peso ni uno mayor caben en ese camión
+                    arbol[nodo] = math.nextafter(peso, -math.inf)
+                # Sube actualizando máximos hasta que un nodo no cambie
+                while nodo > 1:
+                    hermano = arbol[nodo ^ 1]
+                    valor = arbol[nodo] if arbol[nodo] >= hermano else hermano
+                    nodo //= 2
+                    if arbol[nodo] == valor:
+                        break
+                    arbol[nodo] = valor
+                if asignaciones[envio] >= 0:
+                    break
+
+    def _peor_ajuste(self, pesos, orden, asignaciones, cargas):
+        # heapq es un heap de mínimos: se guarda la capacidad libre con signo negativo
+        heap = [(-self._libre(indice, cargas), indice) for indice in range(len(self.camiones))]
+        heapq.heapify(heap)
+        capacidades = [camion.capacidad_carga for camion in self.camiones]
+        previas = [camion.carga_actual for camion in self.camiones]
+        margenes = [4 * math.ulp(capacidad) for capacidad in capacidades]
+        reemplazar = heapq.heapreplace
+        for envio in orden:
+            peso = pesos[envio]
+            while -heap[0][0] >= peso:
+                indice = heap[0][1]
+                carga = cargas[indice] + peso
+                if previas[indice] + carga <= capacidades[indice]:
+                    cargas[indice] = carga
+                    asignaciones[envio] = indice
+                    reemplazar(heap, (previas[indice] + carga - capacidades[indice] - margenes[indice], indice))
+                    break
+                # No cabe por poco: ni este peso ni uno mayor caben en ese camión
+                reemplazar(heap, (-math.nextafter(peso, -math.inf), indice))
+
+
+def mismos_vehiculos(original: Concesionario, copia: Concesionario) -> bool:
+    """Indica si dos concesionarios tienen los mismos vehículos (clase y datos guardados) en el mismo orden"""
+    return (original.nombre == copia.nombre and len(original) == len(copia) and
+            all(type(a) is type(b) and a.datos_archivo() == b.datos_archivo() for a, b in zip(original, copia)))
+
+
+def verificar_ida_y_vuelta(concesionario: Concesionario, ruta: str) -> bool:
+    """Guarda el concesionario, lo vuelve a cargar y comprueba que no se perdió nada"""
+    concesionario.guardar(ruta)
+    copia = Concesionario.cargar(ruta)
+    return mismos_vehiculos(concesionario, copia)
 
 
 def demostrar_polimorfismo(vehiculos: List[Vehiculo]):
@@ -315,6 +1509,207 @@ def demostrar_polimorfismo(vehiculos: List[Vehiculo]):
         print(f"💰 Impuesto: ${vehiculo.calcular_impuesto():,.2f}")
 
 
+def generar_flota(cantidad: int, semilla: int = 0) -> List[Vehiculo]:
+    """Genera vehículos al azar (autos, motocicletas y camiones) para pruebas de rendimiento"""
+    azar = random.Random(semilla)
+    marcas = ["Chevrolet", "Honda", "Toyota", "Suzuki", "Yamaha", "Volvo", "Mercedes-Benz", "Kia", "Hyundai", "Ford"]
+    flota: List[Vehiculo] = []
+    for _ in range(cantidad):
+        marca, año, precio = azar.choice(marcas), azar.randint(2005, 2024), round(azar.uniform(1500, 150000), 2)
+        tipo = azar.random()
+        if tipo < 0.6:
+            flota.append(Auto(marca, "Modelo", año, precio, azar.choice((2, 4, 5)),
+                              azar.choice(("Gasolina", "Diésel", "Híbrido", "Eléctrico"))))
+        elif tipo < 0.85:
+            flota.append(Motocicleta(marca, "Modelo", año, precio, azar.choice((125, 250, 600, 1200)), "Urbana"))
+        else:
+            flota.append(Camion(marca, "Modelo", año, precio, azar.choice((10, 20, 35, 40)), azar.randint(2, 6)))
+    return flota
+
+
+def benchmark_impuestos(cantidad: int = 1_000_000):
+    """Reporte de impuestos de toda la flota: ciclo polimórfico vs. motor por lotes (en frío, guardado y tras cambios)"""
+    flota = generar_flota(cantidad)
+    print(f"\n⏱️ BENCHMARK IMPUESTOS ({cantidad:,} vehículos, NumPy: {'sí' if np is not None else 'no'})")
+
+    inicio = time.perf_counter()
+    total_ciclo = sum(vehiculo.calcular_impuesto() for vehiculo in flota)
+    ciclo = time.perf_counter() - inicio
+
+    motor = MotorImpuestos()
+    inicio = time.perf_counter()
+    for vehiculo in flota:
+        motor.agregar(vehiculo)
+    registro = time.perf_counter() - inicio
+
+    def reporte() -> Tuple[float, float]:
+        inicio = time.perf_counter()
+        total = sum(motor.totales_por_tipo().values())
+        return total, time.perf_counter() - inicio
+
+    total_lotes, frio = reporte()
+    assert math.isclose(total_lotes, total_ciclo, rel_tol=1e-9)
+    _, guardado = reporte()
+    # Cambia el precio del 1% de la flota: solo esas filas se recalculan
+    for vehiculo in flota[::100]:
+        vehiculo.precio = vehiculo.precio * 1.1
+        motor.precio_modificado(vehiculo)
+    _, cambios = reporte()
+
+    for etiqueta, segundos in (("Ciclo calcular_impuesto()", ciclo), ("Registro en el motor (una vez)", registro),
+                               ("Motor por lotes, en frío", frio), ("Motor con impuestos guardados", guardado),
+                               ("Tras cambiar el 1% de los precios", cambios)):
+        print(f"   {etiqueta + ':':<36}{segundos:8.4f}s")
+
+
+def benchmark_telemetria(cantidad: int = 100_000, lecturas: int = 1_000_000, tamaño_lote: int = 10_000):
+    """Lecturas de odómetro por segundo: una por una vs. por lotes (listas y, si está, NumPy)"""
+    flota = generar_flota(cantidad)
+    concesionario = Concesionario("Flota de alquiler")
+    azar = random.Random(1)
+    concesionario.agregar_vehiculos(flota, mostrar=False)
+    # Uno de cada diez vehículos queda apagado: sus lecturas se rechazan
+    for vehiculo in flota:
+        if azar.random() >= 0.1:
+            vehiculo._fijar_encendido(True)
+    ids = [azar.choice(flota).id_vehiculo for _ in range(lecturas)]
+    kilometrajes = [azar.uniform(-10, 250_000) for _ in range(lecturas)]
+    print(f"\n⏱️ BENCHMARK TELEMETRÍA ({cantidad:,} vehículos, {lecturas:,} lecturas, "
+          f"lotes de {tamaño_lote:,}, NumPy: {'sí' if np is not None else 'no'})")
+
+    def medir(aplicar) -> Tuple[float, List[float]]:
+        inicio = time.perf_counter()
+        aplicar()
+        # La consulta por kilometraje incluye la reconstrucción de índices que dejan los lotes
+        concesionario.buscar_por_rango("Camion", kilometraje=(100_000, 100_100))
+        segundos = time.perf_counter() - inicio
+        return segundos, [vehiculo.kilometraje for vehiculo in flota]
+
+    def una_por_una():
+        for id_vehiculo, kilometraje in zip(ids, kilometrajes):
+            concesionario.registrar_lectura(id_vehiculo, kilometraje)
+
+    def por_lotes(convertir):
+        def aplicar():
+            for inicio in range(0, lecturas, tamaño_lote):
+                concesionario.registrar_lecturas(convertir(ids[inicio:inicio + tamaño_lote]),
+                                                 convertir(kilometrajes[inicio:inicio + tamaño_lote]))
+        return aplicar
+
+    pruebas = [("Una lectura a la vez", una_por_una), ("Por lotes (listas)", por_lotes(list))]
+    if np is not None:
+        pruebas.append(("Por lotes (NumPy)", por_lotes(np.array)))
+    esperado = None
+    for etiqueta, aplicar in pruebas:
+        # Se parte siempre del mismo kilometraje para que los resultados sean comparables
+        concesionario.registrar_lecturas([vehiculo.id_vehiculo for vehiculo in flota], [0.0] * cantidad)
+        segundos, resultado = medir(aplicar)
+        assert esperado is None or resultado == esperado
+        esperado = resultado
+        print(f"   {etiqueta + ':':<24}{segundos:8.3f}s  {lecturas / segundos:>12,.0f} lecturas/s")
+
+
+def benchmark_archivo(cantidad: int = 1_000_000):
+    """Guardar y cargar un concesionario en el archivo por columnas, con verificación de ida y vuelta"""
+    flota = generar_flota(cantidad)
+    concesionario = Concesionario("Inventario grande")
+    azar = random.Random(2)
+    concesionario.agregar_vehiculos(flota, mostrar=False)
+    # Estado variado para que también se guarde: motores, kilometraje y carga
+    # (con los métodos internos, que no imprimen un mensaje por vehículo)
+    for vehiculo in flota[::3]:
+        vehiculo._fijar_encendido(True)
+        vehiculo._fijar_kilometraje(round(azar.uniform(1, 90_000), 1))
+        if isinstance(vehiculo, Camion):
+            vehiculo._cargar(round(azar.uniform(0.5, vehiculo.capacidad_carga), 1))
+    print(f"\n⏱️ BENCHMARK ARCHIVO ({cantidad:,} vehículos)")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "inventario.conc")
+        inicio = time.perf_counter()
+        concesionario.guardar(ruta)
+        guardado = time.perf_counter() - inicio
+        tamaño = os.path.getsize(ruta)
+
+        inicio = time.perf_counter()
+        copia = Concesionario.cargar(ruta)
+        carga = time.perf_counter() - inicio
+
+    iguales = mismos_vehiculos(concesionario, copia)
+    print(f"   Guardar:  {guardado:8.3f}s  ({tamaño / 1e6:,.1f} MB, {tamaño / cantidad:.1f} bytes por vehículo)")
+    print(f"   Cargar:   {carga:8.3f}s  (incluye crear los objetos e indexarlos)")
+    print(f"   Ida y vuelta: {'✅ sin diferencias' if iguales else '❌ hay diferencias'}")
+
+
+def generar_envios(cantidad: int, semilla: int = 0) -> List[float]:
+    """Pesos de envíos al azar (en toneladas) para pruebas de rendimiento"""
+    azar = random.Random(semilla)
+    return [round(azar.uniform(0.1, 8), 2) for _ in range(cantidad)]
+
+
+def _primer_ajuste_lineal(camiones: List[Camion], pesos: List[float]) -> int:
+    """Primer ajuste decreciente recorriendo la flota para cada envío (referencia). Retorna cuántos envíos se asignaron"""
+    cargas = [0.0] * len(camiones)
+    asignados = 0
+    for peso in sorted(pesos, reverse=True):
+        for indice, camion in enumerate(camiones):
+            if camion.carga_actual + (cargas[indice] + peso) <= camion.capacidad_carga:
+                cargas[indice] += peso
+                asignados += 1
+                break
+    return asignados
+
+
+def benchmark_carga(tamaños: Tuple[int, ...] = (10_000, 100_000, 1_000_000), envios_por_camion: int = 6):
+    """Planificación de carga: escalamiento de primer ajuste (árbol de torneo) y peor ajuste (heap)"""
+    print(f"\n⏱️ BENCHMARK PLANIFICACIÓN DE CARGA ({envios_por_camion} envíos por camión)")
+    for cantidad in tamaños:
+        azar = random.Random(cantidad)
+        camiones = [Camion("Volvo", "FH", 2020, 90000, azar.choice((10, 20, 35, 40)), 4)
+                    for _ in range(max(cantidad // envios_por_camion, 1))]
+        for camion in camiones[::4]:
+            camion._cargar(round(azar.uniform(1, camion.capacidad_carga / 2), 1))
+        pesos = generar_envios(cantidad, semilla=cantidad)
+        planificador = PlanificadorCarga(camiones)
+        print(f"   {cantidad:,} envíos, {len(camiones):,} camiones:")
+        for estrategia in PlanificadorCarga.ESTRATEGIAS:
+            inicio = time.perf_counter()
+            plan = planificador.planificar(pesos, estrategia)
+            segundos = time.perf_counter() - inicio
+            datos = plan.utilizacion()
+            print(f"      {estrategia + ':':<16}{segundos:8.3f}s  utilización {datos['utilizacion']:.1%}, "
+                  f"{datos['envios_pendientes']:,} envíos pendientes")
+        # La versión lineal solo se mide en tamaños pequeños: crece con envíos × camiones
+        if cantidad <= 10_000:
+            inicio = time.perf_counter()
+            asignados = _primer_ajuste_lineal(camiones, pesos)
+            segundos = time.perf_counter() - inicio
+            pendientes = PlanificadorCarga(camiones).planificar(pesos).pendientes
+            assert asignados == cantidad - len(pendientes)
+            print(f"      {'lineal:':<16}{segundos:8.3f}s  (primer ajuste sin árbol, mismo resultado)")
+    inicio = time.perf_counter()
+    cargados = plan.aplicar()
+    print(f"   Aplicar el último plan: {time.perf_counter() - inicio:.3f}s ({cargados:,} camiones)")
+
+
+# Benchmarks disponibles desde la línea de comandos: --benchmark <nombre>
+BENCHMARKS = {
+    "impuestos": benchmark_impuestos,
+    "telemetria": benchmark_telemetria,
+    "archivo": benchmark_archivo,
+    "carga": benchmark_carga,
+}
+
+
+def ejecutar_benchmarks(nombres: List[str]):
+    """Ejecuta los benchmarks indicados (todos si no se indica ninguno)"""
+    for nombre in nombres or BENCHMARKS:
+        if nombre not in BENCHMARKS:
+            print(f"❌ Benchmark desconocido: {nombre}. Disponibles: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[nombre]()
+
+
 def main():
     """
     Función principal que demuestra todos los conceptos de POO.
@@ -374,12 +1769,48 @@ def main():
     # Demostrar polimorfismo explícitamente
     demostrar_polimorfismo([auto1, moto1, camion1])
 
+    # Telemetría: lecturas de odómetro aplicadas por lote
+    print("\n--- Telemetría de la flota ---")
+    camion2.encender()
+    aplicadas, rechazadas = concesionario.registrar_lecturas(
+        [camion2.id_vehiculo, auto2.id_vehiculo, camion2.id_vehiculo], [1200.0, 300.0, 1250.0])
+    detalle = ", ".join(f"{concesionario.obtener_vehiculo(id_vehiculo)} ({motivo})"
+                        for id_vehiculo, _, motivo in rechazadas)
+    print(f"📡 Lecturas aplicadas: {aplicadas}, rechazadas: {detalle}")
+    print(f"Kilometraje del {camion2}: {camion2.kilometraje} km")
+    camion2.apagar()
+
     # Estadísticas del concesionario
     print(f"\n{'*' * 60}")
     print("📊 ESTADÍSTICAS DEL CONCESIONARIO")
     print(f"{'*' * 60}")
     print(f"Valor total del inventario: ${concesionario.calcular_valor_total():,.2f}")
     print(f"Vehículos por tipo: {concesionario.vehiculos_por_tipo()}")
+    print(f"Valor por tipo: { {tipo: f'${valor:,.2f}' for tipo, valor in concesionario.valor_por_tipo().items()} }")
+    print(f"Vehículos de la marca 'honda': {', '.join(str(v) for v in concesionario.buscar_por_marca('honda'))}")
+    baratos = concesionario.buscar_por_rango("Auto", precio=(None, 20000), año=(2018, 2023))
+    print(f"Autos 2018-2023 de hasta $20,000: {', '.join(str(v) for v in baratos)}")
+
+    # Guardar el inventario en un archivo y volver a cargarlo
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "patio_tuerca.conc")
+        correcto = verificar_ida_y_vuelta(concesionario, ruta)
+        print(f"💾 Inventario guardado ({os.path.getsize(ruta)} bytes) y recuperado "
+              f"{'sin diferencias' if correcto else 'con diferencias'}")
+
+    # Planificación de carga: repartir envíos entre los camiones del inventario
+    camiones = concesionario.buscar_por_tipo("Camion")
+    plan = PlanificadorCarga(camiones).planificar([12, 8, 20, 5, 7, 3, 30, 9])
+    for indice, camion in enumerate(camiones):
+        print(f"📦 {camion}: envíos de {[plan.pesos[envio] for envio in plan.envios_de(indice)]} toneladas")
+    plan.aplicar()
+    datos = plan.utilizacion()
+    print(f"Utilización de la flota: {datos['utilizacion_previa']:.0%} → {datos['utilizacion']:.0%}, "
+          f"envíos pendientes: {[plan.pesos[envio] for envio in plan.pendientes]}")
+
+    # Retirar un vehículo actualiza los índices y los conteos
+    concesionario.retirar_vehiculo(moto1.id_vehiculo)
+    print(f"Vehículos por tipo tras la venta: {concesionario.vehiculos_por_tipo()}")
 
     # Demostrar encapsulación intentando acceder a atributos privados
     print(f"\n{'*' * 60}")
@@ -405,4 +1836,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        ejecutar_benchmarks(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
@@ -27,14 +27,44 @@ Funcionalidades principales:
 # Importar módulos necesarios
 import sys
 import os
+import time
+import contextlib
+import queue
+import threading
+import sqlite3
+import tempfile
+import random
+import heapq
+import re
+import unicodedata
+import json
+import mmap
+import struct
+import array
+import itertools
+import bisect
+import tracemalloc
+import gc
+import asyncio
+import concurrent.futures
+import multiprocessing
+import stat
+from collections import deque
+from collections.abc import Mapping, MutableMapping
 
 
 class Libro:
     """
     Clase que representa un libro en la biblioteca digital.
-    Utiliza una tupla para almacenar autor y título (datos inmutables).
+    Autor y título son de solo lectura (datos inmutables).
+
+    Usa __slots__ en lugar de un __dict__ por instancia, y comparte las
+    cadenas de autor y categoría con sys.intern, ya que se repiten en muchos
+    libros. Las cadenas internadas se liberan cuando ningún libro las usa.
     """
 
+    __slots__ = ('_autor', '_titulo', 'categoria', 'isbn', 'prestado', 'usuario_prestado')
+
     def __init__(self, titulo, autor, categoria, isbn):
         """
         Inicializa un libro con sus atributos.
@@ -45,9 +75,10 @@ class Libro:
             categoria (str): Categoría/género del libro
             isbn (str): ISBN único del libro
         """
-        # Usamos tupla para autor y título ya que no cambiarán
-        self._autor_titulo = (autor, titulo)
-        self.categoria = categoria
+        # Autor y título solo se exponen como propiedades ya que no cambiarán
+        self._autor = sys.intern(autor)
+        self._titulo = titulo
+        self.categoria = sys.intern(categoria)
         self.isbn = isbn
         self.prestado = False  # Estado del libro
         self.usuario_prestado = None  # Usuario que tiene el libro prestado
@@ -55,12 +86,12 @@ class Libro:
     @property
     def titulo(self):
         """Retorna el título del libro."""
-        return self._autor_titulo[1]
+        return self._titulo
 
     @property
     def autor(self):
         """Retorna el autor del libro."""
-        return self._autor_titulo[0]
+        return self._autor
 
     def __str__(self):
         """Representación en cadena del libro."""
@@ -78,301 +109,2449 @@ class Usuario:
     Mantiene una lista de libros actualmente prestados.
     """
 
+    __slots__ = ('nombre', 'id_usuario', 'libros_prestados')
+
     def __init__(self, nombre, id_usuario):
         """
         Inicializa un usuario.
 
-        Args:
-            nombre (str): Nombre del usuario
-            id_usuario (str): ID único del usuario
-        """
-        self.nombre = nombre
-        self.id_usuario = id_usuario
-        # Lista para gestionar libros prestados al usuario
-        self.libros_prestados = []
+        Args:
+            nombre (str): Nombre del usuario
+            id_usuario (str): ID único del usuario
+        """
+        self.nombre = nombre
+        self.id_usuario = id_usuario
+        # Lista para gestionar libros prestados al usuario
+        self.libros_prestados = []
+
+    def tomar_prestado(self, libro):
+        """
+        Añade un libro a la lista de libros prestados del usuario.
+
+        Args:
+            libro (Libro): El libro a prestar
+        """
+        self.libros_prestados.append(libro)
+
+    def devolver_libro(self, libro):
+        """
+        Remueve un libro de la lista de libros prestados del usuario.
+
+        Args:
+            libro (Libro): El libro a devolver
+        """
+        if libro in self.libros_prestados:
+            self.libros_prestados.remove(libro)
+
+    def __str__(self):
+        """Representación en cadena del usuario."""
+        return f"Usuario: {self.nombre} (ID: {self.id_usuario}) - Libros prestados: {len(self.libros_prestados)}"
+
+    def __repr__(self):
+        """Representación técnica del usuario."""
+        return f"Usuario('{self.nombre}', '{self.id_usuario}')"
+
+
+# Formato de las instantáneas de la biblioteca
+FIRMA_SNAPSHOT = b"BIBSNAP2"
+# Claves que toda cabecera de instantánea debe tener ('vencimientos' es opcional)
+CAMPOS_CABECERA_SNAPSHOT = frozenset({'nombre', 'num_libros', 'bytes_isbns', 'usuarios', 'reservas',
+                                      'apartados', 'historial'})
+
+
+def codificar_campos(campos):
+    """
+    Codifica cadenas como un registro en bytes: la longitud en UTF-8 de cada
+    campo salvo el último (4 bytes cada una) seguida de los campos. Al no usar
+    separadores, los campos pueden contener cualquier carácter.
+
+    Args:
+        campos (tuple): Cadenas a codificar
+
+    Returns:
+        bytes: Registro codificado
+    """
+    datos = [campo.encode("utf-8") for campo in campos]
+    return struct.pack(f"<{len(datos) - 1}I", *[len(dato) for dato in datos[:-1]]) + b"".join(datos)
+
+
+def decodificar_campos(crudo, num_campos=3):
+    """
+    Decodifica un registro generado por codificar_campos.
+
+    Args:
+        crudo (bytes | memoryview): Registro codificado
+        num_campos (int): Cantidad de campos del registro
+
+    Returns:
+        list: Cadenas del registro
+    """
+    longitudes = struct.unpack_from(f"<{num_campos - 1}I", crudo)
+    posicion = 4 * (num_campos - 1)
+    campos = []
+    for longitud in longitudes:
+        campos.append(bytes(crudo[posicion:posicion + longitud]).decode("utf-8"))
+        posicion += longitud
+    campos.append(bytes(crudo[posicion:]).decode("utf-8"))
+    return campos
+
+# Palabras muy frecuentes que no aportan a la búsqueda difusa
+PALABRAS_VACIAS = frozenset({"de", "del", "la", "las", "el", "los", "y", "e", "a", "en", "por", "con",
+                             "un", "una", "the", "of", "and"})
+
+
+def normalizar_texto(texto):
+    """
+    Normaliza un texto para búsquedas: minúsculas, sin acentos ni signos.
+    "Gabriel García Márquez" -> "gabriel garcia marquez"
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto normalizado con palabras separadas por un espacio
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[a-z0-9]+", sin_acentos))
+
+
+def distancia_edicion(a, b):
+    """Distancia de Levenshtein entre dos palabras."""
+    if len(a) < len(b):
+        a, b = b, a
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = actual
+    return anterior[-1]
+
+
+class IndiceDifuso:
+    """
+    Índice de búsqueda tolerante a errores de escritura sobre títulos y autores.
+
+    Usa borrado simétrico: cada palabra del vocabulario se indexa junto con
+    todas sus variantes obtenidas al borrar hasta MAX_DISTANCIA letras. Dos
+    palabras a distancia de edición <= d comparten alguna variante, así que
+    una consulta solo genera las variantes de sus propias palabras y verifica
+    la distancia exacta en los pocos candidatos encontrados, sin recorrer el
+    vocabulario ni el catálogo.
+    """
+
+    MAX_DISTANCIA = 2
+
+    def __init__(self):
+        # Variante con letras borradas -> palabras del vocabulario que la generan
+        self._variantes = {}
+        self._vocabulario = set()
+        # Palabra -> ISBN que la contienen, separado por campo
+        self._publicaciones = {'titulo': {}, 'autor': {}}
+
+    @staticmethod
+    def tolerancia(palabra):
+        """Errores admitidos según la longitud de la palabra."""
+        if len(palabra) <= 3:
+            return 0
+        return 1 if len(palabra) <= 6 else 2
+
+    @staticmethod
+    def _generar_variantes(palabra, distancia):
+        """Conjunto de la palabra y sus variantes con hasta 'distancia' letras borradas."""
+        variantes = {palabra}
+        frontera = {palabra}
+        for _ in range(distancia):
+            frontera = {p[:i] + p[i + 1:] for p in frontera if len(p) > 1 for i in range(len(p))}
+            variantes |= frontera
+        return variantes
+
+    @staticmethod
+    def _palabras(texto):
+        return [p for p in normalizar_texto(texto).split() if p not in PALABRAS_VACIAS]
+
+    def agregar_libro(self, libro):
+        """Indexa el título y el autor de un libro."""
+        for campo, texto in (('titulo', libro.titulo), ('autor', libro.autor)):
+            publicaciones = self._publicaciones[campo]
+            for palabra in self._palabras(texto):
+                if palabra not in self._vocabulario:
+                    self._vocabulario.add(palabra)
+                    for variante in self._generar_variantes(palabra, self.MAX_DISTANCIA):
+                        self._variantes.setdefault(variante, set()).add(palabra)
+                publicaciones.setdefault(palabra, set()).add(libro.isbn)
+
+    def quitar_libro(self, libro):
+        """Quita un libro del índice y olvida las palabras que ya no usa ningún libro."""
+        for campo, texto in (('titulo', libro.titulo), ('autor', libro.autor)):
+            publicaciones = self._publicaciones[campo]
+            for palabra in self._palabras(texto):
+                isbns = publicaciones.get(palabra)
+                if isbns is not None:
+                    isbns.discard(libro.isbn)
+                    if not isbns:
+                        del publicaciones[palabra]
+                        self._olvidar_palabra(palabra)
+
+    def _olvidar_palabra(self, palabra):
+        """Quita del vocabulario (y de sus variantes) una palabra sin libros en ningún campo."""
+        if palabra not in self._vocabulario or any(palabra in p for p in self._publicaciones.values()):
+            return
+        self._vocabulario.discard(palabra)
+        for variante in self._generar_variantes(palabra, self.MAX_DISTANCIA):
+            palabras = self._variantes.get(variante)
+            if palabras is not None:
+                palabras.discard(palabra)
+                if not palabras:
+                    del self._variantes[variante]
+
+    def palabras_cercanas(self, palabra, tolerancia, limite=None):
+        """
+        Palabras indexadas a distancia de edición <= tolerancia.
+
+        Args:
+            palabra (str): Palabra normalizada
+            tolerancia (int): Distancia de edición máxima
+            limite (float): Instante (time.perf_counter) en que se deja de
+                            verificar candidatas; None para verificarlas todas
+
+        Returns:
+            list: Pares (distancia, palabra)
+        """
+        candidatas = set()
+        for variante in self._generar_variantes(palabra, tolerancia):
+            candidatas |= self._variantes.get(variante, set())
+        cercanas = []
+        for candidata in candidatas:
+            if limite is not None and time.perf_counter() > limite:
+                break
+            if abs(len(candidata) - len(palabra)) <= tolerancia:
+                distancia = distancia_edicion(palabra, candidata)
+                if distancia <= tolerancia:
+                    cercanas.append((distancia, candidata))
+        return cercanas
+
+    def buscar(self, texto, criterio=None, k=10, presupuesto_ms=50):
+        """
+        Busca los k libros más parecidos a un texto.
+
+        El puntaje de un libro es la suma de las distancias de edición de cada
+        palabra de la consulta a la palabra más parecida del libro; las
+        palabras sin coincidencia suman su longitud. Si se agota el presupuesto
+        de tiempo, se ordena con las palabras y candidatas verificadas hasta
+        ese momento.
+
+        Args:
+            texto (str): Texto de la consulta
+            criterio (str): 'titulo', 'autor' o None para ambos
+            k (int): Cantidad máxima de resultados
+            presupuesto_ms (float): Tiempo máximo de búsqueda en milisegundos
+
+        Returns:
+            list: Pares (puntaje, isbn) ordenados del más al menos parecido
+        """
+        limite = time.perf_counter() + presupuesto_ms / 1000
+        campos = (criterio,) if criterio else ('titulo', 'autor')
+        consulta = list(dict.fromkeys(self._palabras(texto)))
+        # Puntaje = suma de longitudes de la consulta - ganancia de cada libro
+        ganancias = {}
+        longitud_total = 0
+        for posicion, palabra in enumerate(consulta):
+            if posicion and time.perf_counter() > limite:
+                break
+            longitud_total += len(palabra)
+            mejores = {}
+            for distancia, cercana in self.palabras_cercanas(palabra, self.tolerancia(palabra), limite):
+                for campo in campos:
+                    for isbn in self._publicaciones[campo].get(cercana, ()):
+                        if distancia < mejores.get(isbn, len(palabra)):
+                            mejores[isbn] = distancia
+            for isbn, distancia in mejores.items():
+                ganancias[isbn] = ganancias.get(isbn, 0) + len(palabra) - distancia
+        return heapq.nsmallest(k, ((longitud_total - ganancia, isbn) for isbn, ganancia in ganancias.items()))
+
+
+class CatalogoPerezoso(MutableMapping):
+    """
+    Diccionario ISBN -> Libro que crea cada Libro recién cuando se accede a él.
+
+    Al importar una instantánea solo se carga un índice compacto de ISBN a
+    posición; los datos del libro se leen del archivo (mapeado en memoria)
+    y se convierten en Libro la primera vez que se consultan.
+    """
+
+    def __init__(self, isbns, desplazamientos, datos, mapa=None):
+        """
+        Args:
+            isbns (list): ISBN en el orden en que están guardados
+            desplazamientos (array): Posición de inicio de cada registro en datos
+                                     (con una posición final adicional)
+            datos (bytes | memoryview): Registros (titulo, autor, categoria) de codificar_campos
+            mapa (mmap): Archivo mapeado del que salen los datos, que cerrar() libera
+        """
+        # ISBN pendientes de materializar -> posición en el archivo
+        self._pendientes = dict(zip(isbns, range(len(isbns))))
+        self._cargados = {}
+        self._desplazamientos = desplazamientos
+        self._datos = datos
+        self._mapa = mapa
+
+    def cerrar(self):
+        """
+        Libera el archivo mapeado. Los libros ya cargados se conservan; los
+        pendientes dejan de poder consultarse.
+        """
+        if isinstance(self._datos, memoryview):
+            self._datos.release()
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    def _registro_crudo(self, posicion):
+        return self._datos[self._desplazamientos[posicion]:self._desplazamientos[posicion + 1]]
+
+    def __getitem__(self, isbn):
+        libro = self._cargados.get(isbn)
+        if libro is None:
+            posicion = self._pendientes.pop(isbn)
+            titulo, autor, categoria = decodificar_campos(self._registro_crudo(posicion))
+            libro = self._cargados[isbn] = Libro(titulo, autor, categoria, isbn)
+        return libro
+
+    def __contains__(self, isbn):
+        return isbn in self._cargados or isbn in self._pendientes
+
+    def __setitem__(self, isbn, libro):
+        self._pendientes.pop(isbn, None)
+        self._cargados[isbn] = libro
+
+    def __delitem__(self, isbn):
+        if isbn in self._cargados:
+            del self._cargados[isbn]
+        else:
+            del self._pendientes[isbn]
+
+    def __iter__(self):
+        # Se copian las claves: recorrer los valores materializa libros y
+        # los mueve de un diccionario al otro
+        return itertools.chain(list(self._cargados), list(self._pendientes))
+
+    def __len__(self):
+        return len(self._cargados) + len(self._pendientes)
+
+    @property
+    def cantidad_cargados(self):
+        """Cantidad de libros ya convertidos en objetos Libro."""
+        return len(self._cargados)
+
+    def registros_crudos(self):
+        """
+        Itera los libros como (isbn, registro en bytes) sin materializar los pendientes.
+        """
+        for isbn, libro in self._cargados.items():
+            yield isbn, codificar_campos((libro.titulo, libro.autor, libro.categoria))
+        for isbn, posicion in self._pendientes.items():
+            yield isbn, bytes(self._registro_crudo(posicion))
+
+
+class AgendaVencimientos:
+    """
+    Fechas de vencimiento de los préstamos, agrupadas en cubetas por hora.
+
+    Las cubetas no vacías se mantienen en una lista ordenada, así que las
+    consultas "vencidos hasta ahora" y "vencen en las próximas N horas" solo
+    visitan las cubetas del rango pedido: su costo es proporcional al
+    resultado (más las dos cubetas de los extremos), no al total de préstamos.
+    """
+
+    ANCHO_CUBETA = 3600
+
+    def __init__(self):
+        # Clave de cubeta -> {isbn: vence}
+        self._cubetas = {}
+        # Claves de las cubetas no vacías, en orden
+        self._claves = []
+        self._vencimientos = {}
+        # Varias operaciones pueden tocar la misma lista de claves a la vez
+        self._candado = threading.Lock()
+
+    def __len__(self):
+        return len(self._vencimientos)
+
+    def __contains__(self, isbn):
+        return isbn in self._vencimientos
+
+    def vencimiento(self, isbn):
+        """Retorna la fecha de vencimiento (timestamp) del préstamo, o None."""
+        return self._vencimientos.get(isbn)
+
+    def como_dict(self):
+        """Retorna una copia de los vencimientos como {isbn: vence}."""
+        return dict(self._vencimientos)
+
+    def agregar(self, isbn, vence):
+        """Registra (o reemplaza) el vencimiento de un préstamo."""
+        with self._candado:
+            self._quitar(isbn)
+            clave = int(vence // self.ANCHO_CUBETA)
+            cubeta = self._cubetas.get(clave)
+            if cubeta is None:
+                cubeta = self._cubetas[clave] = {}
+                bisect.insort(self._claves, clave)
+            cubeta[isbn] = vence
+            self._vencimientos[isbn] = vence
+
+    def quitar(self, isbn):
+        """Elimina el vencimiento de un préstamo, si existe."""
+        with self._candado:
+            self._quitar(isbn)
+
+    def _quitar(self, isbn):
+        vence = self._vencimientos.pop(isbn, None)
+        if vence is None:
+            return
+        clave = int(vence // self.ANCHO_CUBETA)
+        cubeta = self._cubetas[clave]
+        del cubeta[isbn]
+        if not cubeta:
+            del self._cubetas[clave]
+            del self._claves[bisect.bisect_left(self._claves, clave)]
+
+    def entre(self, desde, hasta):
+        """
+        Préstamos que vencen en el intervalo [desde, hasta).
+
+        Args:
+            desde (float): Inicio del intervalo (None para "desde siempre")
+            hasta (float): Fin del intervalo, excluido
+
+        Returns:
+            list: Pares (vence, isbn) ordenados por fecha de vencimiento
+        """
+        with self._candado:
+            inicio = 0 if desde is None else bisect.bisect_left(self._claves, int(desde // self.ANCHO_CUBETA))
+            fin = bisect.bisect_right(self._claves, int(hasta // self.ANCHO_CUBETA))
+            resultado = []
+            for clave in self._claves[inicio:fin]:
+                for isbn, vence in self._cubetas[clave].items():
+                    if (desde is None or vence >= desde) and vence < hasta:
+                        resultado.append((vence, isbn))
+        resultado.sort()
+        return resultado
+
+
+class MotorRecomendaciones:
+    """
+    Recomendaciones "quienes leyeron X también leyeron", a partir de cuántos
+    usuarios tomaron prestados los mismos pares de libros.
+
+    Los conteos se actualizan con cada préstamo (sin reentrenar): el nuevo
+    libro se empareja con los últimos libros distintos del mismo usuario.
+    Cada libro mantiene además su lista de los k vecinos más frecuentes, así
+    que una consulta solo ordena k elementos. Para acotar la memoria, cada
+    libro conserva a lo sumo 2 * max_vecinos conteos; al superarlos se
+    descartan los menos frecuentes.
+
+    Los conteos son aproximados: un préstamo solo se empareja con los
+    últimos 'ventana' libros del usuario (los pares con libros más antiguos
+    no se cuentan), y un vecino descartado al podar vuelve a contar desde
+    cero. Sirven para ordenar recomendaciones, no como totales exactos de
+    préstamos en común.
+    """
+
+    def __init__(self, k=10, ventana=5, max_vecinos=64):
+        """
+        Args:
+            k (int): Tamaño de las listas de recomendaciones precalculadas
+            ventana (int): Libros recientes de cada usuario con los que se empareja un préstamo
+            max_vecinos (int): Conteos que se conservan por libro al podar
+        """
+        self.k = k
+        self.ventana = ventana
+        self.max_vecinos = max(max_vecinos, k)
+        # isbn -> {isbn vecino: veces que un mismo usuario tomó ambos}
+        self._conteos = {}
+        # isbn -> {isbn vecino: conteo} con los k vecinos más frecuentes
+        self._mejores = {}
+        # isbn -> conteo mínimo en _mejores (cota inferior, para descartar rápido)
+        self._umbral = {}
+        # id_usuario -> últimos libros distintos que tomó prestados
+        self._recientes = {}
+
+    def registrar_prestamo(self, id_usuario, isbn):
+        """
+        Actualiza los conteos con un nuevo préstamo.
+
+        Args:
+            id_usuario (str): Usuario que tomó el libro
+            isbn (str): Libro prestado
+        """
+        recientes = self._recientes.get(id_usuario)
+        if recientes is None:
+            recientes = self._recientes[id_usuario] = deque(maxlen=self.ventana)
+        elif isbn in recientes:
+            # Volver a pedir el mismo libro no aporta información nueva
+            return
+        for otro in recientes:
+            self._incrementar(isbn, otro)
+            self._incrementar(otro, isbn)
+        recientes.append(isbn)
+
+    def _incrementar(self, isbn, vecino):
+        vecinos = self._conteos.get(isbn)
+        if vecinos is None:
+            vecinos = self._conteos[isbn] = {}
+            self._mejores[isbn] = {}
+            self._umbral[isbn] = 0
+        conteo = vecinos.get(vecino, 0) + 1
+        vecinos[vecino] = conteo
+
+        mejores = self._mejores[isbn]
+        if vecino in mejores or len(mejores) < self.k:
+            mejores[vecino] = conteo
+        elif conteo > self._umbral[isbn]:
+            # Los conteos solo crecen: el vecino entra si supera al peor de la lista
+            peor = min(mejores, key=mejores.get)
+            if conteo > mejores[peor]:
+                del mejores[peor]
+                mejores[vecino] = conteo
+            self._umbral[isbn] = min(mejores.values())
+
+        if len(vecinos) > 2 * self.max_vecinos:
+            self._podar(isbn, vecinos, mejores)
+
+    def _podar(self, isbn, vecinos, mejores):
+        """Conserva los max_vecinos conteos más altos (y siempre los de la lista top-k)."""
+        conservados = dict(heapq.nlargest(self.max_vecinos, vecinos.items(), key=lambda par: par[1]))
+        for vecino in mejores:
+            conservados[vecino] = vecinos[vecino]
+        self._conteos[isbn] = conservados
+
+    def recomendar(self, isbn, k=None):
+        """
+        Libros que más se prestaron junto con el libro indicado.
+
+        Args:
+            isbn (str): Libro de referencia
+            k (int): Cantidad de recomendaciones (el k del motor si es None)
+
+        Returns:
+            list: Pares (isbn, conteo) del más al menos frecuente; el conteo
+                  es aproximado (ventana de préstamos recientes y poda)
+        """
+        if k is not None and k > self.k:
+            # Más allá de la lista precalculada se ordenan todos los conteos conservados
+            vecinos = self._conteos.get(isbn, {})
+            return heapq.nsmallest(k, vecinos.items(), key=lambda par: (-par[1], par[0]))
+        mejores = self._mejores.get(isbn, {})
+        return sorted(mejores.items(), key=lambda par: (-par[1], par[0]))[:k or self.k]
+
+    @property
+    def cantidad_conteos(self):
+        """Cantidad de pares (libro, vecino) con conteo almacenado."""
+        return sum(len(vecinos) for vecinos in self._conteos.values())
+
+
+class Codigo:
+    """
+    Códigos de resultado de las operaciones de la biblioteca.
+    Permiten reaccionar a un error sin analizar el texto del mensaje.
+    """
+    OK = "ok"
+    LIBRO_NO_ENCONTRADO = "libro_no_encontrado"
+    LIBRO_DUPLICADO = "libro_duplicado"
+    LIBRO_PRESTADO = "libro_prestado"
+    LIBRO_NO_PRESTADO_AL_USUARIO = "libro_no_prestado_al_usuario"
+    USUARIO_NO_ENCONTRADO = "usuario_no_encontrado"
+    USUARIO_DUPLICADO = "usuario_duplicado"
+    USUARIO_CON_PRESTAMOS = "usuario_con_prestamos"
+    LIBRO_DISPONIBLE = "libro_disponible"
+    LIBRO_APARTADO = "libro_apartado"
+    RESERVA_DUPLICADA = "reserva_duplicada"
+    SOLICITUD_INVALIDA = "solicitud_invalida"
+    ERROR_INTERNO = "error_interno"
+
+
+class Resultado:
+    """
+    Resultado estructurado de una operación de la biblioteca.
+    Se evalúa como bool, por lo que sigue funcionando donde antes se
+    esperaba True/False.
+    """
+
+    __slots__ = ('codigo', 'mensaje', 'datos')
+
+    def __init__(self, codigo, mensaje, datos=None):
+        """
+        Args:
+            codigo (str): Uno de los valores de Codigo
+            mensaje (str): Mensaje legible para el usuario
+            datos (dict): Información adicional de la operación
+        """
+        self.codigo = codigo
+        self.mensaje = mensaje
+        self.datos = datos
+
+    @property
+    def ok(self):
+        """Indica si la operación fue exitosa."""
+        return self.codigo == Codigo.OK
+
+    def __bool__(self):
+        return self.ok
+
+    def como_dict(self):
+        """Retorna el resultado como diccionario serializable."""
+        return {'ok': self.ok, 'codigo': self.codigo, 'mensaje': self.mensaje, 'datos': self.datos}
+
+    def __repr__(self):
+        return f"Resultado('{self.codigo}', '{self.mensaje}')"
+
+
+class RegistroConsola:
+    """Registro de mensajes que imprime cada mensaje inmediatamente (comportamiento clásico)."""
+
+    def __init__(self, flujo=None):
+        """
+        Args:
+            flujo (file): Destino de los mensajes; None usa sys.stdout
+        """
+        self.flujo = flujo
+
+    def registrar(self, mensaje):
+        print(mensaje, file=self.flujo)
+
+    def vaciar(self):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+class RegistroNulo:
+    """Registro de mensajes que los descarta (modo silencioso)."""
+
+    def registrar(self, mensaje):
+        pass
+
+    def vaciar(self):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+class RegistroBuffer:
+    """
+    Registro de mensajes que los acumula en memoria y los escribe en bloque,
+    con una sola llamada a write() por cada vaciado. Puede compartirse entre
+    hilos: un candado protege la lista de pendientes.
+    """
+
+    def __init__(self, flujo=None, capacidad=1000):
+        """
+        Args:
+            flujo (file): Destino de los mensajes; None usa sys.stdout
+            capacidad (int): Mensajes acumulados antes de vaciar automáticamente
+        """
+        self.flujo = flujo
+        self.capacidad = capacidad
+        self.pendientes = []
+        self._candado = threading.Lock()
+
+    def registrar(self, mensaje):
+        with self._candado:
+            self.pendientes.append(mensaje)
+            if len(self.pendientes) >= self.capacidad:
+                self._escribir_pendientes()
+
+    def vaciar(self):
+        with self._candado:
+            self._escribir_pendientes()
+
+    def _escribir_pendientes(self):
+        """Escribe y descarta los mensajes acumulados (se llama con el candado tomado)."""
+        if self.pendientes:
+            flujo = self.flujo or sys.stdout
+            flujo.write("\n".join(self.pendientes) + "\n")
+            self.pendientes.clear()
+
+    def cerrar(self):
+        self.vaciar()
+
+
+class RegistroAsincrono:
+    """
+    Registro de mensajes que delega la escritura a un hilo en segundo plano,
+    de modo que una tubería llena no bloquea las operaciones de la biblioteca.
+    """
+
+    _FIN = object()
+
+    def __init__(self, flujo=None):
+        """
+        Args:
+            flujo (file): Destino de los mensajes; None usa sys.stdout
+        """
+        self.flujo = flujo
+        self.cola = queue.SimpleQueue()
+        self.hilo = threading.Thread(target=self._escribir, daemon=True)
+        self.hilo.start()
+
+    def _escribir(self):
+        """Bucle del hilo escritor: agrupa los mensajes disponibles en cada write()."""
+        while True:
+            mensaje = self.cola.get()
+            lote = []
+            while mensaje is not self._FIN:
+                lote.append(mensaje)
+                if self.cola.empty():
+                    break
+                mensaje = self.cola.get()
+            if lote:
+                flujo = self.flujo or sys.stdout
+                flujo.write("\n".join(lote) + "\n")
+                flujo.flush()
+            if mensaje is self._FIN:
+                return
+
+    def registrar(self, mensaje):
+        self.cola.put(mensaje)
+
+    def vaciar(self):
+        pass
+
+    def cerrar(self):
+        """Espera a que se escriban todos los mensajes pendientes."""
+        if self.hilo.is_alive():
+            self.cola.put(self._FIN)
+            self.hilo.join()
+
+
+class Biblioteca:
+    """
+    Clase principal que gestiona la biblioteca digital.
+    Utiliza diccionarios para libros, conjuntos para IDs únicos de usuarios.
+
+    Cada operación retorna un Resultado y envía su mensaje al registro
+    configurado; con RegistroNulo la biblioteca no imprime nada.
+    """
+
+    # Tiempo (en segundos) que un libro devuelto queda apartado para el
+    # siguiente usuario de la lista de espera
+    DURACION_APARTADO = 48 * 3600
+    # Plazo (en segundos) de cada préstamo
+    DURACION_PRESTAMO = 14 * 24 * 3600
+
+    def __init__(self, nombre="Biblioteca Digital", registro=None):
+        """
+        Inicializa la biblioteca.
+
+        Args:
+            nombre (str): Nombre de la biblioteca
+            registro: Destino de los mensajes (RegistroConsola por defecto)
+        """
+        self.nombre = nombre
+        self.registro = registro if registro is not None else RegistroConsola()
+        # Diccionario para almacenar libros con ISBN como clave para búsquedas eficientes
+        self.libros_disponibles = {}
+        # Diccionario para almacenar usuarios registrados
+        self.usuarios_registrados = {}
+        # Conjunto para manejar IDs de usuarios únicos
+        self.ids_usuarios = set()
+        # Lista para historial de préstamos (opcional para tracking)
+        self.historial_prestamos = []
+        self._inicializar_reservas()
+        # Índice de búsqueda difusa, se construye en la primera búsqueda difusa
+        self._indice_difuso = None
+        # Recomendaciones por co-préstamo, se construyen en la primera consulta
+        self._recomendador = None
+
+    def _inicializar_reservas(self):
+        """Crea las estructuras de reservas y apartados."""
+        # Fuente de tiempo (reemplazable para simular el paso de los días)
+        self.reloj = time.time
+        # Lista de espera FIFO por ISBN
+        self.reservas = {}
+        # Libros devueltos apartados para el siguiente usuario: isbn -> (id_usuario, vence)
+        self.apartados = {}
+        # Montículo (vence, isbn, id_usuario) para procesar los apartados vencidos
+        # sin recorrer todos; las entradas obsoletas se descartan al extraerlas
+        self._vencimientos_apartados = []
+        # Fechas de vencimiento de los préstamos activos
+        self.vencimientos = AgendaVencimientos()
+
+    def _notificar(self, resultado):
+        """Envía el mensaje del resultado al registro y retorna el resultado."""
+        self.registro.registrar(resultado.mensaje)
+        return resultado
+
+    def añadir_libro(self, libro):
+        """
+        Añade un libro a la biblioteca.
+
+        Args:
+            libro (Libro): El libro a añadir
+
+        Returns:
+            Resultado: OK si se añadió, LIBRO_DUPLICADO si ya existe
+        """
+        if libro.isbn not in self.libros_disponibles:
+            self.libros_disponibles[libro.isbn] = libro
+            self._actualizar_indice_difuso(libro, agregar=True)
+            return self._notificar(Resultado(Codigo.OK, f"✅ Libro añadido: {libro.titulo}"))
+        else:
+            return self._notificar(Resultado(Codigo.LIBRO_DUPLICADO,
+                                             f"❌ El libro con ISBN {libro.isbn} ya existe en la biblioteca"))
+
+    def quitar_libro(self, isbn):
+        """
+        Quita un libro de la biblioteca.
+
+        Args:
+            isbn (str): ISBN del libro a quitar
+
+        Returns:
+            Resultado: OK, LIBRO_PRESTADO o LIBRO_NO_ENCONTRADO
+        """
+        if isbn in self.libros_disponibles:
+            libro = self.libros_disponibles[isbn]
+            if not libro.prestado:
+                del self.libros_disponibles[isbn]
+                # Las reservas de un libro retirado se cancelan
+                self.reservas.pop(isbn, None)
+                self.apartados.pop(isbn, None)
+                self._actualizar_indice_difuso(libro, agregar=False)
+                return self._notificar(Resultado(Codigo.OK, f"✅ Libro removido: {libro.titulo}"))
+            else:
+                return self._notificar(Resultado(
+                    Codigo.LIBRO_PRESTADO,
+                    f"❌ No se puede quitar el libro '{libro.titulo}' porque está prestado"))
+        else:
+            return self._notificar(Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}"))
+
+    def registrar_usuario(self, usuario):
+        """
+        Registra un nuevo usuario en la biblioteca.
+
+        Args:
+            usuario (Usuario): El usuario a registrar
+
+        Returns:
+            Resultado: OK si se registró, USUARIO_DUPLICADO si el ID ya existe
+        """
+        if usuario.id_usuario not in self.ids_usuarios:
+            self.ids_usuarios.add(usuario.id_usuario)
+            self.usuarios_registrados[usuario.id_usuario] = usuario
+            return self._notificar(Resultado(Codigo.OK, f"✅ Usuario registrado: {usuario.nombre}"))
+        else:
+            return self._notificar(Resultado(Codigo.USUARIO_DUPLICADO,
+                                             f"❌ El ID de usuario {usuario.id_usuario} ya está registrado"))
+
+    def dar_de_baja_usuario(self, id_usuario):
+        """
+        Da de baja a un usuario de la biblioteca.
+
+        Args:
+            id_usuario (str): ID del usuario a dar de baja
+
+        Returns:
+            Resultado: OK, USUARIO_CON_PRESTAMOS o USUARIO_NO_ENCONTRADO
+        """
+        if id_usuario in self.ids_usuarios:
+            usuario = self.usuarios_registrados[id_usuario]
+            if len(usuario.libros_prestados) == 0:
+                self.ids_usuarios.remove(id_usuario)
+                del self.usuarios_registrados[id_usuario]
+                self._cancelar_reservas_usuario(id_usuario)
+                return self._notificar(Resultado(Codigo.OK, f"✅ Usuario dado de baja: {usuario.nombre}"))
+            else:
+                return self._notificar(Resultado(
+                    Codigo.USUARIO_CON_PRESTAMOS,
+                    f"❌ No se puede dar de baja al usuario {usuario.nombre} porque tiene "
+                    f"{len(usuario.libros_prestados)} libro(s) prestado(s)"))
+        else:
+            return self._notificar(Resultado(Codigo.USUARIO_NO_ENCONTRADO,
+                                             f"❌ No se encontró usuario con ID {id_usuario}"))
+
+    def _cancelar_reservas_usuario(self, id_usuario):
+        """
+        Quita al usuario de todas las listas de espera y pasa cada libro que
+        tenía apartado al siguiente de su lista.
+
+        Args:
+            id_usuario (str): ID del usuario dado de baja
+        """
+        for isbn, cola in list(self.reservas.items()):
+            if id_usuario in cola:
+                cola.remove(id_usuario)
+                if not cola:
+                    del self.reservas[isbn]
+        # Las entradas de estos apartados en el montículo quedan obsoletas
+        for isbn in [isbn for isbn, (titular, _) in self.apartados.items() if titular == id_usuario]:
+            del self.apartados[isbn]
+            self._entregar_a_siguiente(isbn)
+
+    def _validar_prestamo(self, isbn, id_usuario, prestados_lote=()):
+        """
+        Verifica si un préstamo puede realizarse sin modificar el estado.
+
+        Args:
+            isbn (str): ISBN del libro a prestar
+            id_usuario (str): ID del usuario que solicita el préstamo
+            prestados_lote (set): ISBN ya prestados dentro del lote en curso
+
+        Returns:
+            Resultado: Resultado de error, o None si el préstamo es válido
+        """
+        # Verificar que el libro existe y está disponible
+        if isbn not in self.libros_disponibles:
+            return Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}")
+
+        libro = self.libros_disponibles[isbn]
+        if libro.prestado or isbn in prestados_lote:
+            return Resultado(Codigo.LIBRO_PRESTADO, f"❌ El libro '{libro.titulo}' ya está prestado")
+
+        # Un libro apartado solo puede prestarse a su titular mientras no venza
+        apartado = self.apartados.get(isbn)
+        if apartado and apartado[0] != id_usuario and apartado[1] > self.reloj():
+            return Resultado(Codigo.LIBRO_APARTADO, f"❌ El libro '{libro.titulo}' está apartado para otro usuario")
+
+        # Verificar que el usuario existe
+        if id_usuario not in self.ids_usuarios:
+            return Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}")
+
+        return None
+
+    def _validar_devolucion(self, isbn, id_usuario, devueltos_lote=()):
+        """
+        Verifica si una devolución puede realizarse sin modificar el estado.
+
+        Args:
+            isbn (str): ISBN del libro a devolver
+            id_usuario (str): ID del usuario que devuelve el libro
+            devueltos_lote (set): ISBN ya devueltos dentro del lote en curso
+
+        Returns:
+            Resultado: Resultado de error, o None si la devolución es válida
+        """
+        # Verificar que el libro existe
+        if isbn not in self.libros_disponibles:
+            return Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}")
+
+        libro = self.libros_disponibles[isbn]
+
+        # Verificar que el libro está prestado al usuario correcto
+        if not libro.prestado or libro.usuario_prestado != id_usuario or isbn in devueltos_lote:
+            return Resultado(Codigo.LIBRO_NO_PRESTADO_AL_USUARIO,
+                             f"❌ El libro '{libro.titulo}' no está prestado a este usuario")
+
+        # Verificar que el usuario existe
+        if id_usuario not in self.ids_usuarios:
+            return Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}")
+
+        return None
+
+    def _aplicar_prestamo(self, isbn, id_usuario):
+        """
+        Marca el libro como prestado (el préstamo ya debe estar validado).
+
+        Returns:
+            dict: Registro del préstamo para el historial
+        """
+        libro = self.libros_disponibles[isbn]
+        usuario = self.usuarios_registrados[id_usuario]
+
+        libro.prestado = True
+        libro.usuario_prestado = id_usuario
+        usuario.tomar_prestado(libro)
+        # El apartado queda cumplido; su entrada en el montículo queda obsoleta
+        self.apartados.pop(isbn, None)
+        vence = self.reloj() + self.DURACION_PRESTAMO
+        self.vencimientos.agregar(isbn, vence)
+
+        return {
+            'accion': 'prestamo',
+            'libro': libro.titulo,
+            'usuario': usuario.nombre,
+            'isbn': isbn,
+            'id_usuario': id_usuario,
+            'vence': vence
+        }
+
+    def _aplicar_devolucion(self, isbn, id_usuario):
+        """
+        Marca el libro como disponible (la devolución ya debe estar validada).
+
+        Returns:
+            dict: Registro de la devolución para el historial
+        """
+        libro = self.libros_disponibles[isbn]
+        usuario = self.usuarios_registrados[id_usuario]
+
+        libro.prestado = False
+        libro.usuario_prestado = None
+        usuario.devolver_libro(libro)
+        self.vencimientos.quitar(isbn)
+        self._entregar_a_siguiente(isbn)
+
+        return {
+            'accion': 'devolucion',
+            'libro': libro.titulo,
+            'usuario': usuario.nombre,
+            'isbn': isbn,
+            'id_usuario': id_usuario
+        }
+
+    def _registrar_historial(self, registros):
+        """
+        Agrega registros de préstamo/devolución al historial.
+
+        Args:
+            registros (list): Diccionarios generados por _aplicar_prestamo/_aplicar_devolucion
+        """
+        self.historial_prestamos.extend(registros)
+        self._alimentar_recomendador(registros)
+
+    def _alimentar_recomendador(self, registros):
+        """Pasa los préstamos nuevos al motor de recomendaciones, si ya existe."""
+        if self._recomendador is not None:
+            for registro in registros:
+                if registro['accion'] == 'prestamo':
+                    self._recomendador.registrar_prestamo(registro['id_usuario'], registro['isbn'])
+
+    def prestar_libro(self, isbn, id_usuario):
+        """
+        Presta un libro a un usuario.
+
+        Args:
+            isbn (str): ISBN del libro a prestar
+            id_usuario (str): ID del usuario que solicita el préstamo
+
+        Returns:
+            Resultado: OK si el préstamo fue exitoso, o el código del error
+        """
+        error = self._validar_prestamo(isbn, id_usuario)
+        if error is not None:
+            return self._notificar(error)
+
+        # Realizar el préstamo y registrar en historial
+        registro = self._aplicar_prestamo(isbn, id_usuario)
+        self._registrar_historial([registro])
+
+        return self._notificar(Resultado(Codigo.OK, f"✅ Libro '{registro['libro']}' prestado a {registro['usuario']}",
+                                         registro))
+
+    def devolver_libro(self, isbn, id_usuario):
+        """
+        Procesa la devolución de un libro.
+
+        Args:
+            isbn (str): ISBN del libro a devolver
+            id_usuario (str): ID del usuario que devuelve el libro
+
+        Returns:
+            Resultado: OK si la devolución fue exitosa, o el código del error
+        """
+        error = self._validar_devolucion(isbn, id_usuario)
+        if error is not None:
+            return self._notificar(error)
+
+        # Procesar devolución y registrar en historial
+        registro = self._aplicar_devolucion(isbn, id_usuario)
+        self._registrar_historial([registro])
+
+        mensaje = f"✅ Libro '{registro['libro']}' devuelto por {registro['usuario']}"
+        apartado = self.apartados.get(isbn)
+        if apartado:
+            mensaje += f" (apartado para el usuario {apartado[0]})"
+        return self._notificar(Resultado(Codigo.OK, mensaje, registro))
+
+    def reservar_libro(self, isbn, id_usuario):
+        """
+        Agrega al usuario a la lista de espera de un libro prestado.
+        Al devolverse, el libro queda apartado para el primero de la lista.
+
+        Args:
+            isbn (str): ISBN del libro a reservar
+            id_usuario (str): ID del usuario que reserva
+
+        Returns:
+            Resultado: OK (con la posición en la lista), LIBRO_DISPONIBLE,
+                       RESERVA_DUPLICADA o el código del error
+        """
+        if isbn not in self.libros_disponibles:
+            return self._notificar(Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}"))
+        if id_usuario not in self.ids_usuarios:
+            return self._notificar(Resultado(Codigo.USUARIO_NO_ENCONTRADO,
+                                             f"❌ No se encontró usuario con ID {id_usuario}"))
+
+        libro = self.libros_disponibles[isbn]
+        if not libro.prestado and isbn not in self.apartados:
+            return self._notificar(Resultado(Codigo.LIBRO_DISPONIBLE,
+                                             f"❌ El libro '{libro.titulo}' está disponible, puede pedirlo prestado"))
+
+        if (libro.usuario_prestado == id_usuario or self.apartados.get(isbn, (None,))[0] == id_usuario
+                or id_usuario in self.reservas.get(isbn, ())):
+            return self._notificar(Resultado(Codigo.RESERVA_DUPLICADA,
+                                             f"❌ El usuario {id_usuario} ya tiene o espera el libro '{libro.titulo}'"))
+
+        # La lista de espera se crea recién cuando la reserva es válida
+        posicion = self._encolar_reserva(isbn, id_usuario)
+        return self._notificar(Resultado(Codigo.OK,
+                                         f"✅ Libro '{libro.titulo}' reservado (posición {posicion} en la lista)",
+                                         {'posicion': posicion}))
+
+    def _encolar_reserva(self, isbn, id_usuario):
+        """
+        Agrega al usuario al final de la lista de espera (la reserva ya debe estar validada).
+
+        Returns:
+            int: Posición del usuario en la lista
+        """
+        cola = self.reservas.setdefault(isbn, deque())
+        cola.append(id_usuario)
+        return len(cola)
+
+    def _entregar_a_siguiente(self, isbn):
+        """
+        Aparta el libro para el primer usuario registrado de su lista de espera, en O(1).
+
+        Returns:
+            str: ID del usuario para quien quedó apartado, o None si no hay espera
+        """
+        cola = self.reservas.get(isbn)
+        while cola:
+            id_usuario = cola.popleft()
+            if id_usuario in self.ids_usuarios:
+                vence = self.reloj() + self.DURACION_APARTADO
+                self.apartados[isbn] = (id_usuario, vence)
+                heapq.heappush(self._vencimientos_apartados, (vence, isbn, id_usuario))
+                if not cola:
+                    del self.reservas[isbn]
+                return id_usuario
+        self.reservas.pop(isbn, None)
+        return None
+
+    def procesar_apartados_vencidos(self):
+        """
+        Libera los apartados que no se retiraron a tiempo y pasa cada libro al
+        siguiente de la lista de espera. Cada vencimiento cuesta O(log n).
+
+        Returns:
+            list: Pares (isbn, id_usuario) de los apartados vencidos
+        """
+        ahora = self.reloj()
+        vencidos = []
+        monticulo = self._vencimientos_apartados
+        while monticulo and monticulo[0][0] <= ahora:
+            vence, isbn, id_usuario = heapq.heappop(monticulo)
+            # Entrada obsoleta: el apartado ya se retiró, se canceló o fue reemplazado
+            if self.apartados.get(isbn) != (id_usuario, vence):
+                continue
+            del self.apartados[isbn]
+            vencidos.append((isbn, id_usuario))
+            self._entregar_a_siguiente(isbn)
+        return vencidos
+
+    def _procesar_lote(self, operaciones, validar, aplicar, atomico):
+        """
+        Valida un lote completo contra el estado actual y lo aplica.
+
+        Args:
+            operaciones (iterable): Pares (isbn, id_usuario)
+            validar (callable): Función de validación individual
+            aplicar (callable): Función que aplica una operación válida
+            atomico (bool): Si es True, un solo fallo cancela todo el lote
+
+        Returns:
+            dict: 'exitosos' con los pares aplicados y 'fallidos' con
+                  tuplas (isbn, id_usuario, Resultado del error)
+        """
+        validos = []
+        fallidos = []
+        # ISBN ya procesados dentro del lote, para detectar duplicados
+        procesados = set()
+
+        for isbn, id_usuario in operaciones:
+            error = validar(isbn, id_usuario, procesados)
+            if error is not None:
+                fallidos.append((isbn, id_usuario, error))
+            else:
+                procesados.add(isbn)
+                validos.append((isbn, id_usuario))
+
+        if atomico and fallidos:
+            return {'exitosos': [], 'fallidos': fallidos}
+
+        # Una sola escritura en el historial por lote
+        self._registrar_historial([aplicar(isbn, id_usuario) for isbn, id_usuario in validos])
+        return {'exitosos': validos, 'fallidos': fallidos}
+
+    def prestar_lote(self, prestamos, atomico=False):
+        """
+        Presta varios libros en una sola operación, sin imprimir nada.
+
+        Args:
+            prestamos (iterable): Pares (isbn, id_usuario)
+            atomico (bool): Si es True, no se aplica ningún préstamo cuando
+                            al menos uno es inválido
+
+        Returns:
+            dict: 'exitosos' y 'fallidos' (con el motivo de cada fallo)
+        """
+        return self._procesar_lote(prestamos, self._validar_prestamo, self._aplicar_prestamo, atomico)
+
+    def devolver_lote(self, devoluciones, atomico=False):
+        """
+        Procesa varias devoluciones en una sola operación, sin imprimir nada.
+
+        Args:
+            devoluciones (iterable): Pares (isbn, id_usuario)
+            atomico (bool): Si es True, no se aplica ninguna devolución cuando
+                            al menos una es inválida
+
+        Returns:
+            dict: 'exitosos' y 'fallidos' (con el motivo de cada fallo)
+        """
+        return self._procesar_lote(devoluciones, self._validar_devolucion, self._aplicar_devolucion, atomico)
+
+    def obtener_libro(self, isbn):
+        """
+        Busca un libro por ISBN.
+
+        Returns:
+            Libro: El libro encontrado, o None si no existe
+        """
+        return self.libros_disponibles.get(isbn)
+
+    def _todos_los_libros(self):
+        """Itera sobre todos los libros del catálogo."""
+        return self.libros_disponibles.values()
+
+    def _actualizar_indice_difuso(self, libro, agregar):
+        """Refleja el alta o la baja de un libro en el índice difuso, si ya se construyó."""
+        if self._indice_difuso is not None:
+            if agregar:
+                self._indice_difuso.agregar_libro(libro)
+            else:
+                self._indice_difuso.quitar_libro(libro)
+
+    def buscar_libros_difuso(self, valor, criterio=None, k=10, presupuesto_ms=50):
+        """
+        Busca libros tolerando errores de escritura, acentos y mayúsculas.
+        "garsia marquez" encuentra los libros de "Gabriel García Márquez".
+
+        Args:
+            valor (str): Texto a buscar
+            criterio (str): 'titulo', 'autor' o None para buscar en ambos
+            k (int): Cantidad máxima de resultados
+            presupuesto_ms (float): Tiempo máximo de búsqueda en milisegundos
+
+        Returns:
+            list: Hasta k libros, del más al menos parecido
+        """
+        if self._indice_difuso is None:
+            self._indice_difuso = IndiceDifuso()
+            for libro in self._todos_los_libros():
+                self._indice_difuso.agregar_libro(libro)
+        resultados = self._indice_difuso.buscar(valor, criterio, k, presupuesto_ms)
+        return [self.obtener_libro(isbn) for _, isbn in resultados]
+
+    def _prestamos_historicos(self):
+        """Itera los pares (id_usuario, isbn) de los préstamos del historial."""
+        return ((r['id_usuario'], r['isbn']) for r in self.historial_prestamos if r['accion'] == 'prestamo')
+
+    def recomendar_libros(self, isbn, k=5):
+        """
+        Libros que también tomaron prestados quienes leyeron el libro indicado,
+        según los conteos aproximados de MotorRecomendaciones (préstamos
+        cercanos de un mismo usuario). El motor se construye a partir del
+        historial en la primera consulta y desde entonces se actualiza con
+        cada préstamo.
+
+        Args:
+            isbn (str): ISBN del libro de referencia
+            k (int): Cantidad máxima de recomendaciones
+
+        Returns:
+            list: Libros recomendados, del más al menos frecuente (aproximado)
+        """
+        if self._recomendador is None:
+            # La capacidad del motor no depende del k de la primera consulta:
+            # pedidos mayores se responden con los conteos completos
+            recomendador = MotorRecomendaciones()
+            for id_usuario, isbn_prestado in self._prestamos_historicos():
+                recomendador.registrar_prestamo(id_usuario, isbn_prestado)
+            self._recomendador = recomendador
+        libros = (self.obtener_libro(vecino) for vecino, _ in self._recomendador.recomendar(isbn, k))
+        # Los libros retirados del catálogo no se recomiendan
+        return [libro for libro in libros if libro is not None]
+
+    def buscar_libros(self, criterio, valor):
+        """
+        Busca libros por título, autor o categoría.
+
+        Args:
+            criterio (str): 'titulo', 'autor' o 'categoria'
+            valor (str): Valor a buscar
+
+        Returns:
+            list: Lista de libros que coinciden con la búsqueda
+        """
+        resultados = []
+        valor_lower = valor.lower()
+
+        for libro in self._todos_los_libros():
+            if criterio == 'titulo' and valor_lower in libro.titulo.lower():
+                resultados.append(libro)
+            elif criterio == 'autor' and valor_lower in libro.autor.lower():
+                resultados.append(libro)
+            elif criterio == 'categoria' and valor_lower in libro.categoria.lower():
+                resultados.append(libro)
+
+        return resultados
+
+    def listar_libros_prestados_usuario(self, id_usuario):
+        """
+        Lista todos los libros prestados a un usuario específico.
+
+        Args:
+            id_usuario (str): ID del usuario
+
+        Returns:
+            list: Lista de libros prestados al usuario
+        """
+        if id_usuario not in self.ids_usuarios:
+            self._notificar(Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}"))
+            return []
+
+        usuario = self.usuarios_registrados[id_usuario]
+        return usuario.libros_prestados.copy()
+
+    def prestamos_vencidos(self):
+        """
+        Préstamos cuya fecha de vencimiento ya pasó.
+
+        Returns:
+            list: Pares (libro, vence) del más al menos atrasado
+        """
+        return [(self.obtener_libro(isbn), vence) for vence, isbn in self.vencimientos.entre(None, self.reloj())]
+
+    def prestamos_por_vencer(self, horas=24):
+        """
+        Préstamos que vencen dentro de las próximas horas.
+
+        Args:
+            horas (float): Tamaño de la ventana de tiempo
+
+        Returns:
+            list: Pares (libro, vence) ordenados por fecha de vencimiento
+        """
+        ahora = self.reloj()
+        return [(self.obtener_libro(isbn), vence)
+                for vence, isbn in self.vencimientos.entre(ahora, ahora + horas * 3600)]
+
+    def mostrar_reporte_vencimientos(self, horas=24):
+        """Muestra los préstamos vencidos y los que vencen pronto a través del registro."""
+        ahora = self.reloj()
+        lineas = ["⏰ Préstamos vencidos:"]
+        for libro, vence in self.prestamos_vencidos():
+            lineas.append(f"   ❗ '{libro.titulo}' - usuario {libro.usuario_prestado} - "
+                          f"{(ahora - vence) / 86400:.1f} día(s) de atraso")
+        if len(lineas) == 1:
+            lineas.append("   (ninguno)")
+        lineas.append(f"⏳ Vencen en las próximas {horas} horas:")
+        por_vencer = self.prestamos_por_vencer(horas)
+        for libro, vence in por_vencer:
+            lineas.append(f"   - '{libro.titulo}' - usuario {libro.usuario_prestado} - "
+                          f"vence en {(vence - ahora) / 3600:.1f} hora(s)")
+        if not por_vencer:
+            lineas.append("   (ninguno)")
+        self.registro.registrar("\n".join(lineas))
+
+    def obtener_estadisticas(self):
+        """
+        Calcula las estadísticas generales de la biblioteca sin imprimir.
+
+        Returns:
+            dict: Totales de libros, préstamos, usuarios e historial
+        """
+        total_libros = len(self.libros_disponibles)
+        # Se cuenta desde los usuarios para no recorrer (ni materializar) todo el catálogo
+        libros_prestados = sum(len(usuario.libros_prestados) for usuario in self.usuarios_registrados.values())
+        return {
+            'total_libros': total_libros,
+            'libros_disponibles': total_libros - libros_prestados,
+            'libros_prestados': libros_prestados,
+            'usuarios_registrados': len(self.usuarios_registrados),
+            'transacciones_historial': len(self.historial_prestamos)
+        }
+
+    def mostrar_estadisticas(self):
+        """Muestra estadísticas generales de la biblioteca a través del registro."""
+        stats = self.obtener_estadisticas()
+
+        self.registro.registrar(f"\n📊 Estadísticas de {self.nombre}:\n"
+                                f"   📚 Total de libros: {stats['total_libros']}\n"
+                                f"   ✅ Libros disponibles: {stats['libros_disponibles']}\n"
+                                f"   📖 Libros prestados: {stats['libros_prestados']}\n"
+                                f"   👥 Usuarios registrados: {stats['usuarios_registrados']}\n"
+                                f"   📜 Transacciones en historial: {stats['transacciones_historial']}")
+
+    def exportar_snapshot(self, ruta):
+        """
+        Guarda la biblioteca completa (libros, usuarios, préstamos, reservas
+        e historial) en un archivo de instantánea.
+
+        Formato: firma, longitud y cabecera JSON (todo salvo los libros),
+        ISBN separados por saltos de línea, tabla de desplazamientos y
+        registros (titulo, autor, categoria) de codificar_campos. Los libros
+        aún no cargados de un catálogo perezoso se copian sin materializarse.
+
+        Args:
+            ruta (str): Archivo de destino
+
+        Raises:
+            ValueError: Si algún ISBN contiene un salto de línea
+        """
+        if isinstance(self.libros_disponibles, CatalogoPerezoso):
+            elementos = self.libros_disponibles.registros_crudos()
+        else:
+            elementos = ((isbn, codificar_campos((libro.titulo, libro.autor, libro.categoria)))
+                         for isbn, libro in self.libros_disponibles.items())
+
+        isbns = []
+        desplazamientos = array.array('Q', [0])
+        registros = []
+        for isbn, crudo in elementos:
+            isbns.append(isbn)
+            registros.append(crudo)
+            desplazamientos.append(desplazamientos[-1] + len(crudo))
+
+        bloque_isbns = "\n".join(isbns).encode("utf-8")
+        if isbns and bloque_isbns.count(b"\n") != len(isbns) - 1:
+            raise ValueError("Los ISBN no pueden contener saltos de línea")
+        cabecera = json.dumps({
+            'nombre': self.nombre,
+            'num_libros': len(isbns),
+            'bytes_isbns': len(bloque_isbns),
+            'usuarios': [[u.id_usuario, u.nombre, [libro.isbn for libro in u.libros_prestados]]
+                         for u in self.usuarios_registrados.values()],
+            'reservas': {isbn: list(cola) for isbn, cola in self.reservas.items()},
+            'apartados': dict(self.apartados),
+            'vencimientos': self._vencimientos_activos(),
+            'historial': list(self.historial_prestamos)
+        }, ensure_ascii=False).encode("utf-8")
+
+        with open(ruta, "wb") as archivo:
+            archivo.write(FIRMA_SNAPSHOT)
+            archivo.write(struct.pack("<Q", len(cabecera)))
+            archivo.write(cabecera)
+            archivo.write(bloque_isbns)
+            archivo.write(desplazamientos.tobytes())
+            archivo.write(b"".join(registros))
+
+    def _vencimientos_activos(self):
+        """Diccionario isbn -> vencimiento de los préstamos activos."""
+        return self.vencimientos.como_dict()
+
+    def cerrar(self):
+        """Libera el archivo de la instantánea de la que se importó el catálogo, si lo hay."""
+        if isinstance(self.libros_disponibles, CatalogoPerezoso):
+            self.libros_disponibles.cerrar()
+
+    @classmethod
+    def importar_snapshot(cls, ruta, registro=None):
+        """
+        Crea una biblioteca a partir de una instantánea. Solo se cargan el
+        índice de ISBN, los usuarios y los libros prestados; el resto de los
+        libros se crea al consultarlos por primera vez.
+
+        Args:
+            ruta (str): Archivo generado por exportar_snapshot
+            registro: Destino de los mensajes (RegistroConsola por defecto)
+
+        Returns:
+            Biblioteca: La biblioteca restaurada (cerrar() libera el archivo)
+
+        Raises:
+            ValueError: Si el archivo no es una instantánea o está truncado o dañado
+        """
+        with open(ruta, "rb") as archivo:
+            if os.fstat(archivo.fileno()).st_size < len(FIRMA_SNAPSHOT) + 8:
+                raise ValueError(f"{ruta} no es una instantánea de biblioteca")
+            datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            cabecera, isbns, desplazamientos, posicion = cls._leer_indice_snapshot(ruta, datos)
+        except BaseException:
+            datos.close()
+            raise
+
+        biblioteca = cls(cabecera['nombre'], registro)
+        biblioteca.libros_disponibles = CatalogoPerezoso(isbns, desplazamientos, memoryview(datos)[posicion:],
+                                                         mapa=datos)
+        for id_usuario, nombre, prestados in cabecera['usuarios']:
+            usuario = Usuario(nombre, id_usuario)
+            biblioteca.ids_usuarios.add(id_usuario)
+            biblioteca.usuarios_registrados[id_usuario] = usuario
+            for isbn in prestados:
+                libro = biblioteca.libros_disponibles[isbn]
+                libro.prestado = True
+                libro.usuario_prestado = id_usuario
+                usuario.tomar_prestado(libro)
+        for isbn, vence in cabecera.get('vencimientos', {}).items():
+            biblioteca.vencimientos.agregar(isbn, vence)
+        biblioteca.reservas = {isbn: deque(cola) for isbn, cola in cabecera['reservas'].items()}
+        biblioteca.apartados = {isbn: tuple(apartado) for isbn, apartado in cabecera['apartados'].items()}
+        biblioteca._vencimientos_apartados = [(vence, isbn, id_usuario)
+                                              for isbn, (id_usuario, vence) in biblioteca.apartados.items()]
+        heapq.heapify(biblioteca._vencimientos_apartados)
+        biblioteca.historial_prestamos = cabecera['historial']
+        return biblioteca
+
+    @staticmethod
+    def _leer_indice_snapshot(ruta, datos):
+        """
+        Lee y valida la cabecera, los ISBN y la tabla de desplazamientos de
+        una instantánea contra el tamaño del archivo.
+
+        Returns:
+            tuple: (cabecera, isbns, desplazamientos, posición de los registros)
+        """
+        if datos[:len(FIRMA_SNAPSHOT)] != FIRMA_SNAPSHOT:
+            raise ValueError(f"{ruta} no es una instantánea de biblioteca")
+        posicion = len(FIRMA_SNAPSHOT)
+        (longitud_cabecera,) = struct.unpack_from("<Q", datos, posicion)
+        posicion += 8
+        if posicion + longitud_cabecera > len(datos):
+            raise ValueError(f"Instantánea truncada: la cabecera excede el archivo {ruta}")
+        cabecera = json.loads(datos[posicion:posicion + longitud_cabecera].decode("utf-8"))
+        posicion += longitud_cabecera
+        if not isinstance(cabecera, dict) or not CAMPOS_CABECERA_SNAPSHOT <= cabecera.keys():
+            raise ValueError(f"Instantánea dañada: cabecera incompleta en {ruta}")
+        num_libros = cabecera['num_libros']
+        bytes_isbns = cabecera['bytes_isbns']
+        if posicion + bytes_isbns > len(datos):
+            raise ValueError(f"Instantánea truncada: los ISBN exceden el archivo {ruta}")
+        isbns = datos[posicion:posicion + bytes_isbns].decode("utf-8").split("\n") if num_libros else []
+        if len(isbns) != num_libros:
+            raise ValueError(f"Instantánea dañada: {len(isbns)} ISBN para {num_libros} libros")
+        posicion += bytes_isbns
+        bytes_desplazamientos = 8 * (num_libros + 1)
+        if posicion + bytes_desplazamientos > len(datos):
+            raise ValueError(f"Instantánea truncada: la tabla de desplazamientos excede el archivo {ruta}")
+        desplazamientos = array.array('Q')
+        desplazamientos.frombytes(datos[posicion:posicion + bytes_desplazamientos])
+        posicion += bytes_desplazamientos
+        if desplazamientos[0] != 0 or desplazamientos[-1] != len(datos) - posicion:
+            raise ValueError(f"Instantánea truncada o dañada: los registros no ocupan el resto de {ruta}")
+        return cabecera, isbns, desplazamientos, posicion
+
+
+
+class BibliotecaConcurrente(Biblioteca):
+    """
+    Biblioteca segura para varios hilos (por ejemplo, varios puestos de
+    atención que comparten la misma instancia).
+
+    Usa candados por franjas: cada ISBN y cada ID de usuario se asigna a uno
+    de num_franjas candados según su hash. Los préstamos de libros y usuarios
+    distintos avanzan en paralelo, mientras que la verificación y el cambio
+    de estado de un mismo libro ocurren siempre bajo el mismo candado, por lo
+    que un libro nunca puede prestarse dos veces.
+
+    Para evitar interbloqueos los candados se toman siempre en el mismo
+    orden: primero el del libro y luego el del usuario.
+    """
+
+    def __init__(self, nombre="Biblioteca Digital", registro=None, num_franjas=64):
+        """
+        Args:
+            nombre (str): Nombre de la biblioteca
+            registro: Destino de los mensajes (RegistroConsola por defecto)
+            num_franjas (int): Cantidad de candados para libros y para usuarios
+        """
+        super().__init__(nombre, registro)
+        self._candados_libros = [threading.Lock() for _ in range(num_franjas)]
+        self._candados_usuarios = [threading.Lock() for _ in range(num_franjas)]
+        self._candado_historial = threading.Lock()
+        # Protege el montículo de vencimientos, compartido por todos los libros
+        self._candado_apartados = threading.Lock()
+        # Protege el índice de búsqueda difusa, compartido por todos los libros
+        self._candado_indice = threading.Lock()
+
+    def _candado_libro(self, isbn):
+        return self._candados_libros[hash(isbn) % len(self._candados_libros)]
+
+    def _candado_usuario(self, id_usuario):
+        return self._candados_usuarios[hash(id_usuario) % len(self._candados_usuarios)]
+
+    @contextlib.contextmanager
+    def _bloquear_todo(self):
+        """Toma todos los candados (en orden) para operaciones que abarcan muchos libros."""
+        with contextlib.ExitStack() as pila:
+            for candado in self._candados_libros + self._candados_usuarios:
+                pila.enter_context(candado)
+            yield
+
+    def _registrar_historial(self, registros):
+        with self._candado_historial:
+            super()._registrar_historial(registros)
+
+    def recomendar_libros(self, isbn, k=5):
+        # El motor se construye y actualiza bajo el mismo candado que el historial
+        with self._candado_historial:
+            return super().recomendar_libros(isbn, k)
+
+    def _todos_los_libros(self):
+        # Copia de los valores: otro hilo puede añadir o quitar libros mientras se recorren
+        return list(self.libros_disponibles.values())
+
+    def buscar_libros_difuso(self, valor, criterio=None, k=10, presupuesto_ms=50):
+        with self._candado_indice:
+            return super().buscar_libros_difuso(valor, criterio, k, presupuesto_ms)
+
+    def _actualizar_indice_difuso(self, libro, agregar):
+        # Altas y bajas de libros distintos llegan desde franjas distintas
+        with self._candado_indice:
+            super()._actualizar_indice_difuso(libro, agregar)
+
+    def obtener_estadisticas(self):
+        # Con todos los candados tomados los totales corresponden a un mismo instante
+        with self._bloquear_todo(), self._candado_historial:
+            return super().obtener_estadisticas()
+
+    def añadir_libro(self, libro):
+        with self._candado_libro(libro.isbn):
+            return super().añadir_libro(libro)
+
+    def quitar_libro(self, isbn):
+        with self._candado_libro(isbn):
+            return super().quitar_libro(isbn)
+
+    def registrar_usuario(self, usuario):
+        with self._candado_usuario(usuario.id_usuario):
+            return super().registrar_usuario(usuario)
+
+    def dar_de_baja_usuario(self, id_usuario):
+        # La baja recorre las listas de espera de todos los libros
+        with self._bloquear_todo():
+            return super().dar_de_baja_usuario(id_usuario)
+
+    def prestar_libro(self, isbn, id_usuario):
+        with self._candado_libro(isbn), self._candado_usuario(id_usuario):
+            return super().prestar_libro(isbn, id_usuario)
+
+    def devolver_libro(self, isbn, id_usuario):
+        with self._candado_libro(isbn), self._candado_usuario(id_usuario):
+            return super().devolver_libro(isbn, id_usuario)
+
+    def prestar_lote(self, prestamos, atomico=False):
+        with self._bloquear_todo():
+            return super().prestar_lote(prestamos, atomico)
+
+    def devolver_lote(self, devoluciones, atomico=False):
+        with self._bloquear_todo():
+            return super().devolver_lote(devoluciones, atomico)
+
+    def listar_libros_prestados_usuario(self, id_usuario):
+        with self._candado_usuario(id_usuario):
+            return super().listar_libros_prestados_usuario(id_usuario)
+
+    def reservar_libro(self, isbn, id_usuario):
+        with self._candado_libro(isbn), self._candado_usuario(id_usuario):
+            return super().reservar_libro(isbn, id_usuario)
+
+    def _entregar_a_siguiente(self, isbn):
+        with self._candado_apartados:
+            return super()._entregar_a_siguiente(isbn)
+
+    def procesar_apartados_vencidos(self):
+        with self._bloquear_todo():
+            return super().procesar_apartados_vencidos()
+
+
+class TablaSQLite(Mapping):
+    """
+    Diccionario de solo lectura sobre una tabla de SQLite.
+
+    Cada consulta usa la clave primaria y los recorridos avanzan por páginas
+    ordenadas por la clave, así que la tabla nunca se carga completa en
+    memoria. Los cambios se hacen con los métodos de BibliotecaSQLite.
+    """
+
+    TAMAÑO_PAGINA = 1000
+
+    def __init__(self, conexion, tabla, clave, columnas, construir):
+        """
+        Args:
+            conexion (sqlite3.Connection): Conexión con la base de datos
+            tabla (str): Nombre de la tabla
+            clave (str): Columna de clave primaria
+            columnas (str): Columnas que recibe construir, separadas por comas
+            construir (callable): Convierte una fila en el valor del diccionario
+        """
+        self._conexion = conexion
+        self._construir = construir
+        self._consulta_clave = f"SELECT {columnas} FROM {tabla} WHERE {clave} = ?"
+        self._consulta_existe = f"SELECT 1 FROM {tabla} WHERE {clave} = ?"
+        self._consulta_contar = f"SELECT COUNT(*) FROM {tabla}"
+        self._consulta_primera = f"SELECT {clave}, {columnas} FROM {tabla} ORDER BY {clave} LIMIT ?"
+        self._consulta_pagina = f"SELECT {clave}, {columnas} FROM {tabla} WHERE {clave} > ? ORDER BY {clave} LIMIT ?"
+
+    def __getitem__(self, clave):
+        fila = self._conexion.execute(self._consulta_clave, (clave,)).fetchone()
+        if fila is None:
+            raise KeyError(clave)
+        return self._construir(fila)
+
+    def __contains__(self, clave):
+        return self._conexion.execute(self._consulta_existe, (clave,)).fetchone() is not None
+
+    def __len__(self):
+        return self._conexion.execute(self._consulta_contar).fetchone()[0]
+
+    def _filas(self):
+        """Itera las filas (clave, columnas...) de a una página por consulta."""
+        filas = self._conexion.execute(self._consulta_primera, (self.TAMAÑO_PAGINA,)).fetchall()
+        while filas:
+            yield from filas
+            filas = self._conexion.execute(self._consulta_pagina, (filas[-1][0], self.TAMAÑO_PAGINA)).fetchall()
+
+    def __iter__(self):
+        return (fila[0] for fila in self._filas())
+
+    def items(self):
+        return ((fila[0], self._construir(fila[1:])) for fila in self._filas())
+
+    def values(self):
+        return (self._construir(fila[1:]) for fila in self._filas())
+
+
+class ReservasSQLite(Mapping):
+    """
+    Listas de espera guardadas en SQLite, vistas como un diccionario de solo
+    lectura ISBN -> deque con los IDs de usuario en orden de llegada.
+    """
+
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    def __getitem__(self, isbn):
+        cola = deque(fila[0] for fila in self._conexion.execute(
+            "SELECT id_usuario FROM reservas WHERE isbn = ? ORDER BY id", (isbn,)))
+        if not cola:
+            raise KeyError(isbn)
+        return cola
+
+    def __contains__(self, isbn):
+        return self._conexion.execute("SELECT 1 FROM reservas WHERE isbn = ?", (isbn,)).fetchone() is not None
+
+    def __len__(self):
+        return self._conexion.execute("SELECT COUNT(DISTINCT isbn) FROM reservas").fetchone()[0]
+
+    def __iter__(self):
+        return (fila[0] for fila in self._conexion.execute("SELECT DISTINCT isbn FROM reservas ORDER BY isbn").fetchall())
+
+    def items(self):
+        filas = self._conexion.execute("SELECT isbn, id_usuario FROM reservas ORDER BY isbn, id").fetchall()
+        return ((isbn, deque(fila[1] for fila in grupo))
+                for isbn, grupo in itertools.groupby(filas, key=lambda fila: fila[0]))
+
+
+class HistorialSQLite:
+    """
+    Historial de préstamos guardado en SQLite, leído por páginas en orden de
+    registro. Recorrerlo no carga la tabla completa en memoria.
+    """
+
+    TAMAÑO_PAGINA = 1000
 
-    def tomar_prestado(self, libro):
-        """
-        Añade un libro a la lista de libros prestados del usuario.
+    def __init__(self, conexion):
+        self._conexion = conexion
 
-        Args:
-            libro (Libro): El libro a prestar
-        """
-        self.libros_prestados.append(libro)
+    def __len__(self):
+        return self._conexion.execute("SELECT COUNT(*) FROM historial").fetchone()[0]
 
-    def devolver_libro(self, libro):
+    def __iter__(self):
+        return self.registros()
+
+    def registros(self, accion=None):
         """
-        Remueve un libro de la lista de libros prestados del usuario.
+        Itera los registros del historial como diccionarios.
 
         Args:
-            libro (Libro): El libro a devolver
+            accion (str): 'prestamo' o 'devolucion' para filtrar, o None para todos
         """
-        if libro in self.libros_prestados:
-            self.libros_prestados.remove(libro)
-
-    def __str__(self):
-        """Representación en cadena del usuario."""
-        return f"Usuario: {self.nombre} (ID: {self.id_usuario}) - Libros prestados: {len(self.libros_prestados)}"
-
-    def __repr__(self):
-        """Representación técnica del usuario."""
-        return f"Usuario('{self.nombre}', '{self.id_usuario}')"
-
+        condicion = "" if accion is None else "accion = ? AND "
+        consulta = (f"SELECT id, accion, libro, usuario, isbn, id_usuario FROM historial "
+                    f"WHERE {condicion}id > ? ORDER BY id LIMIT ?")
+        filtro = () if accion is None else (accion,)
+        ultimo = 0
+        while True:
+            filas = self._conexion.execute(consulta, filtro + (ultimo, self.TAMAÑO_PAGINA)).fetchall()
+            if not filas:
+                return
+            for _, a, l, u, i, iu in filas:
+                yield {'accion': a, 'libro': l, 'usuario': u, 'isbn': i, 'id_usuario': iu}
+            ultimo = filas[-1][0]
+
+
+class BibliotecaSQLite(Biblioteca):
+    """
+    Biblioteca con almacenamiento persistente en SQLite.
+    Expone los mismos métodos públicos que Biblioteca, pero libros, usuarios,
+    préstamos e historial viven en disco, por lo que el catálogo puede ser
+    mayor que la memoria disponible y sobrevive al cierre del programa.
 
-class Biblioteca:
+    Las consultas usan SQL con parámetros, que sqlite3 prepara una sola vez y
+    reutiliza desde su caché de sentencias.
     """
-    Clase principal que gestiona la biblioteca digital.
-    Utiliza diccionarios para libros, conjuntos para IDs únicos de usuarios.
+
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS libros (
+            isbn TEXT PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            autor TEXT NOT NULL,
+            categoria TEXT NOT NULL,
+            titulo_min TEXT NOT NULL,
+            autor_min TEXT NOT NULL,
+            categoria_min TEXT NOT NULL,
+            id_usuario_prestado TEXT,
+            vence REAL
+        );
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id_usuario TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS historial (
+            id INTEGER PRIMARY KEY,
+            accion TEXT NOT NULL,
+            libro TEXT NOT NULL,
+            usuario TEXT NOT NULL,
+            isbn TEXT NOT NULL,
+            id_usuario TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS reservas (
+            id INTEGER PRIMARY KEY,
+            isbn TEXT NOT NULL,
+            id_usuario TEXT NOT NULL,
+            UNIQUE (isbn, id_usuario)
+        );
+        CREATE TABLE IF NOT EXISTS apartados (
+            isbn TEXT PRIMARY KEY,
+            id_usuario TEXT NOT NULL,
+            vence REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_libros_autor ON libros(autor_min);
+        CREATE INDEX IF NOT EXISTS idx_libros_categoria ON libros(categoria_min);
+        CREATE INDEX IF NOT EXISTS idx_libros_usuario ON libros(id_usuario_prestado);
+        CREATE INDEX IF NOT EXISTS idx_libros_vence ON libros(vence) WHERE vence IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_historial_usuario ON historial(id_usuario);
+        CREATE INDEX IF NOT EXISTS idx_reservas_usuario ON reservas(id_usuario);
+        CREATE INDEX IF NOT EXISTS idx_apartados_usuario ON apartados(id_usuario);
+        CREATE INDEX IF NOT EXISTS idx_apartados_vence ON apartados(vence);
     """
 
-    def __init__(self, nombre="Biblioteca Digital"):
+    # Columna normalizada consultada por cada criterio de búsqueda
+    COLUMNAS_BUSQUEDA = {'titulo': 'titulo_min', 'autor': 'autor_min', 'categoria': 'categoria_min'}
+
+    def __init__(self, ruta="biblioteca.db", nombre="Biblioteca Digital", registro=None):
         """
-        Inicializa la biblioteca.
+        Abre (o crea) la base de datos de la biblioteca.
 
         Args:
+            ruta (str): Archivo de la base de datos
             nombre (str): Nombre de la biblioteca
+            registro: Destino de los mensajes (RegistroConsola por defecto)
         """
-        self.nombre = nombre
-        # Diccionario para almacenar libros con ISBN como clave para búsquedas eficientes
-        self.libros_disponibles = {}
-        # Diccionario para almacenar usuarios registrados
-        self.usuarios_registrados = {}
-        # Conjunto para manejar IDs de usuarios únicos
-        self.ids_usuarios = set()
-        # Lista para historial de préstamos (opcional para tracking)
-        self.historial_prestamos = []
+        super().__init__(nombre, registro)
+        # Sin transacciones implícitas: cada operación abre la suya con _transaccion().
+        # La conexión puede usarse desde otro hilo (por ejemplo el de
+        # ServidorBiblioteca) siempre que no se use desde dos hilos a la vez
+        self.conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        # Bases creadas antes de registrar vencimientos no tienen la columna 'vence'
+        columnas = [fila[1] for fila in self.conexion.execute("PRAGMA table_info(libros)")]
+        if columnas and 'vence' not in columnas:
+            self.conexion.execute("ALTER TABLE libros ADD COLUMN vence REAL")
+        self.conexion.executescript(self.ESQUEMA)
+        # Las colecciones de la clase base se reemplazan por vistas de las tablas,
+        # así el código escrito para Biblioteca lee directamente del disco
+        self.libros_disponibles = TablaSQLite(self.conexion, "libros", "isbn",
+                                              "titulo, autor, categoria, isbn, id_usuario_prestado",
+                                              self._libro_desde_fila)
+        self.usuarios_registrados = TablaSQLite(self.conexion, "usuarios", "id_usuario", "nombre, id_usuario",
+                                                self._usuario_desde_fila)
+        self.ids_usuarios = self.usuarios_registrados.keys()
+        self.historial_prestamos = HistorialSQLite(self.conexion)
+        self.reservas = ReservasSQLite(self.conexion)
+        self.apartados = TablaSQLite(self.conexion, "apartados", "isbn", "id_usuario, vence", tuple)
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        self.conexion.close()
+
+    @contextlib.contextmanager
+    def _transaccion(self):
+        """
+        Ejecuta un bloque dentro de una transacción de escritura. BEGIN IMMEDIATE
+        reserva la base antes de validar, así otro proceso no puede cambiar el
+        estado entre la verificación y la escritura.
+        """
+        self.conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conexion.execute("ROLLBACK")
+            raise
+        self.conexion.execute("COMMIT")
+
+    @staticmethod
+    def _libro_desde_fila(fila):
+        """Construye un Libro a partir de (titulo, autor, categoria, isbn, id_usuario_prestado)."""
+        libro = Libro(fila[0], fila[1], fila[2], fila[3])
+        libro.prestado = fila[4] is not None
+        libro.usuario_prestado = fila[4]
+        return libro
+
+    def _usuario_desde_fila(self, fila):
+        """Construye un Usuario a partir de (nombre, id_usuario), con sus préstamos activos."""
+        usuario = Usuario(fila[0], fila[1])
+        usuario.libros_prestados = self._libros_prestados_a(fila[1])
+        return usuario
+
+    @staticmethod
+    def _fila_desde_libro(libro):
+        return (libro.isbn, libro.titulo, libro.autor, libro.categoria,
+                libro.titulo.lower(), libro.autor.lower(), libro.categoria.lower())
+
+    def obtener_libro(self, isbn):
+        """
+        Busca un libro por ISBN usando la clave primaria.
+
+        Returns:
+            Libro: El libro encontrado, o None si no existe
+        """
+        fila = self.conexion.execute(
+            "SELECT titulo, autor, categoria, isbn, id_usuario_prestado FROM libros WHERE isbn = ?",
+            (isbn,)).fetchone()
+        return self._libro_desde_fila(fila) if fila else None
 
     def añadir_libro(self, libro):
         """
         Añade un libro a la biblioteca.
 
+        Returns:
+            Resultado: OK si se añadió, LIBRO_DUPLICADO si ya existe
+        """
+        try:
+            with self._transaccion():
+                self.conexion.execute(
+                    "INSERT INTO libros (isbn, titulo, autor, categoria, titulo_min, autor_min, categoria_min) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", self._fila_desde_libro(libro))
+        except sqlite3.IntegrityError:
+            return self._notificar(Resultado(Codigo.LIBRO_DUPLICADO,
+                                             f"❌ El libro con ISBN {libro.isbn} ya existe en la biblioteca"))
+        self._actualizar_indice_difuso(libro, agregar=True)
+        return self._notificar(Resultado(Codigo.OK, f"✅ Libro añadido: {libro.titulo}"))
+
+    def añadir_libros_lote(self, libros, tamaño_lote=10000):
+        """
+        Carga masiva de libros con una confirmación por cada bloque, sin imprimir.
+        Los ISBN repetidos se ignoran.
+
         Args:
-            libro (Libro): El libro a añadir
+            libros (iterable): Libros a añadir
+            tamaño_lote (int): Libros insertados por transacción
 
         Returns:
-            bool: True si se añadió exitosamente, False si ya existe
+            int: Cantidad de libros insertados
         """
-        if libro.isbn not in self.libros_disponibles:
-            self.libros_disponibles[libro.isbn] = libro
-            print(f"✅ Libro añadido: {libro.titulo}")
-            return True
-        else:
-            print(f"❌ El libro con ISBN {libro.isbn} ya existe en la biblioteca")
-            return False
+        insertados = 0
+        bloque = []
+        for libro in libros:
+            bloque.append(self._fila_desde_libro(libro))
+            if len(bloque) >= tamaño_lote:
+                insertados += self._insertar_bloque(bloque)
+                bloque = []
+        if bloque:
+            insertados += self._insertar_bloque(bloque)
+        # El índice difuso se reconstruirá en la próxima búsqueda difusa
+        self._indice_difuso = None
+        return insertados
+
+    def _insertar_bloque(self, filas):
+        with self._transaccion():
+            cursor = self.conexion.executemany(
+                "INSERT OR IGNORE INTO libros (isbn, titulo, autor, categoria, titulo_min, autor_min, categoria_min) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+        return cursor.rowcount
 
     def quitar_libro(self, isbn):
         """
         Quita un libro de la biblioteca.
 
-        Args:
-            isbn (str): ISBN del libro a quitar
-
         Returns:
-            bool: True si se quitó exitosamente, False si no existe o está prestado
+            Resultado: OK, LIBRO_PRESTADO o LIBRO_NO_ENCONTRADO
         """
-        if isbn in self.libros_disponibles:
-            libro = self.libros_disponibles[isbn]
-            if not libro.prestado:
-                del self.libros_disponibles[isbn]
-                print(f"✅ Libro removido: {libro.titulo}")
-                return True
-            else:
-                print(f"❌ No se puede quitar el libro '{libro.titulo}' porque está prestado")
-                return False
-        else:
-            print(f"❌ No se encontró libro con ISBN {isbn}")
-            return False
+        with self._transaccion():
+            libro = self.obtener_libro(isbn)
+            if libro is None:
+                return self._notificar(Resultado(Codigo.LIBRO_NO_ENCONTRADO,
+                                                 f"❌ No se encontró libro con ISBN {isbn}"))
+            if libro.prestado:
+                return self._notificar(Resultado(
+                    Codigo.LIBRO_PRESTADO,
+                    f"❌ No se puede quitar el libro '{libro.titulo}' porque está prestado"))
+            self.conexion.execute("DELETE FROM libros WHERE isbn = ?", (isbn,))
+            # Las reservas de un libro retirado se cancelan
+            self.conexion.execute("DELETE FROM reservas WHERE isbn = ?", (isbn,))
+            self.conexion.execute("DELETE FROM apartados WHERE isbn = ?", (isbn,))
+        self._actualizar_indice_difuso(libro, agregar=False)
+        return self._notificar(Resultado(Codigo.OK, f"✅ Libro removido: {libro.titulo}"))
 
     def registrar_usuario(self, usuario):
         """
         Registra un nuevo usuario en la biblioteca.
 
-        Args:
-            usuario (Usuario): El usuario a registrar
+        Returns:
+            Resultado: OK si se registró, USUARIO_DUPLICADO si el ID ya existe
+        """
+        try:
+            with self._transaccion():
+                self.conexion.execute("INSERT INTO usuarios (id_usuario, nombre) VALUES (?, ?)",
+                                      (usuario.id_usuario, usuario.nombre))
+        except sqlite3.IntegrityError:
+            return self._notificar(Resultado(Codigo.USUARIO_DUPLICADO,
+                                             f"❌ El ID de usuario {usuario.id_usuario} ya está registrado"))
+        return self._notificar(Resultado(Codigo.OK, f"✅ Usuario registrado: {usuario.nombre}"))
+
+    def registrar_usuarios_lote(self, usuarios):
+        """
+        Carga masiva de usuarios en una sola transacción, sin imprimir.
+        Los IDs repetidos se ignoran.
 
         Returns:
-            bool: True si se registró exitosamente, False si el ID ya existe
+            int: Cantidad de usuarios insertados
         """
-        if usuario.id_usuario not in self.ids_usuarios:
-            self.ids_usuarios.add(usuario.id_usuario)
-            self.usuarios_registrados[usuario.id_usuario] = usuario
-            print(f"✅ Usuario registrado: {usuario.nombre}")
-            return True
-        else:
-            print(f"❌ El ID de usuario {usuario.id_usuario} ya está registrado")
-            return False
+        with self._transaccion():
+            cursor = self.conexion.executemany(
+                "INSERT OR IGNORE INTO usuarios (id_usuario, nombre) VALUES (?, ?)",
+                ((usuario.id_usuario, usuario.nombre) for usuario in usuarios))
+        return cursor.rowcount
 
-    def dar_de_baja_usuario(self, id_usuario):
+    def _vencimientos_activos(self):
+        return dict(self.conexion.execute("SELECT isbn, vence FROM libros WHERE vence IS NOT NULL"))
+
+    @classmethod
+    def importar_snapshot(cls, ruta, registro=None, ruta_base="biblioteca.db"):
         """
-        Da de baja a un usuario de la biblioteca.
+        Crea una base SQLite a partir de una instantánea (de cualquier
+        biblioteca). Todo se inserta en una sola transacción; si la base de
+        destino ya contiene alguno de los libros o usuarios, no se importa nada.
 
         Args:
-            id_usuario (str): ID del usuario a dar de baja
+            ruta (str): Archivo generado por exportar_snapshot
+            registro: Destino de los mensajes (RegistroConsola por defecto)
+            ruta_base (str): Archivo de la base de datos de destino
 
         Returns:
-            bool: True si se dio de baja exitosamente, False si no existe o tiene libros prestados
+            BibliotecaSQLite: La biblioteca restaurada
         """
-        if id_usuario in self.ids_usuarios:
-            usuario = self.usuarios_registrados[id_usuario]
-            if len(usuario.libros_prestados) == 0:
-                self.ids_usuarios.remove(id_usuario)
-                del self.usuarios_registrados[id_usuario]
-                print(f"✅ Usuario dado de baja: {usuario.nombre}")
-                return True
-            else:
-                print(
-                    f"❌ No se puede dar de baja al usuario {usuario.nombre} porque tiene {len(usuario.libros_prestados)} libro(s) prestado(s)")
-                return False
-        else:
-            print(f"❌ No se encontró usuario con ID {id_usuario}")
-            return False
+        origen = Biblioteca.importar_snapshot(ruta, RegistroNulo())
+        try:
+            biblioteca = cls(ruta_base, origen.nombre, registro)
+            ejecutar_varios = biblioteca.conexion.executemany
+            with biblioteca._transaccion():
+                # Los registros crudos evitan materializar el catálogo perezoso
+                ejecutar_varios(
+                    "INSERT INTO libros (isbn, titulo, autor, categoria, titulo_min, autor_min, categoria_min) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cls._fila_desde_libro(Libro(*decodificar_campos(crudo), isbn))
+                     for isbn, crudo in origen.libros_disponibles.registros_crudos()))
+                ejecutar_varios("INSERT INTO usuarios (id_usuario, nombre) VALUES (?, ?)",
+                                ((u.id_usuario, u.nombre) for u in origen.usuarios_registrados.values()))
+                vencimientos = origen.vencimientos.como_dict()
+                ejecutar_varios("UPDATE libros SET id_usuario_prestado = ?, vence = ? WHERE isbn = ?",
+                                ((libro.usuario_prestado, vencimientos.get(libro.isbn), libro.isbn)
+                                 for u in origen.usuarios_registrados.values() for libro in u.libros_prestados))
+                ejecutar_varios("INSERT INTO historial (accion, libro, usuario, isbn, id_usuario) "
+                                "VALUES (:accion, :libro, :usuario, :isbn, :id_usuario)", origen.historial_prestamos)
+                ejecutar_varios("INSERT INTO reservas (isbn, id_usuario) VALUES (?, ?)",
+                                ((isbn, id_usuario) for isbn, cola in origen.reservas.items() for id_usuario in cola))
+                ejecutar_varios("INSERT INTO apartados (isbn, id_usuario, vence) VALUES (?, ?, ?)",
+                                ((isbn, id_usuario, vence) for isbn, (id_usuario, vence) in origen.apartados.items()))
+        finally:
+            origen.cerrar()
+        return biblioteca
+
+    def _todos_los_libros(self):
+        cursor = self.conexion.execute("SELECT titulo, autor, categoria, isbn, id_usuario_prestado FROM libros")
+        return (self._libro_desde_fila(fila) for fila in cursor)
+
+    def _nombre_usuario(self, id_usuario):
+        fila = self.conexion.execute("SELECT nombre FROM usuarios WHERE id_usuario = ?", (id_usuario,)).fetchone()
+        return fila[0] if fila else None
 
-    def prestar_libro(self, isbn, id_usuario):
+    def dar_de_baja_usuario(self, id_usuario):
         """
-        Presta un libro a un usuario.
-
-        Args:
-            isbn (str): ISBN del libro a prestar
-            id_usuario (str): ID del usuario que solicita el préstamo
+        Da de baja a un usuario de la biblioteca.
 
         Returns:
-            bool: True si el préstamo fue exitoso, False en caso contrario
+            Resultado: OK, USUARIO_CON_PRESTAMOS o USUARIO_NO_ENCONTRADO
         """
-        # Verificar que el libro existe y está disponible
-        if isbn not in self.libros_disponibles:
-            print(f"❌ No se encontró libro con ISBN {isbn}")
-            return False
+        with self._transaccion():
+            nombre = self._nombre_usuario(id_usuario)
+            if nombre is None:
+                return self._notificar(Resultado(Codigo.USUARIO_NO_ENCONTRADO,
+                                                 f"❌ No se encontró usuario con ID {id_usuario}"))
+            prestados = self.conexion.execute(
+                "SELECT COUNT(*) FROM libros WHERE id_usuario_prestado = ?", (id_usuario,)).fetchone()[0]
+            if prestados:
+                return self._notificar(Resultado(
+                    Codigo.USUARIO_CON_PRESTAMOS,
+                    f"❌ No se puede dar de baja al usuario {nombre} porque tiene {prestados} libro(s) prestado(s)"))
+            self.conexion.execute("DELETE FROM usuarios WHERE id_usuario = ?", (id_usuario,))
+            self._cancelar_reservas_usuario(id_usuario)
+        return self._notificar(Resultado(Codigo.OK, f"✅ Usuario dado de baja: {nombre}"))
+
+    def _cancelar_reservas_usuario(self, id_usuario):
+        self.conexion.execute("DELETE FROM reservas WHERE id_usuario = ?", (id_usuario,))
+        apartados = self.conexion.execute("SELECT isbn FROM apartados WHERE id_usuario = ?", (id_usuario,)).fetchall()
+        for (isbn,) in apartados:
+            self.conexion.execute("DELETE FROM apartados WHERE isbn = ?", (isbn,))
+            self._entregar_a_siguiente(isbn)
+
+    def reservar_libro(self, isbn, id_usuario):
+        with self._transaccion():
+            return super().reservar_libro(isbn, id_usuario)
+
+    def _encolar_reserva(self, isbn, id_usuario):
+        self.conexion.execute("INSERT INTO reservas (isbn, id_usuario) VALUES (?, ?)", (isbn, id_usuario))
+        return self.conexion.execute("SELECT COUNT(*) FROM reservas WHERE isbn = ?", (isbn,)).fetchone()[0]
+
+    def _entregar_a_siguiente(self, isbn):
+        # Las bajas borran sus reservas, así que el primero de la lista siempre está registrado
+        fila = self.conexion.execute(
+            "SELECT id, id_usuario FROM reservas WHERE isbn = ? ORDER BY id LIMIT 1", (isbn,)).fetchone()
+        if fila is None:
+            return None
+        self.conexion.execute("DELETE FROM reservas WHERE id = ?", (fila[0],))
+        self.conexion.execute("INSERT OR REPLACE INTO apartados (isbn, id_usuario, vence) VALUES (?, ?, ?)",
+                              (isbn, fila[1], self.reloj() + self.DURACION_APARTADO))
+        return fila[1]
+
+    def procesar_apartados_vencidos(self):
+        with self._transaccion():
+            vencidos = self.conexion.execute(
+                "SELECT isbn, id_usuario FROM apartados WHERE vence <= ? ORDER BY vence", (self.reloj(),)).fetchall()
+            for isbn, _ in vencidos:
+                self.conexion.execute("DELETE FROM apartados WHERE isbn = ?", (isbn,))
+                self._entregar_a_siguiente(isbn)
+        return vencidos
+
+    def _validar_prestamo(self, isbn, id_usuario, prestados_lote=()):
+        libro = self.obtener_libro(isbn)
+        if libro is None:
+            return Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}")
+        if libro.prestado or isbn in prestados_lote:
+            return Resultado(Codigo.LIBRO_PRESTADO, f"❌ El libro '{libro.titulo}' ya está prestado")
+        apartado = self.apartados.get(isbn)
+        if apartado and apartado[0] != id_usuario and apartado[1] > self.reloj():
+            return Resultado(Codigo.LIBRO_APARTADO, f"❌ El libro '{libro.titulo}' está apartado para otro usuario")
+        if self._nombre_usuario(id_usuario) is None:
+            return Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}")
+        return None
+
+    def _validar_devolucion(self, isbn, id_usuario, devueltos_lote=()):
+        libro = self.obtener_libro(isbn)
+        if libro is None:
+            return Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}")
+        if not libro.prestado or libro.usuario_prestado != id_usuario or isbn in devueltos_lote:
+            return Resultado(Codigo.LIBRO_NO_PRESTADO_AL_USUARIO,
+                             f"❌ El libro '{libro.titulo}' no está prestado a este usuario")
+        if self._nombre_usuario(id_usuario) is None:
+            return Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}")
+        return None
+
+    def _aplicar_prestamo(self, isbn, id_usuario):
+        vence = self.reloj() + self.DURACION_PRESTAMO
+        self.conexion.execute("UPDATE libros SET id_usuario_prestado = ?, vence = ? WHERE isbn = ?",
+                              (id_usuario, vence, isbn))
+        self.conexion.execute("DELETE FROM apartados WHERE isbn = ?", (isbn,))
+        return {
+            'accion': 'prestamo',
+            'libro': self.obtener_libro(isbn).titulo,
+            'usuario': self._nombre_usuario(id_usuario),
+            'isbn': isbn,
+            'id_usuario': id_usuario,
+            'vence': vence
+        }
+
+    def _aplicar_devolucion(self, isbn, id_usuario):
+        self.conexion.execute("UPDATE libros SET id_usuario_prestado = NULL, vence = NULL WHERE isbn = ?", (isbn,))
+        self._entregar_a_siguiente(isbn)
+        return {
+            'accion': 'devolucion',
+            'libro': self.obtener_libro(isbn).titulo,
+            'usuario': self._nombre_usuario(id_usuario),
+            'isbn': isbn,
+            'id_usuario': id_usuario
+        }
 
-        libro = self.libros_disponibles[isbn]
-        if libro.prestado:
-            print(f"❌ El libro '{libro.titulo}' ya está prestado")
-            return False
+    def _registrar_historial(self, registros):
+        self.conexion.executemany(
+            "INSERT INTO historial (accion, libro, usuario, isbn, id_usuario) "
+            "VALUES (:accion, :libro, :usuario, :isbn, :id_usuario)", registros)
+        self._alimentar_recomendador(registros)
 
-        # Verificar que el usuario existe
-        if id_usuario not in self.ids_usuarios:
-            print(f"❌ No se encontró usuario con ID {id_usuario}")
-            return False
+    # Cada operación se ejecuta en una transacción: validación, cambio e
+    # historial se confirman juntos; un lote completo usa una sola confirmación.
+    def prestar_libro(self, isbn, id_usuario):
+        with self._transaccion():
+            return super().prestar_libro(isbn, id_usuario)
 
-        usuario = self.usuarios_registrados[id_usuario]
+    def devolver_libro(self, isbn, id_usuario):
+        with self._transaccion():
+            return super().devolver_libro(isbn, id_usuario)
 
-        # Realizar el préstamo
-        libro.prestado = True
-        libro.usuario_prestado = id_usuario
-        usuario.tomar_prestado(libro)
+    def prestar_lote(self, prestamos, atomico=False):
+        with self._transaccion():
+            return super().prestar_lote(prestamos, atomico)
 
-        # Registrar en historial
-        self.historial_prestamos.append({
-            'accion': 'prestamo',
-            'libro': libro.titulo,
-            'usuario': usuario.nombre,
-            'isbn': isbn,
-            'id_usuario': id_usuario
-        })
+    def devolver_lote(self, devoluciones, atomico=False):
+        with self._transaccion():
+            return super().devolver_lote(devoluciones, atomico)
 
-        print(f"✅ Libro '{libro.titulo}' prestado a {usuario.nombre}")
-        return True
+    def _prestamos_historicos(self):
+        return ((r['id_usuario'], r['isbn']) for r in self.historial_prestamos.registros('prestamo'))
 
-    def devolver_libro(self, isbn, id_usuario):
+    def buscar_libros(self, criterio, valor, exacto=False):
         """
-        Procesa la devolución de un libro.
+        Busca libros por título, autor o categoría (sin distinguir mayúsculas).
 
         Args:
-            isbn (str): ISBN del libro a devolver
-            id_usuario (str): ID del usuario que devuelve el libro
+            criterio (str): 'titulo', 'autor' o 'categoria'
+            valor (str): Valor a buscar
+            exacto (bool): Si es True busca coincidencia completa usando el índice;
+                           si es False busca el valor como subcadena
 
         Returns:
-            bool: True si la devolución fue exitosa, False en caso contrario
+            list: Lista de libros que coinciden con la búsqueda
         """
-        # Verificar que el libro existe
-        if isbn not in self.libros_disponibles:
-            print(f"❌ No se encontró libro con ISBN {isbn}")
-            return False
-
-        libro = self.libros_disponibles[isbn]
+        columna = self.COLUMNAS_BUSQUEDA.get(criterio)
+        if columna is None:
+            return []
+        condicion = f"{columna} = ?" if exacto else f"instr({columna}, ?) > 0"
+        cursor = self.conexion.execute(
+            f"SELECT titulo, autor, categoria, isbn, id_usuario_prestado FROM libros WHERE {condicion}",
+            (valor.lower(),))
+        return [self._libro_desde_fila(fila) for fila in cursor]
 
-        # Verificar que el libro está prestado al usuario correcto
-        if not libro.prestado or libro.usuario_prestado != id_usuario:
-            print(f"❌ El libro '{libro.titulo}' no está prestado a este usuario")
-            return False
+    def listar_libros_prestados_usuario(self, id_usuario):
+        """
+        Lista todos los libros prestados a un usuario específico.
 
-        # Verificar que el usuario existe
-        if id_usuario not in self.ids_usuarios:
-            print(f"❌ No se encontró usuario con ID {id_usuario}")
-            return False
+        Returns:
+            list: Lista de libros prestados al usuario
+        """
+        if self._nombre_usuario(id_usuario) is None:
+            self._notificar(Resultado(Codigo.USUARIO_NO_ENCONTRADO, f"❌ No se encontró usuario con ID {id_usuario}"))
+            return []
+        return self._libros_prestados_a(id_usuario)
 
-        usuario = self.usuarios_registrados[id_usuario]
+    def _libros_prestados_a(self, id_usuario):
+        cursor = self.conexion.execute(
+            "SELECT titulo, autor, categoria, isbn, id_usuario_prestado FROM libros WHERE id_usuario_prestado = ?",
+            (id_usuario,))
+        return [self._libro_desde_fila(fila) for fila in cursor]
 
-        # Procesar devolución
-        libro.prestado = False
-        libro.usuario_prestado = None
-        usuario.devolver_libro(libro)
+    def _prestamos_entre(self, condicion, parametros):
+        cursor = self.conexion.execute(
+            "SELECT titulo, autor, categoria, isbn, id_usuario_prestado, vence FROM libros "
+            f"WHERE vence IS NOT NULL AND {condicion} ORDER BY vence", parametros)
+        return [(self._libro_desde_fila(fila), fila[5]) for fila in cursor]
 
-        # Registrar en historial
-        self.historial_prestamos.append({
-            'accion': 'devolucion',
-            'libro': libro.titulo,
-            'usuario': usuario.nombre,
-            'isbn': isbn,
-            'id_usuario': id_usuario
-        })
+    def prestamos_vencidos(self):
+        return self._prestamos_entre("vence < ?", (self.reloj(),))
 
-        print(f"✅ Libro '{libro.titulo}' devuelto por {usuario.nombre}")
-        return True
+    def prestamos_por_vencer(self, horas=24):
+        ahora = self.reloj()
+        return self._prestamos_entre("vence >= ? AND vence < ?", (ahora, ahora + horas * 3600))
 
-    def buscar_libros(self, criterio, valor):
+    def obtener_estadisticas(self):
         """
-        Busca libros por título, autor o categoría.
-
-        Args:
-            criterio (str): 'titulo', 'autor' o 'categoria'
-            valor (str): Valor a buscar
+        Calcula las estadísticas generales de la biblioteca sin imprimir.
 
         Returns:
-            list: Lista de libros que coinciden con la búsqueda
+            dict: Totales de libros, préstamos, usuarios e historial
         """
-        resultados = []
-        valor_lower = valor.lower()
+        consulta = self.conexion.execute
+        total_libros = consulta("SELECT COUNT(*) FROM libros").fetchone()[0]
+        libros_prestados = consulta("SELECT COUNT(*) FROM libros WHERE id_usuario_prestado IS NOT NULL").fetchone()[0]
+        return {
+            'total_libros': total_libros,
+            'libros_disponibles': total_libros - libros_prestados,
+            'libros_prestados': libros_prestados,
+            'usuarios_registrados': consulta("SELECT COUNT(*) FROM usuarios").fetchone()[0],
+            'transacciones_historial': consulta("SELECT COUNT(*) FROM historial").fetchone()[0]
+        }
+
+
+class ServidorBiblioteca:
+    """
+    Servidor asyncio que atiende solicitudes JSON, una por línea, sobre TCP
+    o un socket Unix, para que muchos clientes consulten una misma biblioteca.
+
+    Solicitud: {"id": 1, "metodo": "prestar", "params": {"isbn": "...", "id_usuario": "..."}}
+    Respuesta: {"id": 1, "ok": true, "codigo": "ok", "mensaje": "...", "datos": {...}}
+
+    Métodos: buscar, libro, prestar, devolver y estadisticas. Un cliente
+    puede enviar varias solicitudes sin esperar las respuestas (pipelining);
+    se atienden y responden en el orden de llegada. Las llamadas a la
+    biblioteca se ejecutan en un único hilo de trabajo: el bucle de eventos
+    sigue aceptando y leyendo conexiones durante una búsqueda lenta, y la
+    biblioteca no necesita candados porque nunca recibe dos llamadas a la vez.
+    """
 
-        for libro in self.libros_disponibles.values():
-            if criterio == 'titulo' and valor_lower in libro.titulo.lower():
-                resultados.append(libro)
-            elif criterio == 'autor' and valor_lower in libro.autor.lower():
-                resultados.append(libro)
-            elif criterio == 'categoria' and valor_lower in libro.categoria.lower():
-                resultados.append(libro)
+    def __init__(self, biblioteca):
+        """
+        Args:
+            biblioteca (Biblioteca): Biblioteca a la que se envían las solicitudes
+        """
+        self.biblioteca = biblioteca
+        self._servidor = None
+        self._ruta_unix = None
+        self._ejecutor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="biblioteca")
+        self._metodos = {
+            'buscar': self._buscar,
+            'libro': self._libro,
+            'prestar': biblioteca.prestar_libro,
+            'devolver': biblioteca.devolver_libro,
+            'estadisticas': self._estadisticas,
+        }
+
+    async def iniciar(self, host="127.0.0.1", puerto=0, ruta_unix=None):
+        """
+        Abre el socket y empieza a aceptar conexiones.
 
-        return resultados
+        Args:
+            host (str): Dirección en la que escuchar (TCP)
+            puerto (int): Puerto TCP (0 elige uno libre)
+            ruta_unix (str): Ruta de un socket Unix; si se indica, se usa en lugar de TCP
 
-    def listar_libros_prestados_usuario(self, id_usuario):
+        Returns:
+            tuple | str: (host, puerto) en el que se escucha, o la ruta del socket Unix
         """
-        Lista todos los libros prestados a un usuario específico.
+        if ruta_unix is not None:
+            # Un socket que quedó de una ejecución anterior impediría escuchar en la ruta
+            with contextlib.suppress(FileNotFoundError):
+                if stat.S_ISSOCK(os.stat(ruta_unix).st_mode):
+                    os.unlink(ruta_unix)
+            self._servidor = await asyncio.start_unix_server(self._atender, path=ruta_unix)
+            self._ruta_unix = ruta_unix
+            return ruta_unix
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def servir(self):
+        """Atiende conexiones hasta que se cancele la tarea."""
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            self._liberar()
+
+    async def cerrar(self):
+        """Deja de aceptar conexiones."""
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        self._liberar()
+
+    def _liberar(self):
+        """Borra el archivo del socket Unix y detiene el hilo de trabajo."""
+        if self._ruta_unix is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._ruta_unix)
+            self._ruta_unix = None
+        self._ejecutor.shutdown(wait=False)
+
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # Línea más larga que el límite del lector: no se puede seguir el flujo
+                    escritor.write(self._respuesta(None, Resultado(Codigo.SOLICITUD_INVALIDA,
+                                                                   "❌ Solicitud demasiado larga")))
+                    break
+                if not linea:
+                    break
+                respuesta = await asyncio.get_running_loop().run_in_executor(self._ejecutor, self.procesar_linea, linea)
+                escritor.write(respuesta)
+                # drain solo espera si el cliente no está leyendo sus respuestas
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    def procesar_linea(self, linea):
+        """
+        Ejecuta una solicitud.
 
         Args:
-            id_usuario (str): ID del usuario
+            linea (bytes): Solicitud JSON
 
         Returns:
-            list: Lista de libros prestados al usuario
+            bytes: Respuesta JSON terminada en salto de línea
         """
-        if id_usuario not in self.ids_usuarios:
-            print(f"❌ No se encontró usuario con ID {id_usuario}")
-            return []
-
-        usuario = self.usuarios_registrados[id_usuario]
-        return usuario.libros_prestados.copy()
+        id_solicitud = None
+        try:
+            solicitud = json.loads(linea)
+            id_solicitud = solicitud.get('id')
+            metodo = self._metodos.get(solicitud.get('metodo'))
+            if metodo is None:
+                return self._respuesta(id_solicitud, Resultado(
+                    Codigo.SOLICITUD_INVALIDA, f"❌ Método desconocido: {solicitud.get('metodo')}"))
+            resultado = metodo(**solicitud.get('params', {}))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            resultado = Resultado(Codigo.SOLICITUD_INVALIDA, f"❌ Solicitud inválida: {e!r}")
+        except Exception as e:
+            # Un fallo de la biblioteca se informa al cliente sin cerrar su conexión
+            resultado = Resultado(Codigo.ERROR_INTERNO, f"❌ Error interno: {e!r}")
+        return self._respuesta(id_solicitud, resultado)
+
+    @staticmethod
+    def _respuesta(id_solicitud, resultado):
+        return (json.dumps({'id': id_solicitud, **resultado.como_dict()}, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _libro_como_dict(libro):
+        return {'isbn': libro.isbn, 'titulo': libro.titulo, 'autor': libro.autor,
+                'categoria': libro.categoria, 'prestado': libro.prestado}
+
+    def _buscar(self, valor, criterio="titulo", difuso=False, k=20):
+        if difuso:
+            libros = self.biblioteca.buscar_libros_difuso(valor, criterio, k)
+        else:
+            libros = self.biblioteca.buscar_libros(criterio, valor)[:k]
+        return Resultado(Codigo.OK, f"🔍 {len(libros)} libro(s) encontrado(s)",
+                         {'libros': [self._libro_como_dict(libro) for libro in libros]})
 
-    def mostrar_estadisticas(self):
-        """Muestra estadísticas generales de la biblioteca."""
-        total_libros = len(self.libros_disponibles)
-        libros_prestados = sum(1 for libro in self.libros_disponibles.values() if libro.prestado)
-        libros_disponibles = total_libros - libros_prestados
-        total_usuarios = len(self.usuarios_registrados)
+    def _libro(self, isbn):
+        libro = self.biblioteca.obtener_libro(isbn)
+        if libro is None:
+            return Resultado(Codigo.LIBRO_NO_ENCONTRADO, f"❌ No se encontró libro con ISBN {isbn}")
+        return Resultado(Codigo.OK, f"📖 {libro}", self._libro_como_dict(libro))
 
-        print(f"\n📊 Estadísticas de {self.nombre}:")
-        print(f"   📚 Total de libros: {total_libros}")
-        print(f"   ✅ Libros disponibles: {libros_disponibles}")
-        print(f"   📖 Libros prestados: {libros_prestados}")
-        print(f"   👥 Usuarios registrados: {total_usuarios}")
-        print(f"   📜 Transacciones en historial: {len(self.historial_prestamos)}")
+    def _estadisticas(self):
+        return Resultado(Codigo.OK, "📊 Estadísticas de la biblioteca", self.biblioteca.obtener_estadisticas())
 
 
 def pausar():
@@ -477,6 +2656,10 @@ def demo_biblioteca():
     print(f"\n❌ INTENTANDO PRÉSTAMO DE LIBRO YA PRESTADO:")
     biblioteca.prestar_libro("978-8420651234", "USR003")  # Ya prestado a María
 
+    # En lugar de insistir, Ana se anota en la lista de espera
+    print(f"\n📌 RESERVANDO LIBRO PRESTADO:")
+    biblioteca.reservar_libro("978-8420651234", "USR003")
+
     # Buscar libros
     print(f"\n🔍 BÚSQUEDA DE LIBROS:")
 
@@ -534,6 +2717,17 @@ def demo_biblioteca():
     print(f"\n➖ DANDO DE BAJA USUARIO:")
     biblioteca.dar_de_baja_usuario("USR001")  # Ahora sí se puede dar de baja
 
+    # Recomendaciones a partir del historial de préstamos
+    print("\n💡 QUIENES LEYERON 'Fábulas de Esopo' TAMBIÉN SUELEN LEER (según sus préstamos recientes):")
+    for libro in biblioteca.recomendar_libros("978-8420651234"):
+        print(f"   - {libro.titulo} por {libro.autor}")
+
+    # Reporte de vencimientos, simulando que pasaron 15 días
+    print(f"\n📅 REPORTE DE VENCIMIENTOS (simulando 15 días después):")
+    biblioteca.reloj = lambda: time.time() + 15 * 24 * 3600
+    biblioteca.mostrar_reporte_vencimientos()
+    biblioteca.reloj = time.time
+
     # Estadísticas finales
     biblioteca.mostrar_estadisticas()
 
@@ -541,6 +2735,615 @@ def demo_biblioteca():
     pausar()
 
 
+def crear_biblioteca_sintetica(num_libros, num_usuarios, registro=None, clase=Biblioteca, **opciones):
+    """
+    Crea una biblioteca con datos generados para pruebas de rendimiento.
+
+    Args:
+        num_libros (int): Cantidad de libros a generar
+        num_usuarios (int): Cantidad de usuarios a generar
+        registro: Registro de mensajes de la biblioteca (consola por defecto)
+        clase (type): Biblioteca o una de sus subclases
+        **opciones: Argumentos adicionales del constructor (por ejemplo ruta en BibliotecaSQLite)
+
+    Returns:
+        Biblioteca: Biblioteca poblada sin mensajes en consola
+    """
+    biblioteca = clase(nombre="Biblioteca Sintética", registro=registro, **opciones)
+    libros = (Libro(f"Libro {i}", f"Autor {i % 997}", f"Categoría {i % 31}", f"978-{i:010d}")
+              for i in range(num_libros))
+    usuarios = (Usuario(f"Usuario {i}", f"USR{i:06d}") for i in range(num_usuarios))
+    if isinstance(biblioteca, BibliotecaSQLite):
+        biblioteca.añadir_libros_lote(libros)
+        biblioteca.registrar_usuarios_lote(usuarios)
+        return biblioteca
+    for libro in libros:
+        biblioteca.libros_disponibles[libro.isbn] = libro
+    for usuario in usuarios:
+        biblioteca.ids_usuarios.add(usuario.id_usuario)
+        biblioteca.usuarios_registrados[usuario.id_usuario] = usuario
+    return biblioteca
+
+
+# Sílabas y nombres para generar títulos y autores sintéticos con acentos
+SILABAS_SINTETICAS = ["ga", "brí", "el", "mar", "quez", "cí", "ló", "pe", "ra", "sa", "to", "ña", "mi", "gu",
+                      "fer", "nán", "dez", "ro", "dri", "go", "val", "le", "jo", "sé", "ma", "ría", "car", "los",
+                      "an", "tó", "nio", "lu", "is", "ber", "ta", "vi", "cen", "te", "sol", "ar"]
+NOMBRES_SINTETICOS = ["Gabriel", "María", "José", "Ana", "Julio", "Isabel", "Mario", "Lucía", "Andrés", "Sofía",
+                      "Tomás", "Elena", "Ramón", "Inés", "Óscar", "Raúl", "Rocío", "Martín", "Jesús", "Nuria"]
+
+
+def generar_catalogo_sintetico(num_libros, semilla=0):
+    """
+    Genera libros con títulos de tres palabras y autores con nombre y dos
+    apellidos, formados por sílabas al azar (incluyendo acentos).
+
+    Args:
+        num_libros (int): Cantidad de libros
+        semilla (int): Semilla del generador aleatorio
+
+    Returns:
+        list: Libros generados, con ISBN 978-0000000000, 978-0000000001, ...
+    """
+    azar = random.Random(semilla)
+    vocabulario = sorted({"".join(azar.choice(SILABAS_SINTETICAS) for _ in range(azar.randint(2, 3)))
+                          for _ in range(40000)})
+    apellidos = [palabra.capitalize() for palabra in azar.sample(vocabulario, 2000)]
+    autores = [f"{azar.choice(NOMBRES_SINTETICOS)} {azar.choice(apellidos)} {azar.choice(apellidos)}"
+               for _ in range(max(1, num_libros // 50))]
+    libros = []
+    for i in range(num_libros):
+        titulo = " ".join(azar.choice(vocabulario) for _ in range(3)).capitalize()
+        libros.append(Libro(titulo, azar.choice(autores), f"Categoría {i % 31}", f"978-{i:010d}"))
+    return libros
+
+
+def benchmark_lotes(num_prestamos=50000, num_usuarios=5000):
+    """
+    Compara el rendimiento de préstamos/devoluciones uno a uno frente a lotes.
+    La ruta individual escribe sus mensajes en os.devnull para medir el costo
+    real de la impresión sin inundar la terminal.
+    """
+    operaciones = [(f"978-{i:010d}", f"USR{i % num_usuarios:06d}") for i in range(num_prestamos)]
+
+    print(f"\n⏱️ BENCHMARK DE LOTES ({num_prestamos} préstamos, {num_usuarios} usuarios)")
+    for nombre, prestar, devolver in (
+            ("Llamadas individuales",
+             lambda b: [b.prestar_libro(isbn, id_usuario) for isbn, id_usuario in operaciones],
+             lambda b: [b.devolver_libro(isbn, id_usuario) for isbn, id_usuario in operaciones]),
+            ("Lotes",
+             lambda b: b.prestar_lote(operaciones),
+             lambda b: b.devolver_lote(operaciones))):
+        biblioteca = crear_biblioteca_sintetica(num_prestamos, num_usuarios)
+        with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            prestar(biblioteca)
+            t_prestamos = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            devolver(biblioteca)
+            t_devoluciones = time.perf_counter() - inicio
+        print(f"   {nombre:<22} préstamos: {num_prestamos / t_prestamos:>12,.0f}/s"
+              f"   devoluciones: {num_prestamos / t_devoluciones:>12,.0f}/s")
+
+
+def benchmark_registro(num_operaciones=20000):
+    """
+    Mide el costo por operación (préstamo + devolución) con cada tipo de registro.
+    Los registros que escriben lo hacen en os.devnull, por lo que el costo de
+    la consola aquí es una cota inferior del costo real en una terminal o tubería.
+    """
+    operaciones = [(f"978-{i:010d}", f"USR{i % 1000:06d}") for i in range(num_operaciones)]
+
+    print(f"\n⏱️ BENCHMARK DE REGISTRO ({num_operaciones} préstamos y devoluciones)")
+    with open(os.devnull, "w", encoding="utf-8") as nulo:
+        for nombre, registro in (("Consola", RegistroConsola(nulo)),
+                                 ("Buffer", RegistroBuffer(nulo)),
+                                 ("Asíncrono", RegistroAsincrono(nulo)),
+                                 ("Silencioso", RegistroNulo())):
+            biblioteca = crear_biblioteca_sintetica(num_operaciones, 1000, registro)
+            inicio = time.perf_counter()
+            for isbn, id_usuario in operaciones:
+                biblioteca.prestar_libro(isbn, id_usuario)
+            for isbn, id_usuario in operaciones:
+                biblioteca.devolver_libro(isbn, id_usuario)
+            registro.cerrar()
+            transcurrido = time.perf_counter() - inicio
+            print(f"   {nombre:<12} {transcurrido / (2 * num_operaciones) * 1e6:>8.2f} µs/operación")
+
+
+def benchmark_sqlite(num_libros=200000, num_usuarios=5000):
+    """
+    Compara la biblioteca en memoria con BibliotecaSQLite en carga masiva,
+    préstamos en lote, búsquedas y estadísticas.
+    """
+    libros = [Libro(f"Libro {i}", f"Autor {i % 997}", f"Categoría {i % 31}", f"978-{i:010d}")
+              for i in range(num_libros)]
+    usuarios = [Usuario(f"Usuario {i}", f"USR{i:06d}") for i in range(num_usuarios)]
+    prestamos = [(f"978-{i:010d}", f"USR{i % num_usuarios:06d}") for i in range(0, num_libros, 4)]
+
+    def cronometrar(funcion):
+        inicio = time.perf_counter()
+        funcion()
+        return time.perf_counter() - inicio
+
+    print(f"\n⏱️ BENCHMARK SQLITE ({num_libros} libros, {len(prestamos)} préstamos)")
+    with tempfile.TemporaryDirectory() as directorio:
+        memoria = Biblioteca("Memoria", RegistroNulo())
+        disco = BibliotecaSQLite(os.path.join(directorio, "biblioteca.db"), "SQLite", RegistroNulo())
+        casos = (
+            ("Carga de libros",
+             lambda: [memoria.añadir_libro(libro) for libro in libros],
+             lambda: disco.añadir_libros_lote(libros)),
+            ("Registro de usuarios",
+             lambda: [memoria.registrar_usuario(usuario) for usuario in usuarios],
+             lambda: disco.registrar_usuarios_lote(usuarios)),
+            ("Préstamos en lote",
+             lambda: memoria.prestar_lote(prestamos),
+             lambda: disco.prestar_lote(prestamos)),
+            ("100 préstamos individuales",
+             lambda: [memoria.prestar_libro(f"978-{i:010d}", "USR000000") for i in range(1, 400, 4)],
+             lambda: [disco.prestar_libro(f"978-{i:010d}", "USR000000") for i in range(1, 400, 4)]),
+            ("Búsqueda por autor (subcadena)",
+             lambda: memoria.buscar_libros("autor", "Autor 42"),
+             lambda: disco.buscar_libros("autor", "Autor 42")),
+            ("Búsqueda por autor (exacta)",
+             lambda: [libro for libro in memoria.libros_disponibles.values() if libro.autor.lower() == "autor 42"],
+             lambda: disco.buscar_libros("autor", "Autor 42", exacto=True)),
+            ("Libros prestados a un usuario",
+             lambda: memoria.listar_libros_prestados_usuario("USR000042"),
+             lambda: disco.listar_libros_prestados_usuario("USR000042")),
+            ("Estadísticas",
+             memoria.obtener_estadisticas,
+             disco.obtener_estadisticas),
+        )
+        print(f"   {'Operación':<32} {'Memoria':>10} {'SQLite':>10}")
+        for nombre, en_memoria, en_disco in casos:
+            print(f"   {nombre:<32} {cronometrar(en_memoria) * 1000:>8.1f}ms {cronometrar(en_disco) * 1000:>8.1f}ms")
+        disco.cerrar()
+
+
+def verificar_invariantes(biblioteca):
+    """
+    Comprueba la consistencia entre libros, usuarios e historial.
+
+    Returns:
+        list: Descripción de cada invariante violado (vacía si todo es correcto)
+    """
+    errores = []
+    prestados = 0
+    for libro in biblioteca.libros_disponibles.values():
+        if libro.prestado != (libro.usuario_prestado is not None):
+            errores.append(f"{libro.isbn}: estado prestado inconsistente")
+        elif libro.prestado:
+            prestados += 1
+            usuario = biblioteca.usuarios_registrados[libro.usuario_prestado]
+            # Se compara por ISBN: BibliotecaSQLite crea un Libro nuevo en cada consulta
+            if [prestado.isbn for prestado in usuario.libros_prestados].count(libro.isbn) != 1:
+                errores.append(f"{libro.isbn}: no figura exactamente una vez en {usuario.id_usuario}")
+    en_usuarios = sum(len(usuario.libros_prestados) for usuario in biblioteca.usuarios_registrados.values())
+    if en_usuarios != prestados:
+        errores.append(f"{en_usuarios} libros en usuarios, pero {prestados} marcados como prestados")
+
+    # En el historial cada ISBN debe alternar préstamo y devolución
+    ultima_accion = {}
+    for registro in biblioteca.historial_prestamos:
+        anterior = ultima_accion.get(registro['isbn'], 'devolucion')
+        if anterior == registro['accion']:
+            errores.append(f"{registro['isbn']}: '{registro['accion']}' repetido en el historial")
+        ultima_accion[registro['isbn']] = registro['accion']
+    return errores
+
+
+def prueba_estres_concurrente(hilos=(1, 2, 4, 8, 16), operaciones_por_hilo=20000,
+                              num_libros=2000, num_usuarios=500):
+    """
+    Prueba de estrés de BibliotecaConcurrente: varios hilos prestan y devuelven
+    libros al azar sobre la misma instancia, se verifican los invariantes y se
+    reportan los préstamos por segundo según la cantidad de hilos.
+    Con el GIL de CPython el rendimiento total no crece con los hilos; la
+    prueba muestra sobre todo que el bloqueo por franjas no lo degrada.
+    """
+    print(f"\n⏱️ PRUEBA DE ESTRÉS CONCURRENTE ({operaciones_por_hilo} intentos por hilo, "
+          f"{num_libros} libros, {num_usuarios} usuarios)")
+    for num_hilos in hilos:
+        biblioteca = crear_biblioteca_sintetica(num_libros, num_usuarios, RegistroNulo(), BibliotecaConcurrente)
+        isbns = list(biblioteca.libros_disponibles)
+        ids = list(biblioteca.ids_usuarios)
+        prestamos_exitosos = [0] * num_hilos
+
+        def trabajar(indice):
+            azar = random.Random(indice)
+            mios = []
+            for _ in range(operaciones_por_hilo):
+                if mios and azar.random() < 0.5:
+                    isbn, id_usuario = mios.pop(azar.randrange(len(mios)))
+                    biblioteca.devolver_libro(isbn, id_usuario)
+                else:
+                    isbn, id_usuario = azar.choice(isbns), azar.choice(ids)
+                    if biblioteca.prestar_libro(isbn, id_usuario):
+                        prestamos_exitosos[indice] += 1
+                        mios.append((isbn, id_usuario))
+
+        trabajadores = [threading.Thread(target=trabajar, args=(i,)) for i in range(num_hilos)]
+        inicio = time.perf_counter()
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+        transcurrido = time.perf_counter() - inicio
+
+        errores = verificar_invariantes(biblioteca)
+        prestamos_historial = sum(1 for r in biblioteca.historial_prestamos if r['accion'] == 'prestamo')
+        if prestamos_historial != sum(prestamos_exitosos):
+            errores.append("el historial no coincide con los préstamos exitosos")
+        estado = "✅ invariantes correctos" if not errores else f"❌ {len(errores)} violaciones: {errores[:3]}"
+        print(f"   {num_hilos:>3} hilos: {sum(prestamos_exitosos) / transcurrido:>10,.0f} préstamos/s   {estado}")
+
+
+def benchmark_busqueda_difusa(tamaños=(100000, 1000000), num_consultas=200, k=10):
+    """
+    Mide construcción del índice, latencia y exhaustividad (recall@k) de la
+    búsqueda difusa. Cada consulta es el título de un libro al azar, sin
+    acentos y con una letra cambiada; acierta si el libro está entre los k
+    primeros resultados.
+    """
+    print(f"\n⏱️ BENCHMARK BÚSQUEDA DIFUSA ({num_consultas} consultas con errores, top-{k})")
+    for num_libros in tamaños:
+        biblioteca = Biblioteca("Difusa", RegistroNulo())
+        for libro in generar_catalogo_sintetico(num_libros):
+            biblioteca.libros_disponibles[libro.isbn] = libro
+
+        inicio = time.perf_counter()
+        biblioteca.buscar_libros_difuso("")
+        construccion = time.perf_counter() - inicio
+
+        azar = random.Random(1)
+        libros = list(biblioteca.libros_disponibles.values())
+        latencias = []
+        aciertos = 0
+        for _ in range(num_consultas):
+            objetivo = azar.choice(libros)
+            palabras = normalizar_texto(objetivo.titulo).split()
+            posicion = azar.randrange(len(palabras))
+            palabra = palabras[posicion]
+            if len(palabra) > 4:
+                letra = azar.randrange(len(palabra))
+                palabras[posicion] = palabra[:letra] + azar.choice("aeiourst") + palabra[letra + 1:]
+            inicio = time.perf_counter()
+            resultados = biblioteca.buscar_libros_difuso(" ".join(palabras), "titulo", k)
+            latencias.append(time.perf_counter() - inicio)
+            aciertos += objetivo in resultados
+
+        latencias.sort()
+        print(f"   {num_libros:>9,} libros: índice {construccion:6.2f}s   recall@{k} {aciertos / num_consultas:6.1%}   "
+              f"latencia p50 {latencias[len(latencias) // 2] * 1000:6.2f}ms   "
+              f"p95 {latencias[int(len(latencias) * 0.95)] * 1000:6.2f}ms")
+
+
+def benchmark_snapshot(num_libros=1000000, num_usuarios=10000, cada_cuantos_prestado=100):
+    """
+    Mide exportación e importación perezosa de una instantánea y el tiempo
+    hasta poder responder las primeras consultas. Los libros prestados se
+    materializan al importar (los usuarios los referencian), por lo que el
+    tiempo de importación crece con la cantidad de préstamos activos.
+    """
+    print(f"\n⏱️ BENCHMARK INSTANTÁNEAS ({num_libros:,} libros, {num_usuarios:,} usuarios)")
+    biblioteca = crear_biblioteca_sintetica(0, num_usuarios, RegistroNulo())
+    for libro in generar_catalogo_sintetico(num_libros):
+        biblioteca.libros_disponibles[libro.isbn] = libro
+    biblioteca.prestar_lote((f"978-{i:010d}", f"USR{i % num_usuarios:06d}")
+                            for i in range(0, num_libros, cada_cuantos_prestado))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "biblioteca.snapshot")
+        inicio = time.perf_counter()
+        biblioteca.exportar_snapshot(ruta)
+        print(f"   Exportación:        {time.perf_counter() - inicio:8.3f}s   "
+              f"({os.path.getsize(ruta) / 2 ** 20:,.1f} MiB)")
+
+        inicio = time.perf_counter()
+        restaurada = Biblioteca.importar_snapshot(ruta, RegistroNulo())
+        importacion = time.perf_counter() - inicio
+        print(f"   Importación:        {importacion:8.3f}s   "
+              f"({restaurada.libros_disponibles.cantidad_cargados:,} libros materializados)")
+
+        inicio = time.perf_counter()
+        libro = restaurada.obtener_libro(f"978-{num_libros // 2 + 1:010d}")
+        restaurada.prestar_libro(libro.isbn, "USR000000")
+        restaurada.obtener_estadisticas()
+        print(f"   Primeras consultas: {time.perf_counter() - inicio:8.3f}s   "
+              f"(listo para consultar en {importacion + time.perf_counter() - inicio:.3f}s)")
+        # Libera el archivo mapeado antes de borrar el directorio temporal
+        restaurada.cerrar()
+
+
+class LibroConDiccionario:
+    """
+    Disposición anterior de Libro, conservada solo para comparar memoria:
+    atributos en un __dict__ por instancia, autor y título en una tupla y
+    cadenas sin compartir.
+    """
+
+    def __init__(self, titulo, autor, categoria, isbn):
+        self._autor_titulo = (autor, titulo)
+        self.categoria = categoria
+        self.isbn = isbn
+        self.prestado = False
+        self.usuario_prestado = None
+
+
+def benchmark_memoria(num_libros=1000000):
+    """
+    Compara los bytes por libro (objeto más sus cadenas) de la disposición
+    anterior (LibroConDiccionario) y de Libro al cargar un catálogo desde
+    registros en bytes, como ocurre al leer un archivo: cada campo llega como
+    una cadena nueva y solo Libro comparte autores y categorías.
+    """
+    crudos = [codificar_campos((libro.titulo, libro.autor, libro.categoria, libro.isbn))
+              for libro in generar_catalogo_sintetico(num_libros)]
+
+    def medir(clase):
+        gc.collect()
+        tracemalloc.start()
+        inicio = tracemalloc.get_traced_memory()[0]
+        libros = [clase(*decodificar_campos(crudo, 4)) for crudo in crudos]
+        usado = tracemalloc.get_traced_memory()[0] - inicio
+        tracemalloc.stop()
+        return usado / len(libros), libros[0]
+
+    print(f"\n⏱️ BENCHMARK MEMORIA ({num_libros:,} libros)")
+    print(f"   {'Disposición':<22} {'Bytes por libro':>16} {'Objeto':>8}")
+    for nombre, clase in (("__dict__ sin compartir", LibroConDiccionario), ("__slots__ + sys.intern", Libro)):
+        por_libro, muestra = medir(clase)
+        tamaño = sys.getsizeof(muestra) + (sys.getsizeof(muestra.__dict__) if hasattr(muestra, '__dict__') else 0)
+        print(f"   {nombre:<22} {por_libro:>16.1f} {tamaño:>8d}")
+        del muestra
+
+
+def benchmark_vencimientos(totales=(10000, 100000, 1000000), vencidos=100):
+    """
+    Compara AgendaVencimientos con un recorrido completo de los préstamos:
+    siempre hay la misma cantidad de préstamos vencidos, mientras el total
+    de préstamos activos crece.
+    """
+    print(f"\n⏱️ BENCHMARK VENCIMIENTOS ({vencidos} vencidos, resto repartido en 14 días)")
+    ahora = time.time()
+    azar = random.Random(0)
+    for total in totales:
+        agenda = AgendaVencimientos()
+        todos = {}
+        for i in range(total):
+            vence = ahora - azar.uniform(1, 86400) if i < vencidos else ahora + azar.uniform(1, 14 * 86400)
+            agenda.agregar(f"978-{i:010d}", vence)
+            todos[f"978-{i:010d}"] = vence
+
+        inicio = time.perf_counter()
+        resultado = agenda.entre(None, ahora)
+        t_agenda = time.perf_counter() - inicio
+        proximos = agenda.entre(ahora, ahora + 86400)
+        inicio = time.perf_counter()
+        recorrido = sorted((vence, isbn) for isbn, vence in todos.items() if vence < ahora)
+        t_recorrido = time.perf_counter() - inicio
+        assert resultado == recorrido
+        print(f"   {total:>9,} préstamos: vencidos {len(resultado)} en {t_agenda * 1000:7.3f}ms "
+              f"(recorrido completo {t_recorrido * 1000:8.2f}ms), próximas 24h: {len(proximos)}")
+
+
+def generar_historial_sintetico(num_prestamos, num_usuarios, num_libros, libros_por_tema=100, semilla=0):
+    """
+    Genera préstamos (id_usuario, isbn) con preferencias: cada usuario tiene un
+    tema favorito (un bloque de libros_por_tema libros consecutivos) del que
+    sale el 80% de sus préstamos; el resto se reparte en todo el catálogo.
+
+    Yields:
+        tuple: (id_usuario, isbn)
+    """
+    azar = random.Random(semilla)
+    num_temas = max(1, num_libros // libros_por_tema)
+    temas = [azar.randrange(num_temas) for _ in range(num_usuarios)]
+    ids = [f"USR{i:06d}" for i in range(num_usuarios)]
+    isbns = [f"978-{i:010d}" for i in range(num_libros)]
+    for _ in range(num_prestamos):
+        usuario = azar.randrange(num_usuarios)
+        if azar.random() < 0.8:
+            # Dentro del tema, los primeros libros son los más populares
+            libro = temas[usuario] * libros_por_tema + int(libros_por_tema * azar.random() ** 2)
+        else:
+            libro = azar.randrange(num_libros)
+        yield ids[usuario], isbns[min(libro, num_libros - 1)]
+
+
+def benchmark_recomendaciones(num_prestamos=10000000, num_usuarios=200000, num_libros=50000,
+                              num_consultas=10000, k=10):
+    """
+    Alimenta el motor de recomendaciones con un historial sintético y mide la
+    velocidad de actualización, la memoria (conteos almacenados) y la
+    latencia de las consultas. Como control de calidad informa qué fracción
+    de las recomendaciones pertenece al mismo tema que el libro consultado.
+    """
+    print(f"\n⏱️ BENCHMARK RECOMENDACIONES ({num_prestamos:,} préstamos, {num_usuarios:,} usuarios, "
+          f"{num_libros:,} libros)")
+    motor = MotorRecomendaciones(k=k)
+    inicio = time.perf_counter()
+    for id_usuario, isbn in generar_historial_sintetico(num_prestamos, num_usuarios, num_libros):
+        motor.registrar_prestamo(id_usuario, isbn)
+    transcurrido = time.perf_counter() - inicio
+    print(f"   Actualización en línea: {num_prestamos / transcurrido:12,.0f} préstamos/s ({transcurrido:.1f}s, "
+          f"incluye generar el historial)")
+    print(f"   Conteos almacenados:    {motor.cantidad_conteos:12,} ({motor.cantidad_conteos / num_libros:.0f} por libro)")
+
+    azar = random.Random(2)
+    latencias = []
+    mismo_tema = total = 0
+    for _ in range(num_consultas):
+        libro = azar.randrange(num_libros)
+        inicio = time.perf_counter()
+        recomendaciones = motor.recomendar(f"978-{libro:010d}")
+        latencias.append(time.perf_counter() - inicio)
+        for isbn, _ in recomendaciones:
+            mismo_tema += int(isbn[4:]) // 100 == libro // 100
+            total += 1
+    latencias.sort()
+    print(f"   Consulta top-{k}:          p50 {latencias[len(latencias) // 2] * 1e6:6.1f}µs   "
+          f"p99 {latencias[int(len(latencias) * 0.99)] * 1e6:6.1f}µs")
+    print(f"   Recomendaciones del mismo tema: {mismo_tema / max(total, 1):6.1%}")
+
+
+def _ejecutar_servidor_benchmark(cola, num_libros, num_usuarios):
+    """Proceso del servidor para benchmark_rpc: publica su dirección en la cola y atiende."""
+    biblioteca = crear_biblioteca_sintetica(0, num_usuarios, RegistroNulo())
+    for libro in generar_catalogo_sintetico(num_libros):
+        biblioteca.libros_disponibles[libro.isbn] = libro
+    biblioteca.buscar_libros_difuso("")
+
+    async def atender():
+        servidor = ServidorBiblioteca(biblioteca)
+        cola.put(await servidor.iniciar())
+        await servidor.servir()
+
+    asyncio.run(atender())
+
+
+async def _cliente_carga(direccion, id_usuario, num_solicitudes, profundidad, palabras, num_libros, semilla,
+                         latencias):
+    """
+    Cliente del generador de carga: envía ráfagas de 'profundidad' solicitudes
+    sin esperar respuesta y mide la latencia de cada una desde el envío de su
+    ráfaga. Mezcla: 40% libro, 20% buscar (difusa), 20% prestar, 15% devolver,
+    5% estadisticas.
+    """
+    azar = random.Random(semilla)
+    if isinstance(direccion, str):
+        lector, escritor = await asyncio.open_unix_connection(direccion)
+    else:
+        lector, escritor = await asyncio.open_connection(*direccion)
+    pedidos = []
+    enviadas = 0
+    while enviadas < num_solicitudes:
+        rafaga = min(profundidad, num_solicitudes - enviadas)
+        lineas = []
+        for i in range(enviadas, enviadas + rafaga):
+            tirada = azar.random()
+            if tirada < 0.4:
+                solicitud = {'metodo': 'libro', 'params': {'isbn': f"978-{azar.randrange(num_libros):010d}"}}
+            elif tirada < 0.6:
+                solicitud = {'metodo': 'buscar', 'params': {'valor': azar.choice(palabras), 'difuso': True, 'k': 5}}
+            elif tirada < 0.8:
+                isbn = f"978-{azar.randrange(num_libros):010d}"
+                pedidos.append(isbn)
+                solicitud = {'metodo': 'prestar', 'params': {'isbn': isbn, 'id_usuario': id_usuario}}
+            elif tirada < 0.95 and pedidos:
+                isbn = pedidos.pop(azar.randrange(len(pedidos)))
+                solicitud = {'metodo': 'devolver', 'params': {'isbn': isbn, 'id_usuario': id_usuario}}
+            else:
+                solicitud = {'metodo': 'estadisticas'}
+            solicitud['id'] = i
+            lineas.append(json.dumps(solicitud))
+        inicio = time.perf_counter()
+        escritor.write(("\n".join(lineas) + "\n").encode("utf-8"))
+        await escritor.drain()
+        for i in range(enviadas, enviadas + rafaga):
+            respuesta = json.loads(await lector.readline())
+            latencias.append(time.perf_counter() - inicio)
+            assert respuesta['id'] == i, "respuesta fuera de orden"
+        enviadas += rafaga
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def benchmark_rpc(clientes=(1, 10, 100), solicitudes_por_nivel=20000, profundidad=8,
+                  num_libros=20000, num_usuarios=1000):
+    """
+    Generador de carga para ServidorBiblioteca: el servidor corre en otro
+    proceso y se mide solicitudes por segundo y latencia (p50/p99/p99.9)
+    con 1, 10 y 100 clientes concurrentes en localhost.
+    """
+    print(f"\n⏱️ BENCHMARK RPC ({solicitudes_por_nivel:,} solicitudes por nivel, "
+          f"{profundidad} en vuelo por conexión, {num_libros:,} libros)")
+    cola = multiprocessing.Queue()
+    proceso = multiprocessing.Process(target=_ejecutar_servidor_benchmark, args=(cola, num_libros, num_usuarios),
+                                      daemon=True)
+    proceso.start()
+    try:
+        direccion = cola.get(timeout=120)
+        palabras = [libro.titulo.split()[0] for libro in generar_catalogo_sintetico(num_libros)[:1000]]
+
+        for num_clientes in clientes:
+            latencias = []
+            por_cliente = solicitudes_por_nivel // num_clientes
+
+            async def generar_carga():
+                await asyncio.gather(*(
+                    _cliente_carga(direccion, f"USR{c % num_usuarios:06d}", por_cliente, profundidad, palabras,
+                                   num_libros, c, latencias)
+                    for c in range(num_clientes)))
+
+            inicio = time.perf_counter()
+            asyncio.run(generar_carga())
+            transcurrido = time.perf_counter() - inicio
+            latencias.sort()
+            print(f"   {num_clientes:>3} cliente(s): {len(latencias) / transcurrido:8,.0f} solicitudes/s   "
+                  f"p50 {latencias[len(latencias) // 2] * 1000:7.2f}ms   "
+                  f"p99 {latencias[int(len(latencias) * 0.99)] * 1000:7.2f}ms   "
+                  f"p99.9 {latencias[int(len(latencias) * 0.999)] * 1000:7.2f}ms")
+    finally:
+        proceso.terminate()
+        proceso.join()
+
+
+# Benchmarks disponibles desde la línea de comandos: --benchmark <nombre>
+BENCHMARKS = {
+    'lotes': benchmark_lotes,
+    'registro': benchmark_registro,
+    'sqlite': benchmark_sqlite,
+    'concurrencia': prueba_estres_concurrente,
+    'difusa': benchmark_busqueda_difusa,
+    'snapshot': benchmark_snapshot,
+    'memoria': benchmark_memoria,
+    'vencimientos': benchmark_vencimientos,
+    'recomendaciones': benchmark_recomendaciones,
+    'rpc': benchmark_rpc,
+}
+
+
+def ejecutar_benchmarks(nombres):
+    """
+    Ejecuta los benchmarks indicados (todos si no se indica ninguno).
+
+    Args:
+        nombres (list): Nombres de benchmarks registrados en BENCHMARKS
+    """
+    for nombre in nombres or BENCHMARKS:
+        if nombre not in BENCHMARKS:
+            print(f"❌ Benchmark desconocido: {nombre}. Disponibles: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[nombre]()
+
+
+def ejecutar_servidor(destino=None):
+    """
+    Atiende solicitudes RPC sobre una biblioteca sintética hasta Ctrl+C.
+
+    Args:
+        destino (str): Puerto TCP (8765 por defecto) o ruta de un socket Unix
+    """
+    biblioteca = crear_biblioteca_sintetica(10000, 1000, RegistroNulo())
+
+    async def atender():
+        servidor = ServidorBiblioteca(biblioteca)
+        if destino is not None and not destino.isdigit():
+            direccion = await servidor.iniciar(ruta_unix=destino)
+        else:
+            direccion = await servidor.iniciar(puerto=int(destino or 8765))
+        print(f"📡 Servidor de biblioteca escuchando en {direccion} (Ctrl+C para terminar)")
+        await servidor.servir()
+
+    try:
+        asyncio.run(atender())
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido.")
+
+
 def main():
     """Función principal del programa"""
     try:
@@ -567,4 +3370,9 @@ def main():
 
 # Ejecutar demostración si el script se ejecuta directamente
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        ejecutar_benchmarks(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "--servidor":
+        ejecutar_servidor(sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        main()
\ No newline at end of file